@@ -0,0 +1,114 @@
+"""
+Coordinate Audit - flag suspicious coordinates and write a re-geocode worklist.
+
+Checks every location at once (see tools/coord_audit.py): distance to the
+locality centroid, city-center fallbacks, businesses stacked on one point,
+points outside their county and missing coordinates.
+
+Usage:
+    python audit_coordinates.py                  # Audit all county files
+    python audit_coordinates.py timis            # Only counties matching "timis"
+    python audit_coordinates.py --db             # Audit the locations table instead
+    python audit_coordinates.py --mark           # Also mark flagged businesses coord_quality='suspect'
+                                                 # so geocode_scraped.py re-geocodes them
+                                                 # (exact Maps pins stay in the worklist for
+                                                 # manual review but are never marked)
+"""
+import sys
+import json
+import time
+import logging
+from pathlib import Path
+from collections import defaultdict
+
+from tools.coord_audit import audit_locations, load_county_locations, load_db_locations
+from tools.county_store import CountyStore, CountyFileLocked
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent / "data"
+SCRAPED_DIR = DATA_DIR / "scraped"
+WORKLIST_PATH = DATA_DIR / "regeocode_worklist.json"
+
+
+def mark_suspect(worklist: list) -> int:
+    """
+    Set coord_quality='suspect' on flagged businesses in their county files.
+
+    Exact Maps pins are left alone: firms sharing a morgue or building get
+    flagged as stacked, and re-geocoding would swap a correct pin for a
+    street- or city-level guess. They stay in the worklist for manual review.
+
+    A county open in another process (scraper, refresh daemon) is skipped
+    rather than written from a stale copy; run --mark again once it is free.
+    """
+    by_file = defaultdict(list)
+    for item in worklist:
+        if item['source'] and item['source'] != 'db' and item['coord_quality'] not in ('suspect', 'exact'):
+            by_file[item['source']].append(item)
+
+    marked = 0
+    for filename, items in by_file.items():
+        try:
+            store = CountyStore(SCRAPED_DIR / filename, compact_every=0, lock_timeout=0)
+        except CountyFileLocked:
+            logger.warning(f"⏭️ {filename} is open in another process - {len(items)} businesses not marked")
+            continue
+        with store:
+            for item in items:
+                biz = store.get(name=item['name'], place_id=item['id'])
+                if biz:
+                    biz['coord_quality'] = 'suspect'
+                    store.put(biz)
+                    marked += 1
+    return marked
+
+
+def main():
+    args = sys.argv[1:]
+    use_db = '--db' in args
+    mark = '--mark' in args
+    args = [a for a in args if not a.startswith('--')]
+    county_filter = args[0].lower() if args else None
+
+    started = time.perf_counter()
+    if use_db:
+        from tools.supabase_tool import SupabaseTool
+        records = load_db_locations(SupabaseTool())
+    else:
+        records = load_county_locations(SCRAPED_DIR, county_filter)
+    if not records:
+        logger.error("No locations to audit")
+        return
+    loaded = time.perf_counter()
+
+    result = audit_locations(records)
+    worklist = result.worklist()
+    counts = result.counts()
+
+    logger.info(f"{'='*60}")
+    logger.info(f"📍 COORDINATE AUDIT - {counts['total']} locations")
+    logger.info(f"{'='*60}")
+    logger.info(f"Missing coordinates:      {counts['missing']}")
+    logger.info(f"Far from locality:        {counts['far_from_locality']}")
+    logger.info(f"At locality center:       {counts['at_locality_center']}")
+    logger.info(f"Stacked on one point:     {counts['stacked']}")
+    logger.info(f"Outside county:           {counts['outside_county']}")
+    logger.info(f"Flagged for re-geocoding: {counts['flagged']}")
+    logger.info(f"⏱️ Load {loaded - started:.2f}s, checks {result.elapsed * 1000:.1f} ms")
+
+    with open(WORKLIST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(worklist, f, ensure_ascii=False, indent=2)
+    logger.info(f"💾 Worklist: {WORKLIST_PATH}")
+
+    if mark and not use_db:
+        marked = mark_suspect(worklist)
+        logger.info(f"🏷️ Marked {marked} businesses as suspect - run geocode_scraped.py to re-geocode them")
+
+
+if __name__ == "__main__":
+    main()
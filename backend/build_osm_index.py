@@ -0,0 +1,93 @@
+"""
+Build the offline geocoder index from an OpenStreetMap extract.
+
+Download the Romania extract first (~300 MB):
+    https://download.geofabrik.de/europe/romania-latest.osm.pbf
+
+Needs pyosmium (pip install osmium). The index is written to
+data/osm_romania.sqlite; GeocodingTool picks it up automatically
+(GEOCODER_BACKEND=auto) and only asks Nominatim when it has no street match.
+County and locality boundaries (admin_level 4 and 6-8) are imported too, for
+reverse geocoding (tools/reverse_geocoder.py). Boundaries from another source
+can be added from GeoJSON with --boundaries.
+
+Usage:
+    python build_osm_index.py romania-latest.osm.pbf
+    python build_osm_index.py romania-latest.osm.pbf --db /tmp/osm.sqlite
+    python build_osm_index.py --check "Strada Gheorghe Lazăr 5" "Timișoara"
+    python build_osm_index.py --boundaries uat.geojson --kind locality --name-property name
+    python build_osm_index.py --locate 45.7538 21.2257
+"""
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+
+from tools.offline_geocoder import OfflineGeocoder, build_index, OSMIUM_AVAILABLE
+from tools.reverse_geocoder import ReverseGeocoder, import_geojson
+from tools.geocoding import parse_address
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the offline geocoder index from an OSM extract')
+    parser.add_argument('pbf', nargs='?', help='OSM extract (.osm.pbf)')
+    parser.add_argument('--db', type=str, help='Index file (default: data/osm_romania.sqlite)')
+    parser.add_argument('--check', nargs=2, metavar=('ADDRESS', 'CITY'), help='Look one address up in the index')
+    parser.add_argument('--boundaries', type=str, help='Import boundary polygons from a GeoJSON file')
+    parser.add_argument('--kind', choices=ReverseGeocoder.KINDS, default='locality', help='Kind of --boundaries areas')
+    parser.add_argument('--name-property', default='name', help='GeoJSON property holding the area name')
+    parser.add_argument('--locate', nargs=2, type=float, metavar=('LAT', 'LNG'), help='County and locality of a point')
+    args = parser.parse_args()
+
+    db_path = Path(args.db) if args.db else None
+
+    if args.check:
+        if not OfflineGeocoder.available(db_path):
+            logger.error("❌ No index built yet")
+            sys.exit(1)
+        geocoder = OfflineGeocoder(db_path)
+        parsed = parse_address(args.check[0], args.check[1])
+        started = time.perf_counter()
+        coords = geocoder.geocode_parts(parsed.street, parsed.number, args.check[1])
+        elapsed_us = (time.perf_counter() - started) * 1e6
+        print(f"{parsed} -> {coords} ({geocoder.last_level}, {elapsed_us:.0f} µs)")
+        if coords:
+            print(f"Reverse: {geocoder.reverse(*coords)}")
+        return
+
+    if args.boundaries:
+        import_geojson(Path(args.boundaries), args.kind, args.name_property, db_path)
+        return
+
+    if args.locate:
+        if not ReverseGeocoder.available(db_path):
+            logger.error("❌ No boundaries indexed yet")
+            sys.exit(1)
+        reverse = ReverseGeocoder(db_path)
+        started = time.perf_counter()
+        located = reverse.locate(*args.locate)
+        elapsed_us = (time.perf_counter() - started) * 1e6
+        print(f"{args.locate} -> {located} ({elapsed_us:.0f} µs)")
+        return
+
+    if not args.pbf:
+        parser.print_help()
+        return
+    if not OSMIUM_AVAILABLE:
+        logger.error("❌ pyosmium is not installed: pip install osmium")
+        sys.exit(1)
+
+    started = time.time()
+    build_index(Path(args.pbf), db_path)
+    logger.info(f"⏱️ Built in {(time.time() - started) / 60:.1f} min")
+
+
+if __name__ == "__main__":
+    main()
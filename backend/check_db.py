@@ -6,32 +6,32 @@ db = SupabaseTool()
 v = DSPVerificationTool()
 
 # Check companies and their locations
-companies = db.client.table('companies').select('id,name,is_verified').execute()
-locations = db.client.table('locations').select('company_id,city,county').execute()
+companies = db.fetch_all('companies', 'id,name,is_verified')
+locations = db.fetch_all('locations', 'company_id,city,county')
 
 # Create location lookup
 loc_by_company = {}
-for loc in locations.data:
+for loc in locations:
     loc_by_company[loc['company_id']] = loc
 
+# Verify everything twice in two batched passes: without county filter
+# (like we're getting 0% in scraper) and with the location's county
+rows = [(c, loc_by_company.get(c['id'], {})) for c in companies]
+results_no_county = v.verify_many([{'name': c['name']} for c, _ in rows])
+results_with_county = v.verify_many([{'name': c['name'], 'county': loc.get('county')} for c, loc in rows])
+
 print("Companies, Locations, and DSP verification:")
-for c in companies.data:
+for (c, loc), result_no_county, result_with_county in zip(rows, results_no_county, results_with_county):
     name = c['name']
-    company_id = c['id']
-    loc = loc_by_company.get(company_id, {})
     city = loc.get('city', 'N/A')
     county = loc.get('county', 'N/A')
     
     db_verified = "DB:YES" if c['is_verified'] else "DB:NO"
     
-    # Test verification without county filter (like we're getting 0% in scraper)
-    result_no_county = v.verify_company(name)
-    
-    # Test with county
-    result_with_county = v.verify_company(name, county=county)
-    
     print(f"\n{name}")
     print(f"  Location: {city}, {county}")
     print(f"  {db_verified}")
     print(f"  DSP (no county filter): score={result_no_county.get('match_score')}%")
     print(f"  DSP (with county={county}): score={result_with_county.get('match_score')}%")
+    if result_with_county.get('runner_up'):
+        print(f"  Runner-up: {result_with_county['runner_up']} ({result_with_county['runner_up_score']}%)")
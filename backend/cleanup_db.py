@@ -72,6 +72,11 @@ def cleanup_database(keep_scraped_files: bool = True):
     progress_files = [
         data_dir / "workflow_progress.json",
         data_dir / "scrape_progress.json",
+        data_dir / "scrape_jobs.sqlite",
+        data_dir / "scrape_jobs.sqlite-wal",
+        data_dir / "scrape_jobs.sqlite-shm",
+        data_dir / "scrape_metrics.json",
+        data_dir / "scrape_metrics.prom",
     ]
 
     print("\n🗑️ Cleaning progress files...")
@@ -87,7 +92,7 @@ def cleanup_database(keep_scraped_files: bool = True):
         scraped_dir = data_dir / "scraped"
         if scraped_dir.exists():
             print("\n🗑️ Cleaning scraped JSON files...")
-            for f in scraped_dir.glob("maps_*.json"):
+            for f in list(scraped_dir.glob("maps_*.json")) + list(scraped_dir.glob("maps_*.jsonl")):
                 f.unlink()
                 print(f"  Deleted {f.name}")
     else:
@@ -31,6 +31,12 @@ USER_AGENTS = [
 # Legacy single user agent (for backwards compatibility)
 USER_AGENT = USER_AGENTS[0]
 
+# Geocoding backend: "auto" (offline OSM index if built, Nominatim fallback), "offline" or "nominatim"
+GEOCODER_BACKEND = os.getenv("GEOCODER_BACKEND", "auto")
+# Nominatim-compatible endpoints for batch geocoding, "URL@RATE" comma-separated
+# (e.g. "http://localhost:8080/search@20,http://10.0.0.5:8080/search@20"); empty = public Nominatim
+GEOCODER_ENDPOINTS = [e.strip() for e in os.getenv("GEOCODER_ENDPOINTS", "").split(",") if e.strip()]
+
 # Agent Settings
 LLM_PROVIDER = "ollama"  # "openai" or "ollama"
 OLLAMA_BASE_URL = "http://192.168.50.212:11434"
@@ -1,14 +1,18 @@
-"""Fix bad city data in the database."""
+"""Fix bad city data in the database.
+
+Locations with coordinates get city and county from the boundary polygons
+(tools/reverse_geocoder.py) in one batch; the address-text heuristic below
+is only used for locations without coordinates or when no boundaries are indexed.
+"""
 from tools.supabase_tool import SupabaseTool
+from tools.reverse_geocoder import get_reverse_geocoder
+from collections import defaultdict
 import re
 
-tool = SupabaseTool()
-result = tool.client.table('locations').select('id, city, address').execute()
-
-# Find records with numbers in city (bad data)
-bad = [r for r in result.data if r['city'] and any(c.isdigit() for c in r['city'])]
+BATCH_SIZE = 200  # ids per update request (keeps the filter URL short)
 
-print(f"Found {len(bad)} cities with numbers (likely bad data)")
+tool = SupabaseTool()
+rows = tool.fetch_all('locations', 'id, city, county, address, latitude, longitude')
 
 def extract_city(address):
     """Extract correct city from address - usually before postal code."""
@@ -29,6 +33,40 @@ def extract_city(address):
 
 fixed = 0
 failed = []
+
+# Geometry first: every location with a pin, whatever its current city says
+reverse = get_reverse_geocoder()
+pinned = [r for r in rows if r.get('latitude') and r.get('longitude')] if reverse else []
+if pinned:
+    located = reverse.locate_many([r['latitude'] for r in pinned], [r['longitude'] for r in pinned])
+    # Locations getting the same correction share one update request per batch of ids
+    by_update = defaultdict(list)
+    for r, place in zip(pinned, located):
+        if not place:
+            continue
+        update = {}
+        if place['city'] and place['city'] != r['city']:
+            update['city'] = place['city']
+        if place['county'] and place['county'] != r.get('county'):
+            update['county'] = place['county']
+        if update:
+            print(f"Fixing from coordinates: '{r['city']}, {r.get('county')}' -> "
+                  f"'{update.get('city', r['city'])}, {update.get('county', r.get('county'))}'")
+            by_update[tuple(sorted(update.items()))].append(r['id'])
+            r.update(update)
+    for update, ids in by_update.items():
+        for start in range(0, len(ids), BATCH_SIZE):
+            batch = ids[start:start + BATCH_SIZE]
+            tool.client.table('locations').update(dict(update)).in_('id', batch).execute()
+            fixed += len(batch)
+    print(f"Checked {len(pinned)} locations against boundary polygons "
+          f"({sum(map(len, by_update.values()))} fixed in {len(by_update)} groups)")
+
+# Find records with numbers in city (bad data)
+bad = [r for r in rows if r['city'] and any(c.isdigit() for c in r['city'])]
+
+print(f"Found {len(bad)} cities with numbers (likely bad data)")
+
 for r in bad:
     correct_city = extract_city(r['address'])
     if correct_city:
@@ -39,7 +77,7 @@ for r in bad:
         failed.append(r)
         print(f"Could not auto-fix: {r['city']}")
 
-print(f"\nFixed {fixed} of {len(bad)} records")
+print(f"\nFixed {fixed} records")
 
 if failed:
     print("\nRecords that need manual review:")
@@ -3,19 +3,43 @@ Batch Geocoding Script - Geocode scraped businesses that are missing coordinates
 
 Run this AFTER scraping to add accurate coordinates to all businesses.
 Nominatim rate limit: 1 request/second, so this can take a while for large datasets.
+Lookups are cached in data/geocode_cache.sqlite, so re-running only queries
+addresses that were never looked up (or whose cache entry expired).
+
+With self-hosted Nominatim mirrors (--endpoint, or GEOCODER_ENDPOINTS in .env)
+the lookups are spread over all of them by a worker pool, each mirror within its
+own request budget (GeocoderService, tools/geocoding.py), so throughput grows
+with the number of mirrors.
+
+Results are streamed into the county's journal and forced to disk every
+--checkpoint businesses; the snapshot is rewritten atomically at the end. An
+interrupted run (crash or Ctrl+C) resumes where it stopped: every attempt
+stamps geocoded_at, and data/scraped/geocode_checkpoint.json remembers when
+the unfinished run started, so the restart skips what it already tried.
 
 Usage:
     python geocode_scraped.py                    # Geocode all files
     python geocode_scraped.py bucuresti          # Geocode only București
     python geocode_scraped.py --dry-run          # Show what would be geocoded
+    python geocode_scraped.py --no-cache         # Ignore cached lookups, ask Nominatim again
+    python geocode_scraped.py --offline          # Only the local OSM index (build_osm_index.py), no network
+    python geocode_scraped.py --endpoint http://localhost:8080/search@20 --endpoint http://10.0.0.5:8080/search@20
+    python geocode_scraped.py --workers 16       # Worker threads (default: 2 per request/second of budget)
+    python geocode_scraped.py --only-quality none,approximate   # Retry these qualities (default: missing coordinates)
+    python geocode_scraped.py --since 2026-01-01 # Only businesses changed or scraped since the date
+    python geocode_scraped.py --checkpoint 200   # Force progress to disk every 200 businesses (default: 50)
+    python geocode_scraped.py --restart          # Ignore an unfinished run's checkpoint
 """
-import json
+import os
 import sys
+import json
 import logging
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, List, Optional
 
-from tools.geocoding import GeocodingTool, has_street_number
+from tools.geocoding import GeocoderService, has_street_number
+from tools.county_store import CountyStore, list_county_files, load_businesses
 
 # Setup logging
 log_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -32,46 +56,103 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 DATA_DIR = Path(__file__).parent / "data" / "scraped"
+CHECKPOINT_PATH = DATA_DIR / "geocode_checkpoint.json"
+DEFAULT_CHECKPOINT_EVERY = 50
+
+
+def load_checkpoints() -> Dict[str, str]:
+    """Start time of each county's unfinished run, {file name: ISO timestamp}."""
+    if not CHECKPOINT_PATH.exists():
+        return {}
+    try:
+        with open(CHECKPOINT_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        logger.warning(f"⚠️ Unreadable {CHECKPOINT_PATH.name} - starting fresh")
+        return {}
+
+
+def save_checkpoints(checkpoints: Dict[str, str]):
+    """Write the checkpoint file atomically (or remove it when no run is unfinished)."""
+    if not checkpoints:
+        if CHECKPOINT_PATH.exists():
+            CHECKPOINT_PATH.unlink()
+        return
+    tmp_path = CHECKPOINT_PATH.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoints, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, CHECKPOINT_PATH)
 
 
-def geocode_file(filepath: Path, dry_run: bool = False) -> tuple:
+def needs_geocoding(biz: Dict, only_quality: Optional[List[str]] = None, since: str = None,
+                    resume_from: str = None) -> bool:
+    """
+    Whether a business is selected for this run.
+    
+    Args:
+        biz: Business record
+        only_quality: Geocode these coord_quality values (no quality counts as 'none');
+                      default: only businesses without exact/approximate coordinates
+        since: Only businesses changed (last_changed_at) or, if never changed, scraped
+               (last_verified_at) on or after this ISO date
+        resume_from: Start of an interrupted run - skip businesses it already attempted
+    """
+    quality = biz.get('coord_quality') or 'none'
+    has_coords = bool(biz.get('latitude') and biz.get('longitude'))
+    if only_quality is not None:
+        if quality not in only_quality:
+            return False
+    elif has_coords and quality in ('exact', 'approximate'):
+        return False
+    if since and (biz.get('last_changed_at') or biz.get('last_verified_at') or '') < since:
+        return False
+    if resume_from and (biz.get('geocoded_at') or '') >= resume_from:
+        return False
+    return True
+
+
+def geocode_file(filepath: Path, geocoder: GeocoderService, dry_run: bool = False,
+                 only_quality: Optional[List[str]] = None, since: str = None, resume_from: str = None,
+                 checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY) -> tuple:
     """
     Geocode businesses in a single file that are missing coordinates.
     
     Args:
         filepath: Path to the JSON file
+        geocoder: Geocoder service shared by all files (one rate budget per backend)
         dry_run: If True, don't save changes, just report
+        only_quality, since, resume_from: Selection (see needs_geocoding)
+        checkpoint_every: Force the journal to disk after this many businesses
         
     Returns:
         Tuple of (total, already_geocoded, newly_geocoded, failed)
     """
     logger.info(f"\n📁 Processing: {filepath.name}")
     
-    with open(filepath, 'r', encoding='utf-8') as f:
-        businesses = json.load(f)
+    # Results go to the journal (fsynced every checkpoint_every) and are
+    # folded into the snapshot atomically on close. A dry run only reads, so
+    # it neither waits for nor blocks a scraper that has the county open.
+    if dry_run:
+        store = None
+        businesses = load_businesses(filepath)
+    else:
+        store = CountyStore(filepath, compact_every=0, durable=False)
+        businesses = store.records()
     
     total = len(businesses)
     already_geocoded = 0
     newly_geocoded = 0
     failed = 0
-    
-    geocoder = GeocodingTool()
+    pending = []
     
     for i, biz in enumerate(businesses):
         name = biz.get('name', 'Unknown')
         
-        # Skip if already has valid coordinates
-        if biz.get('latitude') and biz.get('longitude'):
-            # Check if it's not a placeholder/city-center coordinate
-            lat, lng = biz['latitude'], biz['longitude']
-            # Skip if coord_quality is already set and is 'exact'
-            if biz.get('coord_quality') == 'exact':
-                already_geocoded += 1
-                continue
-            # Also skip approximate if coordinates look reasonable
-            if biz.get('coord_quality') == 'approximate':
-                already_geocoded += 1
-                continue
+        if not needs_geocoding(biz, only_quality, since, resume_from):
+            already_geocoded += 1
+            continue
         
         address = biz.get('address')
         if not address:
@@ -83,50 +164,95 @@ def geocode_file(filepath: Path, dry_run: bool = False) -> tuple:
             logger.info(f"  [{i+1}/{total}] Would geocode: {name}")
             continue
         
-        # Geocode the address
-        try:
-            coords = geocoder.geocode(
-                address=address,
-                city=biz.get('city'),
-                county=biz.get('county'),
-                company_name=name
-            )
+        pending.append((i, biz))
+    
+    if resume_from and pending:
+        logger.info(f"  ⏯️ Resuming run from {resume_from[:19]} - {len(pending)} businesses left")
+    
+    items = [{
+        'address': biz['address'],
+        'city': biz.get('city'),
+        'county': biz.get('county'),
+        'company_name': biz.get('name', 'Unknown'),
+    } for _, biz in pending]
+    
+    try:
+        # Results are merged on this thread in input order as the workers finish
+        for done, ((i, biz), future) in enumerate(zip(pending, geocoder.geocode_many(items)), 1):
+            name = biz.get('name', 'Unknown')
+            try:
+                coords, level = future.result()
+            except Exception as e:
+                failed += 1
+                logger.error(f"  [{i+1}/{total}] ❌ Error geocoding {name}: {e}")
+                continue
             
+            biz['geocoded_at'] = datetime.now().isoformat(timespec='seconds')
             if coords:
                 biz['latitude'], biz['longitude'] = coords
-                biz['coord_quality'] = 'exact' if has_street_number(address) else 'approximate'
+                # Exact only for house-number or named-business answers; street/city level is approximate
+                exact = level in ('address', 'business') and has_street_number(biz['address'])
+                biz['coord_quality'] = 'exact' if exact else 'approximate'
+                store.put(biz)
                 newly_geocoded += 1
                 logger.info(f"  [{i+1}/{total}] ✅ {name} -> ({coords[0]:.6f}, {coords[1]:.6f})")
             else:
                 failed += 1
-                biz['coord_quality'] = 'none'
+                # A miss on a retry keeps the coordinates it already had, and their label
+                if not (biz.get('latitude') and biz.get('longitude')):
+                    biz['coord_quality'] = 'none'
+                store.put(biz)
                 logger.warning(f"  [{i+1}/{total}] ❌ Could not geocode: {name}")
-                
-        except Exception as e:
-            failed += 1
-            logger.error(f"  [{i+1}/{total}] ❌ Error geocoding {name}: {e}")
-    
-    # Save updated data
-    if not dry_run and newly_geocoded > 0:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(businesses, f, ensure_ascii=False, indent=2)
-        logger.info(f"  💾 Saved {filepath.name}")
+            
+            if done % checkpoint_every == 0:
+                store.sync()
+                logger.info(f"  📌 Checkpoint: {done}/{len(pending)}")
+    finally:
+        # Also on Ctrl+C: what was geocoded so far is folded into the snapshot
+        if store is not None:
+            store.close()
+            if newly_geocoded > 0:
+                logger.info(f"  💾 Saved {filepath.name}")
     
     return total, already_geocoded, newly_geocoded, failed
 
 
+def _take_option(args: list, name: str) -> list:
+    """Remove every "name VALUE" pair from args and return the values."""
+    values = []
+    while name in args:
+        i = args.index(name)
+        if i + 1 < len(args):
+            values.append(args[i + 1])
+        del args[i:i + 2]
+    return values
+
+
 def main():
     args = sys.argv[1:]
     dry_run = '--dry-run' in args
-    args = [a for a in args if a != '--dry-run']
+    use_cache = '--no-cache' not in args
+    backend = 'offline' if '--offline' in args else None
+    args = [a for a in args if a not in ('--dry-run', '--no-cache', '--offline')]
+    endpoints = _take_option(args, '--endpoint') or None
+    workers = _take_option(args, '--workers')
+    workers = int(workers[-1]) if workers else None
+    only_quality = _take_option(args, '--only-quality')
+    only_quality = [q.strip() for q in only_quality[-1].split(',')] if only_quality else None
+    since = _take_option(args, '--since')
+    since = since[-1] if since else None
+    checkpoint_every = _take_option(args, '--checkpoint')
+    checkpoint_every = int(checkpoint_every[-1]) if checkpoint_every else DEFAULT_CHECKPOINT_EVERY
+    restart = '--restart' in args
+    args = [a for a in args if a != '--restart']
     
     # Get files to process
     if args:
         # Filter by county name
         county_filter = args[0].lower()
-        files = [f for f in DATA_DIR.glob("maps_*.json") if county_filter in f.stem.lower()]
+        files = [f for f in list_county_files(DATA_DIR) if county_filter in f.stem.lower()]
     else:
-        files = list(DATA_DIR.glob("maps_*.json"))
+        files = list_county_files(DATA_DIR)
     
     if not files:
         logger.error("No scraped files found in data/scraped/")
@@ -139,18 +265,41 @@ def main():
     logger.info(f"📝 Log file: {log_filename}")
     logger.info(f"{'='*60}")
     
+    geocoder = GeocoderService(endpoints, workers=workers, use_cache=use_cache, backend=backend)
+    pool = geocoder.pool
+    logger.info(f"🧭 Geocoder: {geocoder.backend}" + (" (offline index loaded)" if geocoder.offline else ""))
+    logger.info(f"🛰️ Nominatim backends: {len(pool.backends)} ({pool.total_rate:g} req/s budget, "
+                f"{geocoder.workers} workers)")
+    
     # Process each file
     grand_total = 0
     grand_already = 0
     grand_new = 0
     grand_failed = 0
     
-    for filepath in sorted(files):
-        total, already, new, failed = geocode_file(filepath, dry_run)
-        grand_total += total
-        grand_already += already
-        grand_new += new
-        grand_failed += failed
+    checkpoints = {} if restart else load_checkpoints()
+    try:
+        for filepath in sorted(files):
+            resume_from = checkpoints.get(filepath.name)
+            if not dry_run and not resume_from:
+                checkpoints[filepath.name] = datetime.now().isoformat(timespec='seconds')
+                save_checkpoints(checkpoints)
+            total, already, new, failed = geocode_file(
+                filepath, geocoder, dry_run, only_quality=only_quality, since=since,
+                resume_from=resume_from, checkpoint_every=checkpoint_every,
+            )
+            if not dry_run:
+                # Finished - the next run starts from scratch for this county
+                checkpoints.pop(filepath.name, None)
+                save_checkpoints(checkpoints)
+            grand_total += total
+            grand_already += already
+            grand_new += new
+            grand_failed += failed
+    except KeyboardInterrupt:
+        geocoder.close(cancel_pending=True)
+        logger.warning("⏸️ Interrupted - progress is saved, run the same command again to resume")
+        return
     
     # Summary
     logger.info(f"\n{'='*60}")
@@ -160,6 +309,20 @@ def main():
     logger.info(f"Already geocoded:     {grand_already}")
     logger.info(f"Newly geocoded:       {grand_new}")
     logger.info(f"Failed/No address:    {grand_failed}")
+    geocoder.close()
+    stats = geocoder.stats
+    if stats['geocodes']:
+        logger.info(f"Offline answers:      {stats['offline']}")
+        logger.info(f"Nominatim calls:      {stats['network']} ({stats['network'] / stats['geocodes']:.2f} per business, "
+                    f"{stats['coalesced']} duplicate queries coalesced)")
+    for url, backend_stats in pool.stats().items():
+        if backend_stats['requests']:
+            logger.info(f"  {url}: {backend_stats['requests']} requests, {backend_stats['errors']} errors, "
+                        f"health {backend_stats['health']}")
+    cache = geocoder.cache_stats()
+    if cache:
+        logger.info(f"Cache answers:        {cache['hits']} found, {cache['negative_hits']} not found "
+                    f"({cache['misses']} Nominatim lookups)")
     logger.info(f"{'='*60}")
 
 
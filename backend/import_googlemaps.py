@@ -2,7 +2,6 @@
 Import Google Maps scraped data into Supabase database.
 Dedicated importer for Maps data - handles service mapping and rating/reviews.
 """
-import json
 import logging
 import sys
 import re
@@ -13,6 +12,7 @@ from typing import List, Dict, Optional
 sys.path.insert(0, str(Path(__file__).parent))
 
 from tools.supabase_tool import SupabaseTool
+from tools.county_store import load_businesses, store_exists, list_county_files
 
 logging.basicConfig(
     level=logging.INFO,
@@ -166,8 +166,8 @@ def import_googlemaps_json(json_file: str, dry_run: bool = False):
     """
     logger.info(f"Loading data from {json_file}...")
     
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Merges any un-compacted scraper journal (maps_x.jsonl) into the list
+    data = load_businesses(Path(json_file))
     
     logger.info(f"Found {len(data)} businesses in JSON file")
     
@@ -395,16 +395,14 @@ if __name__ == "__main__":
     # List available files
     if args.list:
         if scraped_dir.exists():
-            files = list(scraped_dir.glob("maps_*.json"))
+            files = list_county_files(scraped_dir)
             if files:
                 print(f"\n📁 Available county files in {scraped_dir}:\n")
                 total_businesses = 0
                 for f in sorted(files):
-                    with open(f, 'r', encoding='utf-8') as fp:
-                        data = json.load(fp)
-                        count = len(data)
-                        total_businesses += count
-                        print(f"  • {f.name}: {count} businesses")
+                    count = len(load_businesses(f))
+                    total_businesses += count
+                    print(f"  • {f.name}: {count} businesses")
                 print(f"\n  Total: {total_businesses} businesses across {len(files)} files")
             else:
                 print(f"No county files found in {scraped_dir}")
@@ -418,7 +416,7 @@ if __name__ == "__main__":
             print(f"❌ Scraped directory not found: {scraped_dir}")
             sys.exit(1)
         
-        files = sorted(scraped_dir.glob("maps_*.json"))
+        files = list_county_files(scraped_dir)
         if not files:
             print(f"❌ No county files found in {scraped_dir}")
             sys.exit(1)
@@ -439,7 +437,7 @@ if __name__ == "__main__":
         slug = args.county.lower().replace(' ', '_').replace('ș', 's').replace('ț', 't').replace('ă', 'a').replace('â', 'a').replace('î', 'i')
         filepath = scraped_dir / f"maps_{slug}.json"
         
-        if not filepath.exists():
+        if not store_exists(filepath):
             print(f"❌ County file not found: {filepath}")
             print(f"   Run 'python scrape_romania.py --county \"{args.county}\"' first")
             sys.exit(1)
@@ -2,7 +2,6 @@
 Import Google Maps scraped data into Supabase database.
 Transforms MapsBusinessData to Company model and saves.
 """
-import json
 import logging
 import sys
 from pathlib import Path
@@ -12,6 +11,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from tools.maps_scraper import GoogleMapsScraper, MapsBusinessData, scrape_city
 from tools.supabase_tool import SupabaseTool
 from tools.geocoding import geocode_address
+from tools.county_store import load_businesses
 from models import Company, Contact, Location
 from utils import normalize_phone_number
 
@@ -72,8 +72,7 @@ def import_from_json(json_file: str):
     """Import businesses from a JSON file into the database."""
     logger.info(f"Loading data from {json_file}...")
     
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_businesses(Path(json_file))
     
     logger.info(f"Found {len(data)} businesses in JSON file")
     
@@ -14,7 +14,8 @@ from tools.firecrawl_extractor import FirecrawlExtractorTool
 from tools.llm_extractor import LLMExtractorTool
 from tools.supabase_tool import SupabaseTool
 from tools.google_search import GoogleSearchTool
-from tools.geocoding import geocode_address
+from tools.geocoding import get_geocoder
+from tools.reverse_geocoder import get_reverse_geocoder
 from models import Company, Contact, Location
 from utils import normalize_phone_number, extract_cui_from_text, rate_limit_delay, check_robots_txt, HumanBehaviorSimulator
 from config.settings import SEED_URLS_PATH
@@ -31,7 +32,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# City to county mapping for Romania
+# City to county mapping for Romania - text fallback for locations without a street-level pin
 CITY_TO_COUNTY = {
     'timișoara': 'Timiș', 'timisoara': 'Timiș', 'lugoj': 'Timiș', 'buziaș': 'Timiș', 'sânnicolau mare': 'Timiș',
     'bucurești': 'București', 'bucuresti': 'București', 'sector 1': 'București', 'sector 2': 'București', 
@@ -60,6 +61,26 @@ CITY_TO_COUNTY = {
 }
 
 
+def locate_from_pin(coords, level: str, city: str, county: str):
+    """
+    City and county from the boundary polygons for a geocoded location.
+    
+    Only street- or address-level answers count: a city-level fallback sits on
+    the center of the city we already guessed from text, so geometry would just
+    echo that guess.
+    
+    Returns:
+        (city, county), unchanged when there is no pin or no boundary index
+    """
+    reverse = get_reverse_geocoder()
+    if not coords or level in (None, 'city') or reverse is None:
+        return city, county
+    located = reverse.locate(*coords)
+    if not located:
+        return city, county
+    return located['city'] or city, located['county'] or county
+
+
 class FuneralDirectoryScraper:
     """
     Main scraper orchestrator using the tools.
@@ -436,6 +457,7 @@ class FuneralDirectoryScraper:
             # Handle both new format (locations array) and legacy format (single address)
             if extracted_locations and isinstance(extracted_locations, list):
                 # New format: array of location objects
+                pending = []
                 for i, loc_data in enumerate(extracted_locations):
                     if not loc_data.get('address'):
                         continue
@@ -452,16 +474,24 @@ class FuneralDirectoryScraper:
                     if not county and city:
                         county = CITY_TO_COUNTY.get(city.lower())
                     
-                    # Geocode the address
-                    lat, lon = None, None
-                    company_name = extracted.get('company_name', '')
                     logger.info(f"  Geocoding location {i+1}: {loc_data['address'][:50]}...")
-                    coords = geocode_address(loc_data['address'], city, county, company_name)
+                    pending.append((loc_data['address'], city, county, loc_type))
+                
+                # Geocode all locations at once on the shared geocoder's workers
+                company_name = extracted.get('company_name', '')
+                futures = get_geocoder().geocode_many([
+                    {'address': address, 'city': city, 'county': county, 'company_name': company_name}
+                    for address, city, county, _ in pending
+                ])
+                for (address, city, county, loc_type), future in zip(pending, futures):
+                    lat, lon = None, None
+                    coords, level = future.result()
                     if coords:
                         lat, lon = coords
+                        city, county = locate_from_pin(coords, level, city, county)
                     
                     locations.append(Location(
-                        address=loc_data['address'],
+                        address=address,
                         city=city,
                         county=county,
                         latitude=lat,
@@ -492,9 +522,11 @@ class FuneralDirectoryScraper:
                 lat, lon = None, None
                 company_name = extracted.get('company_name', '')
                 logger.info("  Geocoding address...")
-                coords = geocode_address(extracted['address'], city, county, company_name)
+                geocoder = get_geocoder()
+                coords = geocoder.geocode(extracted['address'], city, county, company_name)
                 if coords:
                     lat, lon = coords
+                    city, county = locate_from_pin(coords, geocoder.last_level, city, county)
                 
                 locations.append(Location(
                     address=extracted['address'],
@@ -0,0 +1,324 @@
+"""
+Freshness Refresh Daemon - keeps scraped businesses up to date without full rescrapes.
+
+Instead of rerunning whole counties, the daemon re-checks a few businesses at
+a time, most stale first (staleness weighted by how often the listing changes,
+see tools/freshness.py), within an hourly budget. Changed fields are written
+back to the county store together with last_verified_at.
+
+Businesses with a stored place_url / place_id are re-checked with
+GoogleMapsScraper.refresh_place() - one navigation straight to the place
+panel. Older records without either fall back to a name search.
+
+Each write takes the county file's lock (tools/county_store.py) just for
+that business. A county the scraper - or any other job - has open is
+skipped until the queue is rebuilt, so the daemon never works on a stale
+copy of a county that someone else is writing.
+
+Usage:
+    python refresh_daemon.py                          # Run forever, 60 re-checks per hour
+    python refresh_daemon.py --per-hour 120           # Bigger hourly budget
+    python refresh_daemon.py --once --limit 50        # Re-check the 50 most stale, then exit
+    python refresh_daemon.py --county "Timiș"         # Only one county
+    python refresh_daemon.py --status                 # Show the refresh queue
+    python refresh_daemon.py --place 0x40..:0x4f..    # Re-check one place directly, show the diff
+    python refresh_daemon.py --place <url> --write    # ...and save the changes
+"""
+import time
+import signal
+import logging
+import argparse
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from tools.maps_scraper import GoogleMapsScraper, normalize_name
+from tools.county_store import CountyStore, CountyFileLocked, list_county_files, load_businesses
+from tools.freshness import FreshnessQueue, apply_refresh, diff_business
+
+# Setup logging
+log_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+log_filename = f"refresh_{log_timestamp}.log"
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(),
+        logging.FileHandler(log_filename, encoding='utf-8')
+    ]
+)
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent / "data" / "scraped"
+
+
+def county_file(county_name: str) -> Path:
+    """County file path - must match scrape_romania.py's _get_county_output_file()."""
+    slug = county_name.lower().replace(' ', '_').replace('ș', 's').replace('ț', 't').replace('ă', 'a').replace('â', 'a').replace('î', 'i')
+    return DATA_DIR / f"maps_{slug}.json"
+
+
+class RefreshDaemon:
+    """Re-checks the most stale businesses within an hourly budget."""
+
+    def __init__(self, per_hour: int = 60, counties: List[str] = None, headless: bool = True):
+        """
+        Args:
+            per_hour: Re-checks allowed per hour (spread evenly over the hour)
+            counties: Only refresh these counties (None = all scraped counties)
+            headless: Run browser in headless mode
+        """
+        self.per_hour = per_hour
+        self.counties = counties
+        self.headless = headless
+        self.stop_requested = False
+        self._busy: set = set()  # County files found open elsewhere since the queue was built
+        self.stats = {'checked': 0, 'changed': 0, 'missing': 0, 'errors': 0, 'busy': 0}
+
+        signal.signal(signal.SIGINT, self._signal_handler)
+
+    def _signal_handler(self, signum, frame):
+        logger.warning("\n⚠️ Stop requested. Finishing current business...")
+        self.stop_requested = True
+
+    def _county_files(self) -> List[Path]:
+        if self.counties:
+            return [county_file(c) for c in self.counties]
+        return list_county_files(DATA_DIR)
+
+    def _open_store(self, path: Path) -> Optional[CountyStore]:
+        """Open a county for writing, or None if another process has it open."""
+        if path in self._busy:
+            return None
+        try:
+            return CountyStore(path, lock_timeout=0)
+        except CountyFileLocked:
+            logger.info(f"⏭️ {path.name} is open in another process - skipping for now")
+            self._busy.add(path)
+            return None
+
+    def build_queue(self) -> FreshnessQueue:
+        """Queue every stored business of the selected counties by staleness."""
+        self._busy = set()
+        queue = FreshnessQueue()
+        now = datetime.now()
+
+        for path in self._county_files():
+            for record in load_businesses(path):
+                queue.push(str(path), record, now)
+
+        logger.info(f"📋 Refresh queue: {len(queue)} businesses")
+        return queue
+
+    def recheck(self, scraper: GoogleMapsScraper, record: Dict) -> Optional[Dict]:
+        """
+        Look a stored business up on Maps again.
+
+        Returns:
+            Fresh business dict, or None if the listing was not found
+        """
+        if GoogleMapsScraper.place_url_for(record):
+            fresh = scraper.refresh_place(record)
+            return fresh.__dict__ if fresh else None
+
+        # No place reference stored - find it by name
+        location = ", ".join(p for p in (record.get('city'), record.get('county'), "Romania") if p)
+        results = scraper.search(record['name'], location, max_results=5)
+
+        wanted = normalize_name(record['name'])
+        for biz in results:
+            if record.get('place_id') and biz.place_id == record['place_id']:
+                return biz.__dict__
+        for biz in results:
+            if normalize_name(biz.name) == wanted:
+                return biz.__dict__
+        return None
+
+    def refresh_one(self, scraper: GoogleMapsScraper, source: str, record: Dict) -> bool:
+        """
+        Re-check one business and write the result back to its county store.
+
+        Returns:
+            False if the county was open elsewhere and nothing was checked
+        """
+        # Held through the re-check so nobody writes the county in between
+        store = self._open_store(Path(source))
+        if store is None:
+            self.stats['busy'] += 1
+            return False
+
+        with store:
+            # The queue holds a snapshot - merge into the current stored version
+            current = store.get(record.get('name'), record.get('place_id')) or record
+
+            try:
+                fresh = self.recheck(scraper, current)
+            except Exception as e:
+                logger.error(f"  ❌ Re-check failed for {current.get('name')}: {e}")
+                self.stats['errors'] += 1
+                return True
+
+            updated, changes = apply_refresh(current, fresh)
+            store.put(updated)
+        self.stats['checked'] += 1
+
+        if fresh is None:
+            self.stats['missing'] += 1
+            logger.info(f"  ❓ Not found: {current.get('name')} (miss #{updated['refresh_misses']})")
+        elif changes:
+            self.stats['changed'] += 1
+            summary = ", ".join(f"{field}: {old!r} -> {new!r}" for field, (old, new) in changes.items())
+            logger.info(f"  🔄 Changed: {current.get('name')} - {summary}")
+        else:
+            logger.info(f"  ✅ Unchanged: {current.get('name')}")
+        return True
+
+    def _sleep(self, seconds: float):
+        """Sleep in small steps so Ctrl+C is handled promptly."""
+        end = time.time() + seconds
+        while not self.stop_requested and time.time() < end:
+            time.sleep(min(1.0, end - time.time()))
+
+    def run(self, once: bool = False, limit: int = None):
+        """
+        Re-check businesses, most stale first.
+
+        Args:
+            once: Stop after one pass of `limit` (or one hour's budget) instead of running forever
+            limit: Re-checks in the single pass (default: per_hour)
+        """
+        interval = 3600 / max(self.per_hour, 1)
+        batch = limit or self.per_hour
+
+        logger.info(f"🔁 Refresh daemon: {self.per_hour}/hour ({interval:.0f}s apart)"
+                    + (f", single pass of {batch}" if once else ""))
+
+        with GoogleMapsScraper(headless=self.headless, geocode=False) as scraper:
+            while not self.stop_requested:
+                # Rebuild each hour so new scrapes and freshly idle counties are picked up
+                queue = self.build_queue()
+                hour_started = time.time()
+
+                for _ in range(batch):
+                    if self.stop_requested:
+                        break
+                    entry = queue.pop()
+                    if entry is None:
+                        break
+                    priority, source, record = entry
+                    if Path(source) in self._busy:
+                        continue  # Open elsewhere - try again after the next rebuild
+
+                    started = time.time()
+                    logger.info(f"🔍 [{priority:.0f}] {record.get('name')} ({Path(source).name})")
+                    if not self.refresh_one(scraper, source, record):
+                        continue
+
+                    if not once:
+                        self._sleep(interval - (time.time() - started))
+
+                logger.info(f"📊 Refresh stats: {self.stats}")
+
+                if once:
+                    break
+                # Budget for this hour spent (or queue empty) - wait for the next hour
+                self._sleep(3600 - (time.time() - hour_started))
+
+    def find_record(self, place_ref: str) -> Optional[tuple]:
+        """Stored (county file, record) whose place_id or place_url matches a reference."""
+        for path in self._county_files():
+            for record in load_businesses(path):
+                if place_ref in (record.get('place_id'), record.get('place_url')):
+                    return path, record
+        return None
+
+    def refresh_places(self, place_refs: List[str], write: bool = False):
+        """
+        Re-check specific places directly and print what changed.
+
+        Args:
+            place_refs: Place ids or Maps place URLs
+            write: Save the merged result to the county store
+        """
+        found = {ref: self.find_record(ref) for ref in place_refs}
+
+        with GoogleMapsScraper(headless=self.headless, geocode=False) as scraper:
+            results = scraper.refresh_places(place_refs)
+
+        for ref, fresh in results:
+            stored = found.get(ref)
+            print(f"\n📍 {ref}")
+            if fresh is None:
+                print("   ❓ Place panel not found")
+                continue
+            print(f"   {fresh.name}")
+            if stored is None:
+                print("   (not in any county file)")
+                continue
+
+            path, record = stored
+            changes = diff_business(record, fresh.__dict__)
+            if not changes:
+                print("   ✅ No changes")
+            for field, (old, new) in changes.items():
+                print(f"   🔄 {field}: {old!r} -> {new!r}")
+
+            if write:
+                store = self._open_store(path)
+                if store is None:
+                    print(f"   ⏭️ {path.name} is open in another process - not saved")
+                    continue
+                with store:
+                    current = store.get(record.get('name'), record.get('place_id')) or record
+                    updated, _ = apply_refresh(current, fresh.__dict__)
+                    store.put(updated)
+                print(f"   💾 Saved to {path.name}")
+
+    def print_status(self, top: int = 15):
+        """Show queue size, never-verified count and the most stale entries."""
+        queue = self.build_queue()
+        entries = queue.peek(len(queue))
+        unverified = sum(1 for _, _, r in entries if not r.get('last_verified_at'))
+        volatile = sum(1 for _, _, r in entries if (r.get('volatility') or 0) >= 0.5)
+
+        print(f"\n🔁 Refresh queue: {len(entries)} businesses")
+        print(f"   Never verified: {unverified}")
+        print(f"   Volatile (score >= 0.5): {volatile}")
+        print(f"\n   Most stale:")
+        for priority, source, record in entries[:top]:
+            verified = record.get('last_verified_at') or 'never'
+            print(f"   [{priority:7.0f}] {record.get('name')} ({Path(source).stem}) - verified {verified}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep scraped businesses fresh by re-checking the most stale ones')
+    parser.add_argument('--per-hour', type=int, default=60, help='Re-checks per hour (default: 60)')
+    parser.add_argument('--county', type=str, help='Only refresh this county')
+    parser.add_argument('--once', action='store_true', help='One pass, then exit')
+    parser.add_argument('--limit', type=int, help='Re-checks in a --once pass (default: --per-hour)')
+    parser.add_argument('--no-headless', action='store_true', help='Show browser window')
+    parser.add_argument('--status', action='store_true', help='Show the refresh queue and exit')
+    parser.add_argument('--place', action='append', help='Re-check this place id / place URL directly (repeatable)')
+    parser.add_argument('--write', action='store_true', help='With --place: save changes to the county file')
+    args = parser.parse_args()
+
+    daemon = RefreshDaemon(
+        per_hour=args.per_hour,
+        counties=[args.county] if args.county else None,
+        headless=not args.no_headless,
+    )
+
+    if args.status:
+        daemon.print_status()
+        return
+
+    if args.place:
+        daemon.refresh_places(args.place, write=args.write)
+        return
+
+    daemon.run(once=args.once, limit=args.limit)
+
+
+if __name__ == "__main__":
+    main()
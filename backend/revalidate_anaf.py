@@ -0,0 +1,183 @@
+"""
+ANAF Re-validation - check every known fiscal code against ANAF in bulk.
+
+Collects CUIs from the companies table and the scraped county files,
+deduplicates them, drops malformed ones (control digit, see
+tools/anaf_api.validate_cui) and asks ANAF 100 CUIs per request. Results are
+written back in batches:
+
+- companies table: legal_name, registration_status, is_active, anaf_checked_at
+  (migrations/add_anaf_status_columns.sql); the display name is left alone
+- county files: anaf_name, anaf_status, is_active, anaf_checked_at
+
+CUIs checked within the registry's ANAF TTL (tools/company_registry.py) are
+answered locally unless --refresh is given.
+
+Usage:
+    python revalidate_anaf.py              # Check everything and write back
+    python revalidate_anaf.py --refresh    # Ask ANAF even for recently checked CUIs
+    python revalidate_anaf.py --dry-run    # Only report
+    python revalidate_anaf.py --files-only # Skip the database
+"""
+import sys
+import time
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from tools.anaf_api import ANAFTool, validate_cui
+from tools.county_store import CountyStore, CountyFileLocked, list_county_files, load_businesses
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+SCRAPED_DIR = Path(__file__).parent / "data" / "scraped"
+
+
+def collect_cuis(db_companies: List[Dict], county_files: List[Path]) -> Tuple[Dict, Dict, List]:
+    """
+    Valid CUIs and where each one is used.
+
+    Returns:
+        (db_by_cui, files_by_cui, invalid) - cui -> company rows,
+        cui -> [(file, business)], and (source, name, raw code) of rejected codes
+    """
+    db_by_cui = defaultdict(list)
+    files_by_cui = defaultdict(list)
+    invalid = []
+
+    for company in db_companies:
+        if not company.get('fiscal_code'):
+            continue
+        cui = validate_cui(company['fiscal_code'])
+        if cui:
+            db_by_cui[cui].append(company)
+        else:
+            invalid.append(('db', company.get('name'), company['fiscal_code']))
+
+    for path in county_files:
+        for biz in load_businesses(path):
+            if not biz.get('fiscal_code'):
+                continue
+            cui = validate_cui(biz['fiscal_code'])
+            if cui:
+                files_by_cui[cui].append((path, biz))
+            else:
+                invalid.append((path.name, biz.get('name'), biz['fiscal_code']))
+
+    return db_by_cui, files_by_cui, invalid
+
+
+def write_db(db, db_by_cui: Dict, results: Dict, checked_at: str) -> int:
+    """Batched write-back of ANAF fields to the companies table."""
+    rows = []
+    for cui, companies in db_by_cui.items():
+        result = results.get(cui)
+        if result is None:
+            continue  # Batch failed - leave the previous status
+        for company in companies:
+            rows.append({
+                'id': company['id'],
+                'name': company['name'],
+                'slug': company['slug'],
+                'legal_name': result.get('name') or None,
+                'registration_status': result.get('status') if result['success'] else 'NEGASIT',
+                'is_active': result.get('is_active', False),
+                'anaf_checked_at': checked_at,
+            })
+    return db.update_companies_batch(rows)
+
+
+def write_files(files_by_cui: Dict, results: Dict, checked_at: str) -> int:
+    """
+    Store ANAF fields on the scraped businesses, one store open per county file.
+
+    A county open in another process (scraper, refresh daemon) is skipped
+    rather than written from a stale copy; the answers stay in the company
+    registry, so running the job again within their TTL costs no ANAF requests.
+    """
+    by_file = defaultdict(list)
+    for cui, uses in files_by_cui.items():
+        if cui in results:
+            for path, biz in uses:
+                by_file[path].append((biz, results[cui]))
+
+    written = 0
+    for path, items in by_file.items():
+        try:
+            store = CountyStore(path, compact_every=0, durable=False, lock_timeout=0)
+        except CountyFileLocked:
+            logger.warning(f"⏭️ {path.name} is open in another process - {len(items)} businesses not updated")
+            continue
+        with store:
+            for biz, result in items:
+                record = store.get(name=biz.get('name'), place_id=biz.get('place_id'))
+                if not record:
+                    continue
+                record.update({
+                    'anaf_name': result.get('name') or None,
+                    'anaf_status': result.get('status') if result['success'] else 'NEGASIT',
+                    'is_active': result.get('is_active', False),
+                    'anaf_checked_at': checked_at,
+                })
+                store.put(record)
+                written += 1
+    return written
+
+
+def main():
+    args = sys.argv[1:]
+    dry_run = '--dry-run' in args
+    files_only = '--files-only' in args
+    refresh = '--refresh' in args
+
+    started = time.perf_counter()
+    db = None
+    db_companies = []
+    if not files_only:
+        from tools.supabase_tool import SupabaseTool
+        db = SupabaseTool()
+        db_companies = db.fetch_all('companies', 'id,name,slug,fiscal_code')
+
+    db_by_cui, files_by_cui, invalid = collect_cuis(db_companies, list_county_files(SCRAPED_DIR))
+    cuis = sorted(set(db_by_cui) | set(files_by_cui))
+    logger.info(f"🔎 {len(cuis)} distinct CUIs ({len(db_by_cui)} in DB, {len(files_by_cui)} in county files), "
+                f"{len(invalid)} rejected by checksum")
+    for source, name, code in invalid:
+        logger.info(f"   ✗ {source}: {name} - '{code}'")
+    if not cuis:
+        return
+
+    anaf = ANAFTool()
+    results = {result['cui']: result for result in anaf.lookup_batch(cuis, refresh=refresh) if result.get('cui')}
+    checked_at = datetime.now(timezone.utc).isoformat()
+
+    found = [r for r in results.values() if r['success']]
+    inactive = [r for r in found if not r['is_active']]
+    not_found = [r for r in results.values() if not r['success']]
+    logger.info(f"{'='*60}")
+    logger.info(f"🏛️ ANAF RE-VALIDATION - {len(cuis)} CUIs in {time.perf_counter() - started:.0f}s")
+    logger.info(f"{'='*60}")
+    logger.info(f"Active:       {len(found) - len(inactive)}")
+    logger.info(f"Inactive:     {len(inactive)}")
+    logger.info(f"Not found:    {len(not_found)}")
+    logger.info(f"No answer:    {len(cuis) - len(results)}")
+    logger.info(f"From registry: {sum(1 for r in results.values() if r.get('cached'))}")
+    for result in inactive:
+        logger.info(f"   ⚠️ {result['cui']} {result['name']} - {result['status']}")
+
+    if dry_run:
+        logger.info("Dry run - nothing written")
+        return
+    if db is not None:
+        logger.info(f"💾 Updated {write_db(db, db_by_cui, results, checked_at)} companies in the database")
+    logger.info(f"💾 Updated {write_files(files_by_cui, results, checked_at)} businesses in county files")
+
+
+if __name__ == "__main__":
+    main()
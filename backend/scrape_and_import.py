@@ -9,12 +9,14 @@ Usage:
 """
 import json
 import logging
-import time
 import argparse
 from pathlib import Path
 from datetime import datetime
-from scrape_romania import RomaniaScraper, CITIES_FILE, OUTPUT_DIR
+from scrape_romania import RomaniaScraper, CITIES_FILE, OUTPUT_DIR, PROGRESS_FILE, CITY_SEARCH_QUERIES
 from import_googlemaps import import_googlemaps_json
+from tools.county_store import store_exists
+from tools.job_ledger import JobLedger
+from tools.pacing import AdaptivePacer
 
 # Configure logging
 logging.basicConfig(
@@ -24,7 +26,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 WORKFLOW_PROGRESS_FILE = Path(__file__).parent / "data" / "workflow_progress.json"
-COUNTY_DELAY_SECONDS = 10  # Pause between counties to avoid rate limits
 
 
 def normalize_romanian(text: str) -> str:
@@ -59,6 +60,11 @@ class AutomatedWorkflow:
         self.enrich = enrich
         self.progress = self._load_progress()
         self.stop_requested = False
+        # Scrape status lives in the shared job ledger; this file only tracks imports
+        self.ledger = JobLedger()
+        self.ledger.import_legacy_progress(PROGRESS_FILE, CITY_SEARCH_QUERIES)
+        # One pacer for the whole run, so a throttle backoff carries over to the next county
+        self.pacer = AdaptivePacer()
     
     def _load_progress(self) -> dict:
         """Load workflow progress from file."""
@@ -147,9 +153,13 @@ class AutomatedWorkflow:
             logger.info(f"📍 COUNTY {idx}/{to_process}: {county_name}")
             logger.info(f"{'='*60}")
             
-            # Step 1: Scrape the county (skip if already scraped)
+            # Step 1: Scrape the county (skip if the ledger has it finished)
             county_file = self._get_county_file(county_name)
-            if county_file.exists():
+            if self.ledger.county_done(county_name):
+                logger.info(f"📁 Scrape already complete: {county_file.name} - skipping scrape")
+                success = True
+            elif not self.ledger.has_county(county_name) and store_exists(county_file):
+                # Scraped before the ledger existed - nothing records which cities are missing
                 logger.info(f"📁 Found existing data: {county_file.name} - skipping scrape")
                 success = True
             else:
@@ -175,11 +185,6 @@ class AutomatedWorkflow:
                 
                 logger.info(f"✅ {county_name} complete: {import_result['success']} imported, "
                            f"{import_result['failed']} failed, {import_result['skipped']} skipped")
-            
-            # Delay between counties to avoid rate limits
-            if idx < to_process:
-                logger.info(f"⏳ Waiting {COUNTY_DELAY_SECONDS}s before next county...")
-                time.sleep(COUNTY_DELAY_SECONDS)
         
         # Final summary
         self._print_summary()
@@ -190,7 +195,7 @@ class AutomatedWorkflow:
             logger.info(f"🔍 Scraping {county_name}...")
             
             # Create new scraper instance for each county (fresh browser)
-            scraper = RomaniaScraper(headless=self.headless, enrich=self.enrich)
+            scraper = RomaniaScraper(headless=self.headless, enrich=self.enrich, pacer=self.pacer)
             scraper.scrape(counties=[county_name], resume=True)
             
             if scraper.stop_requested:
@@ -207,7 +212,7 @@ class AutomatedWorkflow:
         """Import a county's data to Supabase. Returns result dict or None on failure."""
         county_file = self._get_county_file(county_name)
         
-        if not county_file.exists():
+        if not store_exists(county_file):
             logger.warning(f"⚠️ No data file found: {county_file}")
             return None
         
@@ -261,15 +266,24 @@ def main():
     
     # Status check
     if args.status:
+        ledger = JobLedger()
+        ledger.import_legacy_progress(PROGRESS_FILE, CITY_SEARCH_QUERIES)
+        scrape_summary = ledger.summary()
         if WORKFLOW_PROGRESS_FILE.exists():
             with open(WORKFLOW_PROGRESS_FILE, 'r', encoding='utf-8') as f:
                 progress = json.load(f)
             imported = progress.get('imported_counties', [])
             print(f"\n📊 Workflow Status:")
+            print(f"   Counties scraped: {len(scrape_summary['completed_counties'])}/42")
             print(f"   Counties imported: {len(imported)}/42")
             print(f"   Imported: {', '.join(imported) if imported else 'None'}")
         else:
             print("\n📊 No workflow progress found. Run with --all to start.")
+            if scrape_summary['counties']:
+                print(f"   Counties scraped: {len(scrape_summary['completed_counties'])}/42")
+        in_flight = [f"{job['county']} / {job['city']}" for job in scrape_summary['in_flight']]
+        if in_flight:
+            print(f"   Scraping now: {', '.join(in_flight)}")
         return
     
     # Determine counties to process
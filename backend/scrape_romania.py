@@ -3,9 +3,14 @@ Romania-wide Google Maps Scraper Orchestration Script.
 Scrapes funeral companies across all counties and cities in Romania.
 
 Features:
-- Progress tracking with resume capability
+- SQLite job ledger (one job per county/city/query) with resume capability
+- Cities scraped in order of expected yield per minute, optional time budget
+- Adaptive request pacing (backs off when Google throttles)
+- Coverage tracking: towns whose map area was already searched are skipped
+- Live throughput / ETA metrics (data/scrape_metrics.json + Prometheus textfile)
 - Per-county JSON output files  
 - Graceful stop on Ctrl+C
+- Optional multi-process mode (--workers N), one browser per worker
 - Configurable: single county, list of counties, or all Romania
 
 Usage:
@@ -13,14 +18,18 @@ Usage:
     python scrape_romania.py --counties "Timiș,Arad" # Multiple counties
     python scrape_romania.py --all                   # All Romania
     python scrape_romania.py --resume                # Resume interrupted scrape
+    python scrape_romania.py --all --workers 4       # 4 browsers scraping cities in parallel
+    python scrape_romania.py --all --time-budget 2h  # Best coverage reachable in 2 hours
+    python scrape_romania.py --all --no-coverage     # Search every town, even if already covered
 """
 import json
-import os
 import sys
 import time
+import queue
 import signal
 import logging
 import argparse
+import multiprocessing as mp
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional
@@ -28,7 +37,14 @@ from typing import List, Dict, Optional
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from tools.maps_scraper import GoogleMapsScraper, MapsBusinessData
+from tools.maps_scraper import GoogleMapsScraper, MapsBusinessData, normalize_name, CITY_COORDINATES
+from tools.county_store import CountyStore
+from tools.job_ledger import JobLedger, default_owner
+from tools.city_scheduler import CityScheduler
+from tools.coverage import CoveragePlanner
+from tools.reverse_geocoder import get_reverse_geocoder
+from tools.pacing import AdaptivePacer
+from tools.scrape_metrics import write_metrics, load_metrics, compute_metrics, format_duration, PROMETHEUS_FILE
 
 # Create timestamped log file
 from datetime import datetime
@@ -49,9 +65,17 @@ logger.info(f"📝 Log file: {log_filename}")
 # Paths
 DATA_DIR = Path(__file__).parent / "data"
 CITIES_FILE = DATA_DIR / "romania_cities.json"
-PROGRESS_FILE = DATA_DIR / "scrape_progress.json"
+PROGRESS_FILE = DATA_DIR / "scrape_progress.json"  # Legacy - imported into the job ledger once
 OUTPUT_DIR = DATA_DIR / "scraped"
 
+# Multi-worker mode refreshes the metrics files at least this often
+METRICS_INTERVAL_SECONDS = 30
+
+# Search terms run for every city, each tracked as its own ledger job.
+# Order: most natural term first ("servicii funerare") to maximize unique finds early.
+# Note: No extra search for county capitals - geo-locked URLs make it unnecessary
+CITY_SEARCH_QUERIES = ["servicii funerare", "pompe funebre", "funerare"]
+
 # București metropolitan area includes these Ilfov communes/cities
 # These should be included when searching for București
 # All 40 Ilfov county administrative units (8 cities + 32 communes)
@@ -77,7 +101,9 @@ BUCURESTI_METRO_AREA = {
 class RomaniaScraper:
     """Orchestrates scraping across all Romanian counties and cities."""
     
-    def __init__(self, headless: bool = True, enrich: bool = False, geocode: bool = False):
+    def __init__(self, headless: bool = True, enrich: bool = False, geocode: bool = False,
+                 stop_event=None, result_queue=None, handle_signals: bool = True,
+                 pacer: AdaptivePacer = None, coverage: bool = True):
         """
         Initialize the Romania-wide scraper.
         
@@ -86,100 +112,110 @@ class RomaniaScraper:
             enrich: Enrich data from company websites (slower but more data)
             geocode: If True, geocode addresses during scraping (slow).
                      If False (default), skip geocoding - run batch geocoding later.
+            stop_event: Shared multiprocessing.Event (worker mode) - set by the parent on Ctrl+C
+            result_queue: Worker mode only - businesses are sent here instead of written to disk,
+                          so the parent process stays the single writer of county files
+            handle_signals: Install the Ctrl+C handler (False inside worker processes)
+            pacer: Request pacer to reuse across scrapes (default: one per browser)
+            coverage: Skip queries of towns whose map area earlier searches already covered
         """
         self.headless = headless
         self.enrich = enrich
         self.geocode = geocode
-        self.stop_requested = False
+        self.pacer = pacer
+        self._stop_requested = False
+        self._stop_event = stop_event
+        self.result_queue = result_queue
+        self._current_job_city = None  # Worker mode: city of the job being scraped
+        self._current_job_query = None  # Query of the job being scraped
+        self.deadline = None  # time.time() after which no new city is started (--time-budget)
+        self.metrics_prom_path = PROMETHEUS_FILE  # Prometheus textfile output (None = JSON only)
         self.counties_data = self._load_cities()
+        self._stores: Dict[str, CountyStore] = {}
         
         # Create output directory
         OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
         
+        # Job ledger - every process opens its own connection
+        self.owner = default_owner()
+        self.ledger = JobLedger()
+        self.ledger.import_legacy_progress(PROGRESS_FILE, CITY_SEARCH_QUERIES)
+        self.coverage = CoveragePlanner(self.ledger, CITY_COORDINATES) if coverage else None
+        
         # Setup signal handler for graceful stop
-        signal.signal(signal.SIGINT, self._signal_handler)
+        if handle_signals:
+            signal.signal(signal.SIGINT, self._signal_handler)
+    
+    @property
+    def stop_requested(self) -> bool:
+        """True once Ctrl+C was pressed here or (in worker mode) in the parent process."""
+        return self._stop_requested or (self._stop_event is not None and self._stop_event.is_set())
+    
+    @stop_requested.setter
+    def stop_requested(self, value: bool):
+        self._stop_requested = value
         
     def _signal_handler(self, signum, frame):
         """Handle Ctrl+C for graceful shutdown."""
         logger.warning("\n⚠️ Stop requested. Finishing current city and saving progress...")
         self.stop_requested = True
+        if self._stop_event is not None:
+            self._stop_event.set()
         
     def _load_cities(self) -> Dict:
         """Load Romania cities data."""
         with open(CITIES_FILE, 'r', encoding='utf-8') as f:
             return json.load(f)
     
-    def _load_progress(self) -> Dict:
-        """Load scraping progress."""
-        if PROGRESS_FILE.exists():
-            with open(PROGRESS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {
-            "started_at": None,
-            "last_updated": None,
-            "completed_counties": [],
-            "completed_cities": {},  # {county: [city1, city2]}
-            "current_county": None,
-            "current_city": None,
-            "failed": [],
-            "total_businesses": 0,
-            "stats": {}
-        }
-    
-    def _save_progress(self, progress: Dict):
-        """Save scraping progress."""
-        progress["last_updated"] = datetime.now().isoformat()
-        with open(PROGRESS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(progress, f, ensure_ascii=False, indent=2)
-    
     def _get_county_output_file(self, county_name: str) -> Path:
         """Get output file path for a county."""
         slug = county_name.lower().replace(' ', '_').replace('ș', 's').replace('ț', 't').replace('ă', 'a').replace('â', 'a').replace('î', 'i')
         return OUTPUT_DIR / f"maps_{slug}.json"
     
+    def _get_store(self, county_name: str) -> CountyStore:
+        """Get (or open) the append-only store for a county; it holds the county's file lock until closed."""
+        if county_name not in self._stores:
+            self._stores[county_name] = CountyStore(self._get_county_output_file(county_name))
+        return self._stores[county_name]
+    
+    def _close_store(self, county_name: str):
+        """Compact and close a county store once we are done with it."""
+        store = self._stores.pop(county_name, None)
+        if store:
+            store.close()
+    
     def _load_county_data(self, county_name: str) -> List[Dict]:
         """Load existing scraped data for a county."""
-        filepath = self._get_county_output_file(county_name)
-        if filepath.exists():
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return []
-    
-    def _save_county_data(self, county_name: str, businesses: List[Dict]):
-        """Save scraped data for a county with immediate flush to disk."""
-        filepath = self._get_county_output_file(county_name)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(businesses, f, ensure_ascii=False, indent=2)
-            f.flush()  # Force write to OS buffer
-            import os
-            os.fsync(f.fileno())  # Force OS to write to disk
-        logger.info(f"💾 Saved {len(businesses)} businesses to {filepath}")
+        return self._get_store(county_name).records()
     
     def _append_businesses(self, county_name: str, new_businesses: List[MapsBusinessData]):
         """Append new businesses to county data (avoiding duplicates)."""
-        existing = self._load_county_data(county_name)
-        existing_names = {b['name'].lower() for b in existing}
-        
+        store = self._get_store(county_name)
         for biz in new_businesses:
-            biz_dict = {k: v for k, v in biz.__dict__.items() if not k.startswith('_')}
-            if biz.name.lower() not in existing_names:
-                existing.append(biz_dict)
-                existing_names.add(biz.name.lower())
-        
-        self._save_county_data(county_name, existing)
-        return len(existing)
-    
-    def _append_single_business(self, county_name: str, business: MapsBusinessData) -> bool:
-        """Append a single business to county data (avoiding duplicates). Returns True if added."""
-        existing = self._load_county_data(county_name)
-        existing_names = {b['name'].lower() for b in existing}
-        
-        if business.name.lower() not in existing_names:
-            biz_dict = {k: v for k, v in business.__dict__.items() if not k.startswith('_')}
-            existing.append(biz_dict)
-            self._save_county_data(county_name, existing)
-            return True
-        return False
+            store.add({k: v for k, v in biz.__dict__.items() if not k.startswith('_')})
+        return len(store)
+    
+    def _append_single_business(self, county_name: str, business: MapsBusinessData) -> Optional[bool]:
+        """
+        Append a single business to county data (avoiding duplicates).
+        Returns True if added, False if a duplicate, None if handed to the parent (worker mode).
+        """
+        biz_dict = {k: v for k, v in business.__dict__.items() if not k.startswith('_')}
+        if self.result_queue is not None:
+            # Worker mode: the parent does the duplicate check, the write and the ledger counts
+            self.result_queue.put(('business', county_name, self._current_job_city,
+                                   self._current_job_query, biz_dict))
+            return None
+        return self._get_store(county_name).add(biz_dict)
+    
+    def _update_business(self, county_name: str, business: MapsBusinessData):
+        """Re-save a business that is already stored (e.g. after website enrichment)."""
+        biz_dict = {k: v for k, v in business.__dict__.items() if not k.startswith('_')}
+        if self.result_queue is not None:
+            self.result_queue.put(('update', county_name, self._current_job_city,
+                                   self._current_job_query, biz_dict))
+            return
+        self._get_store(county_name).put(biz_dict)
     
     def get_counties_to_scrape(self, county_filter: List[str] = None) -> List[Dict]:
         """Get list of counties to scrape."""
@@ -214,6 +250,16 @@ class RomaniaScraper:
         city_normalized = self._normalize_city_name(city)
         county_normalized = self._normalize_city_name(county)
         
+        # A pinned business is judged by geometry: the county polygon its pin falls in
+        reverse = get_reverse_geocoder() if business.coord_quality == 'exact' else None
+        located = reverse.locate(business.latitude, business.longitude) if reverse and business.latitude else None
+        if located and located['county']:
+            located_county = self._normalize_city_name(located['county'])
+            if city_normalized == 'bucuresti' and county_normalized == 'bucuresti' and located_county == 'ilfov':
+                return self._normalize_city_name(located['city'] or '') in BUCURESTI_METRO_AREA
+            return located_county == county_normalized
+        
+        # No pin or no boundaries indexed - fall back to the address text
         address_normalized = ""
         if business.address:
             address_normalized = self._normalize_city_name(business.address)
@@ -283,221 +329,392 @@ class RomaniaScraper:
         
         return False
     
-    def scrape_city(self, city: str, county: str, scraper: GoogleMapsScraper) -> List[MapsBusinessData]:
+    def scrape_city(self, city: str, county: str, scraper: GoogleMapsScraper,
+                    queries: List[str] = None) -> List[MapsBusinessData]:
         """
         Scrape a single city with INCREMENTAL SAVING.
         Saves each business immediately after extraction to prevent data loss.
-        Uses multiple search terms to find more businesses.
+        Uses multiple search terms to find more businesses; each term is its own
+        ledger job, so an interrupted city resumes at its first unfinished query.
         
         Args:
             city: City name
             county: County name
             scraper: Active GoogleMapsScraper instance
+            queries: Search terms still to run (default: all CITY_SEARCH_QUERIES)
             
         Returns:
             List of business data
         """
         location = f"{city}, {county}, Romania"
-        used_simple_search = False
+        queries = CITY_SEARCH_QUERIES if queries is None else queries
         
         logger.info(f"🔍 Scraping: {city}, {county}")
         
-        try:
-            # Use multiple search terms to find more businesses
-            # Order: most natural term first ("servicii funerare") to maximize unique finds early
-            search_queries = [
-                ("servicii funerare", location),
-                ("pompe funebre", location),
-                ("funerare", location),
-            ]
-            
-            # Note: Removed redundant 4th search for county capitals - geo-locked URLs make it unnecessary
-            
-            all_businesses = []
-            seen_names = set()  # Normalized names for deduplication
+        # Drop queries for an area the county's earlier searches already covered
+        if self.coverage:
+            planned, reason = self.coverage.plan(county, city, queries)
+            if reason:
+                self._skip_queries(county, city, [q for q in queries if q not in planned], reason)
+                queries = planned
+                if not queries:
+                    return []
+        
+        saved_businesses = []
+        seen_names = set()  # Normalized names for deduplication across queries
+        
+        for query in queries:
+            if self.stop_requested:
+                break
             
-            for query, loc in search_queries:
-                if self.stop_requested:
-                    break
-                    
-                logger.info(f"  🔎 Searching: {query} {loc}")
+            started = time.time()
+            self._current_job_query = query
+            try:
+                logger.info(f"  🔎 Searching: {query} {location}")
                 # Pass seen_names to skip re-extracting already-found businesses
-                businesses = scraper.search(query, loc, skip_names=seen_names)
+                businesses = scraper.search(query, location, skip_names=seen_names)
+                last_search = getattr(scraper, 'last_search', None)
                 
                 # Merge results, avoiding duplicates (using normalized names)
-                from tools.maps_scraper import normalize_name
+                new_businesses = []
                 for biz in businesses:
                     normalized = normalize_name(biz.name)
                     if normalized not in seen_names:
                         seen_names.add(normalized)
-                        all_businesses.append(biz)
-                        
-                if len(all_businesses) > 0:
-                    logger.info(f"     Found {len(businesses)} new results, total unique: {len(all_businesses)}")
-            
-            basic_businesses = all_businesses
-            
-            if len(basic_businesses) == 0:
-                logger.info(f"  ℹ️ No businesses found in {city}")
-                return []
+                        new_businesses.append(biz)
+                
+                if new_businesses:
+                    logger.info(f"     Found {len(new_businesses)} new results, total unique: {len(seen_names)}")
+                
+                saved, filtered_count, duplicate_count = self._save_businesses(new_businesses, city, county, scraper)
+                saved_businesses.extend(saved)
+            except Exception as e:
+                logger.error(f"  ❌ Error scraping {city} ({query}): {e}")
+                self.ledger.fail_query(county, city, query, e)
+                continue
             
-            logger.info(f"  📋 Found {len(basic_businesses)} unique businesses total, extracting details...")
+            # A query interrupted half-way stays leased and is released for --resume
+            if self.stop_requested:
+                break
             
-            # PHASE 2: Filter and save incrementally
-            saved_businesses = []
-            filtered_count = 0
+            self.ledger.complete_query(
+                county, city, query,
+                found=len(new_businesses), filtered=filtered_count,
+                saved=len(saved), duplicates=duplicate_count, details=len(businesses),
+                duration=time.time() - started
+            )
+            self.ledger.renew_lease(county, city, self.owner)
             
-            for i, biz in enumerate(basic_businesses):
-                if self.stop_requested:
-                    logger.warning(f"  ⏹️ Stop requested during extraction")
+            if self.coverage and last_search and last_search.get('viewport'):
+                viewport = last_search['viewport']
+                self.ledger.record_search(county, city, query, viewport.lat, viewport.lng, viewport.zoom,
+                                          last_search['names'], last_search['capped'])
+                remaining = queries[queries.index(query) + 1:]
+                reason = self.coverage.after_search(county, city, last_search) if remaining else None
+                if reason:
+                    self._skip_queries(county, city, remaining, reason)
                     break
-                
-                # Filter by location - always verify county to avoid cross-county pollution
-                if not self._business_matches_city(biz, city, county, verify_county=True):
-                    filtered_count += 1
-                    logger.info(f"  ⚠️ [{i+1}/{len(basic_businesses)}] Filtered '{biz.name}' - not in {city}, {county}")
-                    continue
-                
-                # Set county/city if missing
-                if not biz.county:
-                    biz.county = county
-                if not biz.city:
-                    biz.city = city
-                
-                # INCREMENTAL SAVE: Save immediately after processing
-                if self._append_single_business(county, biz):
-                    saved_businesses.append(biz)
-                    logger.info(f"  💾 [{i+1}/{len(basic_businesses)}] Saved: {biz.name}")
-                else:
-                    logger.info(f"  ⏭️ [{i+1}/{len(basic_businesses)}] Duplicate: {biz.name}")
-                
-                # Optional: Enrich from website
-                if self.enrich and biz.website:
-                    try:
-                        scraper.enrich_from_website(biz)
-                        # Re-save with enriched data
-                        self._append_single_business(county, biz)
-                    except Exception as e:
-                        logger.debug(f"  ⚠️ Could not enrich {biz.name}: {e}")
+        
+        if not seen_names:
+            logger.info(f"  ℹ️ No businesses found in {city}")
+        else:
+            logger.info(f"  ✅ {city}: {len(saved_businesses)} businesses saved")
+        return saved_businesses
+    
+    def _skip_queries(self, county: str, city: str, queries: List[str], reason: str):
+        """Mark queries done without searching because their area is already covered."""
+        for query in queries:
+            self.ledger.skip_query(county, city, query, reason)
+        logger.info(f"  ⏭️ Skipping {len(queries)} quer{'y' if len(queries) == 1 else 'ies'} for {city}: {reason}")
+    
+    def _save_businesses(self, businesses: List[MapsBusinessData], city: str, county: str,
+                         scraper: GoogleMapsScraper):
+        """
+        Filter one query's results by location and save them incrementally.
+        
+        Returns:
+            (saved businesses, filtered count, duplicate count). In worker mode
+            businesses are handed to the parent, which does the counting.
+        """
+        saved_businesses = []
+        filtered_count = 0
+        duplicate_count = 0
+        
+        for i, biz in enumerate(businesses):
+            if self.stop_requested:
+                logger.warning(f"  ⏹️ Stop requested during extraction")
+                break
             
-            if filtered_count > 0:
-                logger.info(f"  📍 Filtered {filtered_count} businesses not in {city}")
+            # Filter by location - always verify county to avoid cross-county pollution
+            if not self._business_matches_city(biz, city, county, verify_county=True):
+                filtered_count += 1
+                logger.info(f"  ⚠️ [{i+1}/{len(businesses)}] Filtered '{biz.name}' - not in {city}, {county}")
+                continue
             
-            logger.info(f"  ✅ {city}: {len(saved_businesses)} businesses saved")
-            return saved_businesses
+            # Set county/city if missing
+            if not biz.county:
+                biz.county = county
+            if not biz.city:
+                biz.city = city
             
-        except Exception as e:
-            logger.error(f"  ❌ Error scraping {city}: {e}")
-            return []
+            # INCREMENTAL SAVE: Save immediately after processing
+            added = self._append_single_business(county, biz)
+            if added:
+                saved_businesses.append(biz)
+                logger.info(f"  💾 [{i+1}/{len(businesses)}] Saved: {biz.name}")
+            elif added is False:
+                duplicate_count += 1
+                logger.info(f"  ⏭️ [{i+1}/{len(businesses)}] Duplicate: {biz.name}")
+            
+            # Optional: Enrich from website (duplicates are already stored with their data)
+            if self.enrich and biz.website and added is not False:
+                try:
+                    scraper.enrich_from_website(biz)
+                    # Re-save with enriched data (replaces the stored record)
+                    self._update_business(county, biz)
+                except Exception as e:
+                    logger.debug(f"  ⚠️ Could not enrich {biz.name}: {e}")
+        
+        if filtered_count > 0:
+            logger.info(f"  📍 Filtered {filtered_count} businesses not in {city}")
+        
+        return saved_businesses, filtered_count, duplicate_count
     
-    def scrape_county(self, county_data: Dict, progress: Dict) -> int:
+    def scrape_county(self, county_data: Dict) -> int:
         """
         Scrape all cities in a county.
         
         Args:
             county_data: County info with cities list
-            progress: Progress tracking dict
             
         Returns:
             Total businesses found in county
         """
-        county_name = county_data['name']
-        cities = county_data['cities']
+        return self._scrape_sequential([county_data])
+    
+    def _write_metrics(self, workers: int = 1, pacing: Dict = None):
+        """Refresh the metrics files; a failure here must never stop the scrape."""
+        try:
+            write_metrics(self.ledger, workers=workers, pacing=pacing, prom_path=self.metrics_prom_path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write scrape metrics: {e}")
+    
+    def _budget_exhausted(self) -> bool:
+        """True once the --time-budget deadline has passed (no new cities are started)."""
+        return self.deadline is not None and time.time() >= self.deadline
+    
+    def _scrape_sequential(self, counties_to_scrape: List[Dict]) -> int:
+        """
+        Scrape cities of the given counties in this process with one browser.
         
-        # Get already completed cities for this county
-        completed_cities = set(progress.get('completed_cities', {}).get(county_name, []))
-        cities_to_scrape = [c for c in cities if c not in completed_cities]
+        Cities are claimed from the job ledger, so they come in scheduler
+        priority order (best expected yield first) across all the counties.
+        
+        Returns:
+            Total businesses found
+        """
+        county_names = [c['name'] for c in counties_to_scrape]
+        
+        remaining = {}  # county -> number of cities still to finish
+        for county_data in counties_to_scrape:
+            county_name = county_data['name']
+            completed_cities = set(self.ledger.completed_cities(county_name))
+            remaining[county_name] = len([c for c in county_data['cities'] if c not in completed_cities])
+            if not remaining[county_name]:
+                logger.info(f"✅ County {county_name} already completed")
         
-        if not cities_to_scrape:
-            logger.info(f"✅ County {county_name} already completed")
+        if not sum(remaining.values()):
             return 0
         
         logger.info(f"\n{'='*60}")
-        logger.info(f"🏛️  COUNTY: {county_name}")
-        logger.info(f"   Cities: {len(cities_to_scrape)} remaining (of {len(cities)} total)")
+        logger.info(f"🏛️  COUNTIES: {', '.join(n for n in county_names if remaining[n])}")
+        logger.info(f"   Cities: {sum(remaining.values())} remaining")
         logger.info(f"{'='*60}")
         
-        progress['current_county'] = county_name
-        
         # Track per-city stats for summary
-        city_stats = {}
+        county_stats = {}  # county -> {city: count}
         total_found = 0
         
         # Use geocode=False for fast scraping (batch geocode later)
-        with GoogleMapsScraper(headless=self.headless, geocode=self.geocode) as scraper:
-            for city in cities_to_scrape:
-                if self.stop_requested:
-                    logger.warning(f"⏹️ Stopping after {city}")
+        with GoogleMapsScraper(headless=self.headless, geocode=self.geocode, pacer=self.pacer) as scraper:
+            while not self.stop_requested:
+                if self._budget_exhausted():
+                    logger.info("⏱️ Time budget used up - leaving remaining cities for --resume")
                     break
                 
-                progress['current_city'] = city
-                self._save_progress(progress)
+                job = self.ledger.claim_city(self.owner, counties=county_names)
+                if job is None:
+                    break
+                county_name, city, queries = job
                 
                 # Scrape city (now saves incrementally)
-                businesses = self.scrape_city(city, county_name, scraper)
+                businesses = self.scrape_city(city, county_name, scraper, queries)
+                # Hand back whatever a stop left unfinished (no-op when the city completed)
+                self.ledger.release_city(county_name, city, self.owner)
                 
-                city_count = len(businesses)
-                city_stats[city] = city_count
-                total_found += city_count
-                progress['total_businesses'] = progress.get('total_businesses', 0) + city_count
+                city_stats = county_stats.setdefault(county_name, {})
+                city_stats[city] = city_stats.get(city, 0) + len(businesses)
+                total_found += len(businesses)
                 
-                # Mark city as completed
-                if county_name not in progress['completed_cities']:
-                    progress['completed_cities'][county_name] = []
-                progress['completed_cities'][county_name].append(city)
-                self._save_progress(progress)
+                if self.ledger.county_done(county_name):
+                    self._finish_county(county_name, city_stats)
+                self._write_metrics(pacing={'0': scraper.pacer.stats()})
                 
-                # Random delay between cities (2-5 seconds)
-                delay = 2 + (hash(city) % 30) / 10  # 2-5 seconds
-                time.sleep(delay)
+                if self.stop_requested:
+                    logger.warning(f"⏹️ Stopping after {city}")
+                    break
+                # No fixed delay between cities - the next search waits for the pacer
+            
+            logger.info(f"🚦 Pacing: {scraper.pacer.stats()}")
+        
+        return total_found
+    
+    def _finish_county(self, county_name: str, city_stats: Dict[str, int]):
+        """Compact a finished county's file and log its summary."""
+        # Fold the county journal into its JSON snapshot
+        self._close_store(county_name)
         
         # County summary
         logger.info(f"\n{'-'*40}")
         logger.info(f"📊 {county_name} SUMMARY:")
         for city, count in city_stats.items():
             logger.info(f"   • {city}: {count} businesses")
-        logger.info(f"   TOTAL: {total_found} businesses")
+        logger.info(f"   TOTAL: {sum(city_stats.values())} businesses")
         logger.info(f"{'-'*40}")
+        logger.info(f"✅ Completed {county_name}: {self.ledger.county_saved(county_name)} businesses")
+    
+    def _scrape_parallel(self, counties_to_scrape: List[Dict], workers: int):
+        """
+        Scrape cities with a pool of worker processes, each driving its own browser.
         
-        # Mark county as completed if all cities done
-        if not self.stop_requested:
-            progress['completed_counties'].append(county_name)
-            progress['stats'][county_name] = total_found
-            self._save_progress(progress)
-            logger.info(f"✅ Completed {county_name}: {total_found} businesses")
-        
-        return total_found
+        Workers claim cities from the job ledger (atomic leases, so no two workers
+        get the same city) and stream businesses back over a result queue. This
+        process is the only one of the run that touches county files; each open
+        county store also holds the county's file lock against other tools.
+        """
+        county_names = [c['name'] for c in counties_to_scrape]
+        remaining = {}  # county -> number of cities still to finish
+        for county_data in counties_to_scrape:
+            county_name = county_data['name']
+            done = set(self.ledger.completed_cities(county_name))
+            remaining[county_name] = len([c for c in county_data['cities'] if c not in done])
+        
+        job_count = sum(remaining.values())
+        if job_count == 0:
+            logger.info("✅ All selected cities already completed")
+            return
+        workers = min(workers, job_count)
+        
+        ctx = mp.get_context()
+        result_queue = ctx.Queue()
+        if self._stop_event is None:
+            self._stop_event = ctx.Event()
+        
+        logger.info(f"🚀 Starting {workers} worker processes for {job_count} cities")
+        
+        processes = []
+        for worker_id in range(workers):
+            proc = ctx.Process(
+                target=_worker_main,
+                args=(worker_id, county_names, result_queue, self._stop_event,
+                      self.headless, self.enrich, self.geocode, self.deadline, self.coverage is not None),
+                daemon=True,
+            )
+            proc.start()
+            processes.append(proc)
+        
+        city_saved = {}     # (county, city) -> businesses added by this run
+        accepted = set()    # (county, name) accepted this run - only these may be updated
+        pacing = {}         # worker id -> last reported pacer stats
+        finished_workers = 0
+        metrics_written = time.time()
+        
+        while finished_workers < workers:
+            if time.time() - metrics_written >= METRICS_INTERVAL_SECONDS:
+                self._write_metrics(workers=workers - finished_workers, pacing=pacing)
+                metrics_written = time.time()
+            
+            try:
+                message = result_queue.get(timeout=1.0)
+            except queue.Empty:
+                # Don't wait forever on a worker that died without reporting
+                if not any(p.is_alive() for p in processes):
+                    break
+                continue
+            
+            kind = message[0]
+            
+            if kind == 'business':
+                _, county_name, city, query, biz_dict = message
+                if self._get_store(county_name).add(biz_dict):
+                    accepted.add((county_name, biz_dict['name'].lower()))
+                    city_saved[(county_name, city)] = city_saved.get((county_name, city), 0) + 1
+                    self.ledger.record_saves(county_name, city, query, saved=1)
+                    logger.info(f"  💾 [{county_name}/{city}] Saved: {biz_dict['name']}")
+                else:
+                    self.ledger.record_saves(county_name, city, query, duplicates=1)
+                    logger.info(f"  ⏭️ [{county_name}/{city}] Duplicate: {biz_dict['name']}")
+            
+            elif kind == 'update':
+                _, county_name, city, query, biz_dict = message
+                if (county_name, biz_dict['name'].lower()) in accepted:
+                    self._get_store(county_name).put(biz_dict)
+            
+            elif kind == 'city_done':
+                _, worker_id, county_name, city, pacer_stats = message
+                pacing[str(worker_id)] = pacer_stats
+                saved = city_saved.pop((county_name, city), 0)
+                logger.info(f"  ✅ Worker {worker_id} finished {city}, {county_name}: {saved} businesses saved")
+                remaining[county_name] -= 1
+                
+                if remaining[county_name] <= 0 and self.ledger.county_done(county_name):
+                    # Last city of the county: compact its file
+                    self._close_store(county_name)
+                    logger.info(f"✅ Completed {county_name}: {self.ledger.county_saved(county_name)} businesses")
+            
+            elif kind == 'worker_exit':
+                finished_workers += 1
+        
+        for proc in processes:
+            proc.join(timeout=30)
+            if proc.is_alive():
+                logger.warning(f"⚠️ Worker {proc.pid} did not exit, terminating")
+                proc.terminate()
     
-    def scrape(self, counties: List[str] = None, resume: bool = True):
+    def scrape(self, counties: List[str] = None, resume: bool = True, workers: int = 1,
+               time_budget: float = None, schedule: bool = True):
         """
         Main scraping method.
         
         Args:
             counties: List of county names to scrape (None = all)
-            resume: Resume from previous progress
+            resume: Resume from previous progress (False restarts the selected counties)
+            workers: Number of browser worker processes (1 = scrape sequentially in this process)
+            time_budget: Seconds after which no new city is started (None = no limit)
+            schedule: Order cities by expected yield per minute (False = file order)
         """
-        progress = self._load_progress() if resume else {
-            "started_at": datetime.now().isoformat(),
-            "last_updated": None,
-            "completed_counties": [],
-            "completed_cities": {},
-            "current_county": None,
-            "current_city": None,
-            "failed": [],
-            "total_businesses": 0,
-            "stats": {}
-        }
-        
-        if not progress.get('started_at'):
-            progress['started_at'] = datetime.now().isoformat()
-        
-        # Get counties to scrape
+        # Get counties to scrape and make sure the ledger has a job for each city/query
         counties_to_scrape = self.get_counties_to_scrape(counties)
+        for county_data in counties_to_scrape:
+            self.ledger.ensure_jobs(county_data['name'], county_data['cities'], CITY_SEARCH_QUERIES)
+        
+        if not resume:
+            self.ledger.reset([c['name'] for c in counties_to_scrape])
+        elif not self.ledger.get_meta('started_at'):
+            self.ledger.set_meta('started_at', datetime.now().isoformat())
         
         # Filter out already completed counties
-        completed = set(progress.get('completed_counties', []))
+        completed = {c['name'] for c in counties_to_scrape if self.ledger.county_done(c['name'])}
         counties_to_scrape = [c for c in counties_to_scrape if c['name'] not in completed]
         
+        # Claim order: best expected yield per minute first, or plain file order
+        if schedule:
+            scheduler = CityScheduler(self.ledger, queries_per_city=len(CITY_SEARCH_QUERIES))
+            scheduler.prioritize(counties_to_scrape, time_budget=time_budget, workers=workers)
+        else:
+            self.ledger.set_priorities({(c['name'], city): 0 for c in counties_to_scrape for city in c['cities']})
+        self.deadline = time.time() + time_budget if time_budget else None
+        
         logger.info(f"\n{'='*60}")
         logger.info(f"🇷🇴 ROMANIA FUNERAL COMPANY SCRAPER")
         logger.info(f"{'='*60}")
@@ -505,28 +722,95 @@ class RomaniaScraper:
         logger.info(f"Already completed: {len(completed)}")
         logger.info(f"Headless mode: {self.headless}")
         logger.info(f"Website enrichment: {self.enrich}")
+        logger.info(f"Workers: {workers}")
+        logger.info(f"Order: {'expected yield' if schedule else 'file order'}")
+        if time_budget:
+            logger.info(f"Time budget: {time_budget / 60:.0f} min")
         logger.info(f"{'='*60}\n")
         
-        total_businesses = progress.get('total_businesses', 0)
+        if workers > 1:
+            self._scrape_parallel(counties_to_scrape, workers)
+        else:
+            self._scrape_sequential(counties_to_scrape)
+        
+        # Make sure nothing is left in an un-compacted journal
+        for county_name in list(self._stores):
+            self._close_store(county_name)
         
-        for county_data in counties_to_scrape:
-            if self.stop_requested:
-                break
-            
-            found = self.scrape_county(county_data, progress)
-            total_businesses += found
+        summary = self.ledger.summary()
+        self._write_metrics(workers=0)
         
         # Final summary
         logger.info(f"\n{'='*60}")
         logger.info(f"📊 SCRAPING SUMMARY")
         logger.info(f"{'='*60}")
-        logger.info(f"Total businesses found: {progress.get('total_businesses', 0)}")
-        logger.info(f"Counties completed: {len(progress.get('completed_counties', []))}")
-        logger.info(f"Status: {'INTERRUPTED' if self.stop_requested else 'COMPLETED'}")
+        logger.info(f"Total businesses found: {summary['total_businesses']}")
+        logger.info(f"Counties completed: {len(summary['completed_counties'])}")
+        if summary['failed']:
+            logger.info(f"Failed jobs: {len(summary['failed'])} (retried on --resume)")
+        if self.stop_requested:
+            status = 'INTERRUPTED'
+        elif self._budget_exhausted():
+            status = 'TIME BUDGET USED UP'
+        else:
+            status = 'COMPLETED'
+        logger.info(f"Status: {status}")
         logger.info(f"{'='*60}\n")
         
-        self._save_progress(progress)
-        return progress
+        return summary
+
+
+def _worker_main(worker_id: int, counties: List[str], result_queue, stop_event,
+                 headless: bool, enrich: bool, geocode: bool, deadline: float = None,
+                 coverage: bool = True):
+    """
+    Worker process: owns one browser and claims cities of the given counties
+    from the job ledger until none are left, the time budget is used up
+    or the parent sets stop_event.
+    """
+    # Ctrl+C is handled by the parent, which tells us to stop via stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    
+    worker = RomaniaScraper(
+        headless=headless, enrich=enrich, geocode=geocode,
+        stop_event=stop_event, result_queue=result_queue, handle_signals=False, coverage=coverage
+    )
+    worker.deadline = deadline
+    
+    try:
+        with GoogleMapsScraper(headless=headless, geocode=geocode) as scraper:
+            while not worker.stop_requested and not worker._budget_exhausted():
+                job = worker.ledger.claim_city(worker.owner, counties=counties)
+                if job is None:
+                    break
+                county_name, city, queries = job
+                
+                worker._current_job_city = city
+                try:
+                    worker.scrape_city(city, county_name, scraper, queries)
+                finally:
+                    # Unfinished queries go back to pending for --resume
+                    worker.ledger.release_city(county_name, city, worker.owner)
+                
+                if worker.stop_requested:
+                    break
+                result_queue.put(('city_done', worker_id, county_name, city, scraper.pacer.stats()))
+            
+            logger.info(f"🚦 Worker {worker_id} pacing: {scraper.pacer.stats()}")
+    except Exception as e:
+        logger.error(f"❌ Worker {worker_id} crashed: {e}")
+    finally:
+        worker.ledger.close()
+        result_queue.put(('worker_exit', worker_id))
+
+
+def parse_duration(value: str) -> float:
+    """Parse a duration like "2h", "90m", "45s" or "1.5" (hours) into seconds."""
+    value = value.strip().lower()
+    units = {'h': 3600, 'm': 60, 's': 1}
+    if value and value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value) * 3600
 
 
 def main():
@@ -557,6 +841,26 @@ def main():
         '--enrich', action='store_true',
         help='Enrich data from company websites (slower)'
     )
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help='Number of parallel browser processes, each scraping one city at a time (default: 1)'
+    )
+    parser.add_argument(
+        '--time-budget', type=str,
+        help='Stop starting new cities after this long, e.g. "2h" or "90m" (best cities go first)'
+    )
+    parser.add_argument(
+        '--file-order', action='store_true',
+        help='Scrape cities in romania_cities.json order instead of by expected yield'
+    )
+    parser.add_argument(
+        '--no-coverage', action='store_true',
+        help='Search every town, even where earlier searches already covered its map area'
+    )
+    parser.add_argument(
+        '--metrics-textfile', type=str,
+        help='Where to write Prometheus metrics (default: data/scrape_metrics.prom, "none" to disable)'
+    )
     parser.add_argument(
         '--list-counties', action='store_true',
         help='List all available counties and exit'
@@ -583,21 +887,52 @@ def main():
     
     # Show status
     if args.status:
-        if PROGRESS_FILE.exists():
-            with open(PROGRESS_FILE, 'r', encoding='utf-8') as f:
-                progress = json.load(f)
+        ledger = JobLedger()
+        ledger.import_legacy_progress(PROGRESS_FILE, CITY_SEARCH_QUERIES)
+        summary = ledger.summary()
+        if summary['counties']:
             print("\n📊 Scraping Progress:\n")
-            print(f"Started: {progress.get('started_at', 'N/A')}")
-            print(f"Last updated: {progress.get('last_updated', 'N/A')}")
-            print(f"Total businesses: {progress.get('total_businesses', 0)}")
-            print(f"Completed counties: {len(progress.get('completed_counties', []))}")
-            if progress.get('completed_counties'):
-                print(f"  {', '.join(progress['completed_counties'])}")
-            print(f"Current: {progress.get('current_county', 'N/A')} / {progress.get('current_city', 'N/A')}")
-            if progress.get('stats'):
-                print("\n📈 Per-county stats:")
-                for county, count in progress['stats'].items():
-                    print(f"  {county}: {count} businesses")
+            print(f"Started: {summary['started_at'] or 'N/A'}")
+            print(f"Last updated: {summary['last_updated'] or 'N/A'}")
+            print(f"Total businesses: {summary['total_businesses']}")
+            print(f"Completed counties: {len(summary['completed_counties'])}")
+            if summary['completed_counties']:
+                print(f"  {', '.join(summary['completed_counties'])}")
+            jobs = summary['jobs_by_status']
+            print("Jobs: " + ", ".join(f"{jobs.get(s, 0)} {s}" for s in ('done', 'leased', 'pending', 'failed')))
+            skipped = ledger.skipped_jobs()
+            if skipped:
+                print(f"Skipped as already covered: {skipped} searches")
+            for job in summary['in_flight']:
+                print(f"Current: {job['county']} / {job['city']} ({job['lease_owner']})")
+            if summary['failed']:
+                print("\n❌ Failed jobs:")
+                for job in summary['failed']:
+                    print(f"  {job['county']} / {job['city']} [{job['query']}] "
+                          f"attempt {job['attempts']}: {job['last_error']}")
+            
+            # Rolling metrics written by the running scrape (computed from the ledger if absent)
+            metrics = load_metrics() or compute_metrics(ledger)
+            rolling, eta = metrics['rolling'], metrics['eta']
+            print(f"\n⚡ Throughput (last {metrics['window_s'] / 60:.0f} min, as of {metrics['generated_at'][:19]}):")
+            print(f"  Businesses/min: {rolling['businesses_per_min'] if rolling['businesses_per_min'] is not None else 'N/A'}")
+            print(f"  Details/min: {rolling['details_per_min'] if rolling['details_per_min'] is not None else 'N/A'}")
+            print(f"  Seconds/city: {rolling['seconds_per_city'] if rolling['seconds_per_city'] is not None else 'N/A'}")
+            if rolling['filtered_ratio'] is not None:
+                print(f"  Filtered: {rolling['filtered_ratio']:.0%} of results")
+            if rolling['duplicate_ratio'] is not None:
+                print(f"  Duplicates: {rolling['duplicate_ratio']:.0%} of in-area results")
+            print(f"  Cities: {metrics['totals']['cities_done']}/{metrics['totals']['cities_total']} done, "
+                  f"ETA {format_duration(eta['eta_s'])}" + (f" ({eta['eta_at'][:16]})" if eta['eta_at'] else ""))
+            for worker, stats in metrics.get('pacing', {}).items():
+                print(f"  Browser {worker}: {stats['rate']} req/s, {stats['throttles']} throttles")
+            
+            print("\n📈 Per-county stats:")
+            for county in metrics['counties']:
+                mark = "✅" if county['cities_done'] == county['cities'] else "⏳"
+                per_city = f", {county['businesses_per_city']}/city" if county['businesses_per_city'] is not None else ""
+                print(f"  {mark} {county['county']}: {county['saved']} businesses "
+                      f"({county['cities_done']}/{county['cities']} cities{per_city})")
         else:
             print("No scraping progress found. Run --all or --county to start.")
         return
@@ -617,10 +952,19 @@ def main():
     # Run scraper
     scraper = RomaniaScraper(
         headless=not args.no_headless,
-        enrich=args.enrich
+        enrich=args.enrich,
+        coverage=not args.no_coverage,
     )
+    if args.metrics_textfile:
+        scraper.metrics_prom_path = None if args.metrics_textfile.lower() == 'none' else Path(args.metrics_textfile)
     
-    scraper.scrape(counties=counties_filter, resume=args.resume or args.all)
+    scraper.scrape(
+        counties=counties_filter,
+        resume=args.resume or args.all,
+        workers=args.workers,
+        time_budget=parse_duration(args.time_budget) if args.time_budget else None,
+        schedule=not args.file_order,
+    )
 
 
 if __name__ == "__main__":
@@ -3,26 +3,73 @@ ANAF API Tool - Romanian Tax Authority public API for company verification.
 
 Uses the official ANAF API to get company details from CUI (fiscal code).
 API docs: https://static.anaf.ro/static/10/Anaf/Informatii_R/documentatie_SW_v9.txt
+
+One request can carry up to BATCH_SIZE CUIs and ANAF allows about one
+request per second, so lookup_batch() checks thousands of companies in a
+couple of minutes. validate_cui() rejects malformed codes (control digit)
+before they cost a request.
+
+Answers (found and not found) are kept in the local company registry
+(tools/company_registry.py) and served from there while fresh.
 """
 import requests
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 import time
 import re
 
+try:
+    from tools.company_registry import get_company_registry
+except ImportError:
+    from company_registry import get_company_registry
+
+# CUIs per request (ANAF limit)
+BATCH_SIZE = 100
+# Attempts per batch on network errors, 429 and 5xx
+BATCH_RETRIES = 3
+# Weights of the CUI control digit, applied to the first 9 digits right-aligned
+CUI_CONTROL_KEY = "753217532"
+
+
+def validate_cui(cui) -> Optional[int]:
+    """
+    Numeric CUI if it is well formed, else None.
+
+    Accepts "RO 1810870", "1810870", 1810870. The last digit is the control
+    digit: the other digits, right-aligned against the key 753217532, are
+    multiplied pairwise and summed; control = sum * 10 % 11 (10 becomes 0).
+    """
+    if cui is None:
+        return None
+    digits = re.sub(r'^\s*RO', '', str(cui).strip(), flags=re.IGNORECASE)
+    digits = re.sub(r'[\s.\-]', '', digits)
+    if not digits.isdigit() or not 2 <= len(digits) <= 10:
+        return None
+
+    body, control = digits[:-1].zfill(9), int(digits[-1])
+    total = sum(int(d) * int(k) for d, k in zip(body, CUI_CONTROL_KEY))
+    if total * 10 % 11 % 10 != control:
+        return None
+    return int(digits)
+
 
 class ANAFTool:
     """Tool to query ANAF API for company information by CUI."""
     
     BASE_URL = "https://webservicesp.anaf.ro/api/PlatitorTvaRest/api/v9/ws/tva"
     
-    def __init__(self):
+    def __init__(self, use_registry: bool = True):
+        """
+        Args:
+            use_registry: Answer from / store into the local company registry
+        """
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/json',
             'Accept': 'application/json'
         })
         self._last_request_time = 0
+        self.registry = get_company_registry() if use_registry else None
     
     def _rate_limit(self):
         """Ensure at least 1 second between requests."""
@@ -41,6 +88,28 @@ class ANAFTool:
             return int(cleaned)
         return None
     
+    def _parse_found(self, company: Dict) -> Dict:
+        """Fields we use from one 'found' item of an ANAF response."""
+        general = company.get('date_generale', {}) or {}
+        address = company.get('adresa_sediu_social', {}) or company.get('adresa_domiciliu_fiscal', {}) or {}
+        inactive = company.get('stare_inactiv', {}) or {}
+        # e.g. "INREGISTRAT din data 03.04.1992", "RADIERE din data 12.05.2021"
+        status = general.get('stare_inregistrare', '') or ''
+        
+        return {
+            'success': True,
+            'cui': general.get('cui'),
+            'name': general.get('denumire', ''),
+            'registration_number': general.get('nrRegCom', ''),
+            'status': status,
+            'address': self._format_address(address),
+            'city': address.get('denumire_Localitate', ''),
+            'county': address.get('denumire_Judet', ''),
+            'is_active': (status.upper().startswith('INREGISTRAT') and
+                          not inactive.get('statusInactivi') and not inactive.get('dataRadiere')),
+            'raw': company
+        }
+    
     def lookup_company(self, cui: str) -> dict:
         """
         Look up company details by CUI.
@@ -55,6 +124,11 @@ class ANAFTool:
         if not numeric_cui:
             return {'success': False, 'error': 'Invalid CUI format'}
         
+        if self.registry:
+            cached = self.registry.get('anaf', cui=numeric_cui)
+            if cached:
+                return self._from_registry(numeric_cui, cached)
+        
         self._rate_limit()
         
         today = datetime.now().strftime('%Y-%m-%d')
@@ -66,30 +140,11 @@ class ANAFTool:
             data = response.json()
             
             if data.get('found') and len(data['found']) > 0:
-                company = data['found'][0]
-                
-                # Extract relevant fields
-                general = company.get('date_generale', {})
-                address = company.get('adresa_sediu_social', {}) or company.get('adresa_domiciliu_fiscal', {})
-                
-                return {
-                    'success': True,
-                    'cui': numeric_cui,
-                    'name': general.get('denumire', ''),
-                    'registration_number': general.get('nrRegCom', ''),
-                    'status': general.get('stare_inregistrare', ''),
-                    'address': self._format_address(address),
-                    'city': address.get('denumire_Localitate', ''),
-                    'county': address.get('denumire_Judet', ''),
-                    'is_active': general.get('stare_inregistrare', '').upper() == 'INREGISTRAT',
-                    'raw': company
-                }
+                result = dict(self._parse_found(data['found'][0]), cui=numeric_cui)
             else:
-                return {
-                    'success': False,
-                    'error': f'CUI {numeric_cui} not found in ANAF database',
-                    'cui': numeric_cui
-                }
+                result = self._not_found(numeric_cui)
+            self._remember(result)
+            return result
                 
         except requests.exceptions.RequestException as e:
             return {
@@ -98,6 +153,25 @@ class ANAFTool:
                 'cui': numeric_cui
             }
     
+    @staticmethod
+    def _not_found(cui: int) -> Dict:
+        return {
+            'success': False,
+            'error': f'CUI {cui} not found in ANAF database',
+            'cui': cui
+        }
+    
+    def _remember(self, result: Dict):
+        """Store an ANAF answer in the registry (by CUI, with the legal name)."""
+        if self.registry:
+            self.registry.put('anaf', result if result['success'] else None,
+                              cui=result['cui'], name=result.get('name'))
+    
+    def _from_registry(self, cui: int, cached: Dict) -> Dict:
+        if cached['found']:
+            return dict(cached['payload'], cui=cui, cached=True)
+        return dict(self._not_found(cui), cached=True)
+    
     def _format_address(self, addr: dict) -> str:
         """Format address from ANAF response."""
         parts = []
@@ -111,50 +185,60 @@ class ANAFTool:
             parts.append(f"Jud. {addr['denumire_Judet']}")
         return ', '.join(parts) if parts else ''
     
-    def lookup_batch(self, cui_list: list) -> list:
+    def _post_batch(self, payload: List[Dict], retries: int) -> Optional[Dict]:
+        """POST one batch, retrying network errors, 429 and 5xx with backoff. None if all attempts fail."""
+        for attempt in range(1, retries + 1):
+            self._rate_limit()
+            try:
+                response = self.session.post(self.BASE_URL, json=payload, timeout=30)
+                if response.status_code == 429 or response.status_code >= 500:
+                    raise requests.exceptions.HTTPError(f"HTTP {response.status_code}", response=response)
+                response.raise_for_status()
+                return response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                if attempt == retries:
+                    print(f"Batch lookup error (gave up after {retries} attempts): {e}")
+                    return None
+                delay = 2 ** attempt
+                print(f"Batch lookup error: {e} - retrying in {delay}s")
+                time.sleep(delay)
+    
+    def lookup_batch(self, cui_list: list, retries: int = BATCH_RETRIES, refresh: bool = False) -> list:
         """
         Look up multiple companies at once (max 100 per request).
         
         Args:
             cui_list: List of CUI strings
+            retries: Attempts per batch
+            refresh: Ask ANAF even for CUIs with a fresh registry answer
             
         Returns:
-            List of company info dicts
+            List of company info dicts; CUIs ANAF does not know come back with
+            success False, CUIs in a batch that kept failing are left out
         """
         results = []
+        cuis = list(dict.fromkeys(c for c in (self._clean_cui(cui) for cui in cui_list) if c))
+        
+        if self.registry and not refresh:
+            cached = self.registry.get_many('anaf', cuis)
+            results.extend(self._from_registry(cui, answer) for cui, answer in cached.items())
+            cuis = [cui for cui in cuis if cui not in cached]
         
         # Process in batches of 100
-        for i in range(0, len(cui_list), 100):
-            batch = cui_list[i:i+100]
-            self._rate_limit()
-            
+        for i in range(0, len(cuis), BATCH_SIZE):
+            batch = cuis[i:i + BATCH_SIZE]
             today = datetime.now().strftime('%Y-%m-%d')
-            payload = [{"cui": self._clean_cui(cui), "data": today} 
-                      for cui in batch if self._clean_cui(cui)]
+            payload = [{"cui": cui, "data": today} for cui in batch]
             
-            if not payload:
+            data = self._post_batch(payload, retries)
+            if data is None:
                 continue
-                
-            try:
-                response = self.session.post(self.BASE_URL, json=payload, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                
-                for company in data.get('found', []):
-                    general = company.get('date_generale', {})
-                    address = company.get('adresa_sediu_social', {}) or {}
-                    
-                    results.append({
-                        'success': True,
-                        'cui': general.get('cui'),
-                        'name': general.get('denumire', ''),
-                        'city': address.get('denumire_Localitate', ''),
-                        'county': address.get('denumire_Judet', ''),
-                        'is_active': general.get('stare_inregistrare', '').upper() == 'INREGISTRAT'
-                    })
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"Batch lookup error: {e}")
+            
+            fetched = [self._parse_found(company) for company in data.get('found', []) or []]
+            fetched += [self._not_found(self._clean_cui(cui)) for cui in data.get('notFound', []) or []]
+            for result in fetched:
+                self._remember(result)
+            results.extend(fetched)
                 
         return results
 
@@ -0,0 +1,163 @@
+"""
+City Scheduler - orders national scrape jobs by expected yield per minute.
+
+romania_cities.json lists cities county by county, so a run interrupted
+halfway used to spend much of its time on small towns with no funeral
+businesses. The scheduler estimates, for every (county, city):
+
+- expected businesses: from population when romania_cities.json has it
+  (optional "population": {city: n} per county), otherwise from the city's
+  rank in its county list (lists are ordered largest first), boosted for the
+  county capital; blended with the yield seen in previous runs
+- expected minutes: from previous runs, otherwise from the query count
+
+and writes expected businesses per minute into the job ledger as the claim
+priority. With a time budget it also reports what the budget should cover.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .job_ledger import JobLedger
+
+logger = logging.getLogger(__name__)
+
+# Prior: roughly one funeral business per this many residents
+PEOPLE_PER_BUSINESS = 6000
+# Prior without population: capital / first-ranked town of a county
+CAPITAL_BUSINESSES = 8.0
+TOWN_BUSINESSES = 3.0
+RANK_DECAY = 0.8  # Expected yield of the n-th town ~ TOWN_BUSINESSES / n^RANK_DECAY
+# How many city runs the prior is worth when blending with history
+PRIOR_WEIGHT = 1.0
+# Duration model without history: per search + per result detail extraction
+SECONDS_PER_QUERY = 20.0
+SECONDS_PER_RESULT = 4.0
+
+
+@dataclass
+class CityEstimate:
+    """Expected yield of scraping one city."""
+    county: str
+    city: str
+    expected_businesses: float
+    expected_seconds: float
+    is_capital: bool = False
+    history_runs: int = 0
+
+    @property
+    def per_minute(self) -> float:
+        return self.expected_businesses / max(self.expected_seconds / 60, 0.1)
+
+
+class CityScheduler:
+    """Estimates city yields and sets job ledger priorities from them."""
+
+    def __init__(self, ledger: JobLedger, queries_per_city: int = 3):
+        """
+        Args:
+            ledger: Job ledger holding the jobs and the yield history
+            queries_per_city: Search queries run for each city (for the duration prior)
+        """
+        self.ledger = ledger
+        self.queries_per_city = queries_per_city
+
+    def _prior_businesses(self, county_data: Dict, city: str, rank: int) -> float:
+        """Expected businesses before any history is known."""
+        population = county_data.get('population', {}).get(city)
+        if population:
+            return max(population / PEOPLE_PER_BUSINESS, 0.2)
+        if city == county_data.get('capital'):
+            return CAPITAL_BUSINESSES
+        return TOWN_BUSINESSES / (rank ** RANK_DECAY)
+
+    def estimate(self, counties: List[Dict]) -> List[CityEstimate]:
+        """
+        Estimate every city of the given counties, best yield per minute first.
+
+        Args:
+            counties: County entries from romania_cities.json
+
+        Returns:
+            List of CityEstimate sorted by per_minute, descending
+        """
+        history = self.ledger.city_history()
+        estimates = []
+
+        for county_data in counties:
+            county = county_data['name']
+            capital = county_data.get('capital')
+            rank = 0
+            for city in county_data['cities']:
+                is_capital = city == capital
+                if not is_capital:
+                    rank += 1
+                prior = self._prior_businesses(county_data, city, rank)
+
+                past = history.get((county, city))
+                if past:
+                    runs = past['runs']
+                    # Shrink towards the prior while there are few runs
+                    expected = (prior * PRIOR_WEIGHT + past['matched'] * runs) / (PRIOR_WEIGHT + runs)
+                    seconds = past['duration_s']
+                else:
+                    runs = 0
+                    expected = prior
+                    seconds = self.queries_per_city * SECONDS_PER_QUERY + expected * SECONDS_PER_RESULT
+
+                estimates.append(CityEstimate(
+                    county=county,
+                    city=city,
+                    expected_businesses=expected,
+                    expected_seconds=max(seconds, 1.0),
+                    is_capital=is_capital,
+                    history_runs=runs,
+                ))
+
+        estimates.sort(key=lambda e: e.per_minute, reverse=True)
+        return estimates
+
+    def prioritize(self, counties: List[Dict], time_budget: Optional[float] = None,
+                   workers: int = 1) -> List[CityEstimate]:
+        """
+        Write yield-per-minute priorities into the ledger so claims go best-first.
+
+        Args:
+            counties: County entries to schedule
+            time_budget: Optional wall-clock budget in seconds (only used for the plan report)
+            workers: Parallel browsers sharing the budget
+
+        Returns:
+            The estimates, best first
+        """
+        estimates = self.estimate(counties)
+        self.ledger.set_priorities({(e.county, e.city): e.per_minute for e in estimates})
+
+        if estimates:
+            top = ", ".join(f"{e.city} ({e.per_minute:.2f}/min)" for e in estimates[:5])
+            logger.info(f"📅 Scheduled {len(estimates)} cities by expected yield. First: {top}")
+        if time_budget:
+            done = {(c['name'], city) for c in counties for city in self.ledger.completed_cities(c['name'])}
+            self.log_plan([e for e in estimates if (e.county, e.city) not in done], time_budget, workers)
+        return estimates
+
+    def plan(self, estimates: List[CityEstimate], time_budget: float,
+             workers: int = 1) -> List[CityEstimate]:
+        """Cities expected to fit in a time budget (greedy, in priority order)."""
+        planned = []
+        elapsed = 0.0
+        capacity = time_budget * max(workers, 1)
+        for estimate in estimates:
+            if elapsed + estimate.expected_seconds > capacity:
+                break
+            planned.append(estimate)
+            elapsed += estimate.expected_seconds
+        return planned
+
+    def log_plan(self, estimates: List[CityEstimate], time_budget: float, workers: int = 1):
+        """Log how much of the expected total a time budget should capture."""
+        planned = self.plan(estimates, time_budget, workers)
+        total = sum(e.expected_businesses for e in estimates) or 1.0
+        covered = sum(e.expected_businesses for e in planned)
+        logger.info(f"⏱️ Time budget {time_budget / 3600:.1f}h: ~{len(planned)}/{len(estimates)} cities, "
+                    f"~{covered:.0f} of ~{total:.0f} expected businesses ({covered / total:.0%})")
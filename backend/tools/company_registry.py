@@ -0,0 +1,244 @@
+"""
+Company Registry - local SQLite store of company lookups by CUI and legal name.
+
+Company data comes from three slow sources: ANAF (ANAFTool, ~1 request/s),
+listafirme.ro through Firecrawl (CUILookupTool, paid and slow) and the DSP
+authorization lists (DSPScraper). Every answer is kept here, one row per
+source and key:
+
+- by CUI              key "cui:1810870"
+- by normalized name  key "name:OBELISC" or "name:OBELISC|timisoara" (no legal
+  form, case or diacritics; city when the lookup was narrowed by one)
+
+Rows carry the source's payload, when it was fetched and when it expires
+(SOURCE_TTL_DAYS per source; "not found" answers live NEGATIVE_TTL_DAYS).
+The tools check the registry before the network, so re-running enrichment
+over companies we already know costs no requests. records() gives every
+source's current answer for one company.
+
+The file is shared by every process (WAL mode) and one instance can be used
+from several threads.
+"""
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from tools.dsp_verification import normalize_company_name
+except ImportError:
+    from dsp_verification import normalize_company_name
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "company_registry.sqlite"
+
+# How long each source's answers are trusted
+SOURCE_TTL_DAYS = {
+    'anaf': 7,          # Registration status is what we re-check for closures
+    'listafirme': 90,
+    'dsp': 30,
+}
+DEFAULT_TTL_DAYS = 30
+NEGATIVE_TTL_DAYS = 7
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS registry (
+    source TEXT NOT NULL,
+    lookup_key TEXT NOT NULL,
+    cui INTEGER,
+    name_key TEXT,
+    found INTEGER NOT NULL,
+    payload TEXT,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (source, lookup_key)
+);
+CREATE INDEX IF NOT EXISTS idx_registry_cui ON registry(cui);
+CREATE INDEX IF NOT EXISTS idx_registry_name ON registry(name_key);
+"""
+
+
+def cui_key(cui) -> Optional[int]:
+    """Numeric CUI from "RO 1810870", "1810870" or 1810870 (no checksum check)."""
+    digits = re.sub(r'[^0-9]', '', str(cui or ''))
+    return int(digits) if digits else None
+
+
+def name_key(name: Optional[str]) -> str:
+    """Normalized legal name: no diacritics, legal form, punctuation or case."""
+    normalized = unicodedata.normalize('NFD', name or '')
+    normalized = ''.join(c for c in normalized if unicodedata.category(c) != 'Mn')
+    return normalize_company_name(normalized)
+
+
+def _lookup_key(cui=None, name: str = None, city: str = None) -> Optional[str]:
+    if cui_key(cui):
+        return f"cui:{cui_key(cui)}"
+    if name_key(name):
+        city = name_key(city).lower() if city else ''
+        return f"name:{name_key(name)}" + (f"|{city}" if city else '')
+    return None
+
+
+class CompanyRegistry:
+    """Per-source company answers keyed by CUI or normalized name, with expiry."""
+
+    def __init__(self, db_path: Path = None):
+        """
+        Args:
+            db_path: SQLite file (default: data/company_registry.sqlite)
+        """
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None,
+                                    check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+        # Counters for this process
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def get(self, source: str, cui=None, name: str = None, city: str = None) -> Optional[Dict]:
+        """
+        A source's fresh answer for a CUI, or else for a name (+ city).
+
+        Returns:
+            {'found': bool, 'payload': ..., 'fetched_at': ...} or None if unknown or expired
+        """
+        key = _lookup_key(cui, name, city)
+        rows = self._execute(
+            "SELECT found, payload, fetched_at FROM registry WHERE source = ? AND lookup_key = ? AND expires_at > ?",
+            (source, key, time.time())
+        ) if key else []
+        with self._lock:
+            if rows:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not rows:
+            return None
+        row = rows[0]
+        return {
+            'found': bool(row['found']),
+            'payload': json.loads(row['payload']) if row['payload'] else None,
+            'fetched_at': row['fetched_at'],
+        }
+
+    def get_many(self, source: str, cuis: List) -> Dict[int, Dict]:
+        """Fresh answers of a source for many CUIs at once: cui -> get() result."""
+        found = {}
+        keys = [cui_key(cui) for cui in cuis if cui_key(cui)]
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self._execute(
+                f"SELECT cui, found, payload, fetched_at FROM registry WHERE source = ? AND expires_at > ? "
+                f"AND lookup_key IN ({','.join('?' * len(chunk))})",
+                (source, time.time(), *[f"cui:{key}" for key in chunk])
+            )
+            for row in rows:
+                found[row['cui']] = {
+                    'found': bool(row['found']),
+                    'payload': json.loads(row['payload']) if row['payload'] else None,
+                    'fetched_at': row['fetched_at'],
+                }
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put(self, source: str, payload: Optional[Dict], cui=None, name: str = None, city: str = None,
+            ttl_days: float = None):
+        """
+        Store a source's answer.
+
+        Args:
+            source: 'anaf', 'listafirme', 'dsp'
+            payload: The answer, or None for "not found"
+            cui: CUI the answer is for (the row key when given)
+            name: Legal or searched name (the row key when there is no CUI)
+            city: City the name lookup was narrowed by
+            ttl_days: Override the source's TTL
+        """
+        key = _lookup_key(cui, name, city)
+        if not key:
+            return
+        found = payload is not None
+        if ttl_days is None:
+            ttl_days = SOURCE_TTL_DAYS.get(source, DEFAULT_TTL_DAYS) if found else NEGATIVE_TTL_DAYS
+        now = time.time()
+        self._execute(
+            """INSERT OR REPLACE INTO registry
+               (source, lookup_key, cui, name_key, found, payload, fetched_at, expires_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (source, key, cui_key(cui), name_key(name) or None, int(found),
+             json.dumps(payload, ensure_ascii=False) if found else None, now, now + ttl_days * 86400)
+        )
+
+    def records(self, cui=None, name: str = None) -> Dict[str, List[Dict]]:
+        """
+        Every source's fresh answers about one company, by CUI and/or legal name.
+
+        Returns:
+            source -> list of payloads
+        """
+        clauses, params = [], []
+        if cui_key(cui):
+            clauses.append("cui = ?")
+            params.append(cui_key(cui))
+        if name_key(name):
+            clauses.append("name_key = ?")
+            params.append(name_key(name))
+        if not clauses:
+            return {}
+        rows = self._execute(
+            f"SELECT source, payload FROM registry WHERE found = 1 AND expires_at > ? AND ({' OR '.join(clauses)})",
+            (time.time(), *params)
+        )
+        by_source = {}
+        for row in rows:
+            by_source.setdefault(row['source'], []).append(json.loads(row['payload']))
+        return by_source
+
+    def purge_expired(self) -> int:
+        """Delete expired entries. Returns the number removed."""
+        with self._lock:
+            return self.conn.execute("DELETE FROM registry WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def stats(self) -> Dict:
+        """Lookups answered by this process, and fresh entries per source."""
+        counts = {row['source']: row['n'] for row in self._execute(
+            "SELECT source, COUNT(*) AS n FROM registry WHERE expires_at > ? GROUP BY source", (time.time(),))}
+        return {'hits': self.hits, 'misses': self.misses, 'entries': counts}
+
+
+# Shared instance for the process
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_company_registry() -> CompanyRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = CompanyRegistry()
+    return _registry
@@ -0,0 +1,256 @@
+"""
+Coordinate Audit - finds suspicious business coordinates in one vectorized pass.
+
+Coordinates go wrong in a few recognisable ways: the geocoder fell back to
+the city center (every such business piles onto one point), Maps gave the
+viewport center instead of the place, or a same-named town in another
+county was matched. All locations are loaded into NumPy arrays and checked
+at once:
+
+- far_from_locality   haversine distance to the locality centroid > MAX_LOCALITY_KM
+- at_locality_center  within CENTER_KM of the centroid (a city-center fallback)
+- stacked             STACK_MIN or more businesses in the same GRID_DEG grid cell
+- outside_county      outside the county's bounding box (plus BBOX_MARGIN_DEG)
+- missing             no coordinates at all
+
+Centroids come from the geocoder's CITY_COORDINATES table, then the offline
+OSM index if one is built. Flagged rows make up the re-geocode worklist.
+"""
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tools.county_store import load_businesses, list_county_files
+from tools.geocoding import CITY_COORDINATES
+from tools.offline_geocoder import OfflineGeocoder, locality_key
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+MAX_LOCALITY_KM = 20.0
+CENTER_KM = 0.05
+# ~11 m cells; businesses sharing one are almost certainly a fallback pile
+GRID_DEG = 1e-4
+STACK_MIN = 3
+BBOX_MARGIN_DEG = 0.1
+
+# Approximate county bounding boxes: (south, west, north, east)
+COUNTY_BOUNDS = {
+    'alba': (45.6, 22.9, 46.6, 24.2),
+    'arad': (45.9, 20.7, 46.7, 22.7),
+    'arges': (44.4, 24.4, 45.6, 25.4),
+    'bacau': (46.0, 26.0, 46.9, 27.5),
+    'bihor': (46.4, 21.4, 47.6, 22.8),
+    'bistrita nasaud': (46.8, 23.9, 47.6, 25.1),
+    'botosani': (47.4, 26.0, 48.3, 27.5),
+    'brasov': (45.4, 24.6, 46.2, 26.1),
+    'braila': (44.7, 27.0, 45.5, 28.2),
+    'bucuresti': (44.33, 25.96, 44.55, 26.24),
+    'buzau': (44.8, 26.0, 45.8, 27.4),
+    'caras severin': (44.6, 21.3, 45.7, 22.8),
+    'calarasi': (44.0, 26.1, 44.6, 27.9),
+    'cluj': (46.3, 22.9, 47.4, 24.3),
+    'constanta': (43.7, 27.3, 44.8, 29.0),
+    'covasna': (45.5, 25.6, 46.3, 26.6),
+    'dambovita': (44.3, 25.0, 45.4, 25.9),
+    'dolj': (43.6, 22.8, 44.8, 24.3),
+    'galati': (45.4, 27.2, 46.2, 28.3),
+    'giurgiu': (43.6, 25.3, 44.5, 26.4),
+    'gorj': (44.6, 22.7, 45.5, 23.9),
+    'harghita': (46.0, 24.9, 47.2, 26.3),
+    'hunedoara': (45.2, 22.3, 46.3, 23.5),
+    'ialomita': (44.3, 26.2, 44.9, 28.1),
+    'iasi': (46.8, 26.5, 47.6, 28.2),
+    'ilfov': (44.2, 25.8, 44.8, 26.5),
+    'maramures': (47.3, 23.0, 48.0, 25.0),
+    'mehedinti': (44.2, 22.3, 45.2, 23.3),
+    'mures': (46.1, 23.9, 47.1, 25.3),
+    'neamt': (46.6, 25.7, 47.3, 27.2),
+    'olt': (43.7, 24.0, 44.9, 24.8),
+    'prahova': (44.7, 25.3, 45.5, 26.5),
+    'satu mare': (47.4, 22.3, 48.1, 23.5),
+    'salaj': (46.8, 22.6, 47.5, 23.6),
+    'sibiu': (45.5, 23.6, 46.3, 25.0),
+    'suceava': (47.0, 24.9, 47.9, 26.6),
+    'teleorman': (43.6, 24.6, 44.5, 25.7),
+    'timis': (45.3, 20.2, 46.2, 22.3),
+    'tulcea': (44.4, 28.0, 45.5, 29.8),
+    'vaslui': (46.1, 27.2, 47.0, 28.2),
+    'valcea': (44.5, 23.6, 45.6, 24.6),
+    'vrancea': (45.3, 26.5, 46.2, 27.6),
+}
+
+
+def county_bounds(county: Optional[str]) -> Optional[Tuple[float, float, float, float]]:
+    """Bounding box of a county by any spelling ("Timiș", "timis", "Județul Timiș"), or None."""
+    if not county:
+        return None
+    key = locality_key(county).replace('judetul ', '').replace('municipiul ', '')
+    return COUNTY_BOUNDS.get(key)
+
+
+def haversine_km(lat1: np.ndarray, lng1: np.ndarray, lat2: np.ndarray, lng2: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km between arrays of points (NaN where any input is NaN)."""
+    lat1, lng1, lat2, lng2 = (np.radians(a) for a in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def load_county_locations(directory: Path, county_filter: str = None) -> List[Dict]:
+    """Every business in the county files, tagged with the file it came from (_source)."""
+    records = []
+    for path in list_county_files(directory):
+        if county_filter and county_filter not in path.stem.lower():
+            continue
+        for biz in load_businesses(path):
+            records.append(dict(biz, _source=path.name))
+    return records
+
+
+def load_db_locations(db) -> List[Dict]:
+    """
+    Every row of the locations table, with the company name.
+
+    Args:
+        db: SupabaseTool
+    """
+    records = []
+    rows = db.fetch_all('locations', 'id, company_id, address, city, county, latitude, longitude, companies(name)')
+    for row in rows:
+        company = row.pop('companies', None) or {}
+        records.append(dict(row, name=company.get('name'), _source='db'))
+    return records
+
+
+class CentroidResolver:
+    """Locality centroids, looked up once per distinct (city, county)."""
+
+    def __init__(self, offline: Optional[OfflineGeocoder] = None):
+        if offline is None and OfflineGeocoder.available():
+            offline = OfflineGeocoder()
+        self.offline = offline
+        self._cache: Dict[Tuple[str, str], Optional[Tuple[float, float]]] = {}
+
+    def centroid(self, city: Optional[str], county: Optional[str]) -> Optional[Tuple[float, float]]:
+        if not city:
+            return None
+        key = (city.lower().strip(), (county or '').lower().strip())
+        if key not in self._cache:
+            coords = CITY_COORDINATES.get(key[0])
+            if coords is None and self.offline:
+                coords = self.offline.geocode_parts(None, None, city, county)
+            self._cache[key] = coords
+        return self._cache[key]
+
+
+@dataclass
+class AuditResult:
+    """Per-location flags; every array is aligned with records."""
+    records: List[Dict]
+    distance_km: np.ndarray
+    stack_size: np.ndarray
+    missing: np.ndarray
+    far_from_locality: np.ndarray
+    at_locality_center: np.ndarray
+    stacked: np.ndarray
+    outside_county: np.ndarray
+    elapsed: float = 0.0
+
+    CHECKS = ('missing', 'far_from_locality', 'at_locality_center', 'stacked', 'outside_county')
+
+    @property
+    def flagged(self) -> np.ndarray:
+        return np.logical_or.reduce([getattr(self, check) for check in self.CHECKS])
+
+    def counts(self) -> Dict[str, int]:
+        counts = {check: int(getattr(self, check).sum()) for check in self.CHECKS}
+        counts['flagged'] = int(self.flagged.sum())
+        counts['total'] = len(self.records)
+        return counts
+
+    def worklist(self) -> List[Dict]:
+        """Flagged locations with the reasons, worst (most reasons) first."""
+        reasons = np.stack([getattr(self, check) for check in self.CHECKS], axis=1)
+        items = []
+        for i in np.flatnonzero(self.flagged):
+            record = self.records[i]
+            distance = self.distance_km[i]
+            items.append({
+                'source': record.get('_source'),
+                'id': record.get('id') or record.get('place_id'),
+                'name': record.get('name'),
+                'address': record.get('address'),
+                'city': record.get('city'),
+                'county': record.get('county'),
+                'latitude': record.get('latitude'),
+                'longitude': record.get('longitude'),
+                'coord_quality': record.get('coord_quality'),
+                'reasons': [check for check, hit in zip(self.CHECKS, reasons[i]) if hit],
+                'distance_km': None if np.isnan(distance) else round(float(distance), 2),
+                'stack_size': int(self.stack_size[i]),
+            })
+        items.sort(key=lambda item: -len(item['reasons']))
+        return items
+
+
+def audit_locations(records: List[Dict], resolver: CentroidResolver = None) -> AuditResult:
+    """
+    Check every location's coordinates at once.
+
+    Args:
+        records: Business/location dicts with latitude, longitude, city, county
+        resolver: Centroid lookup (default: CITY_COORDINATES plus the offline index)
+
+    Returns:
+        AuditResult with one flag array per check
+    """
+    import time
+
+    resolver = resolver or CentroidResolver()
+    n = len(records)
+    nan4 = (np.nan,) * 4
+
+    # Gather into arrays (the only per-row Python work)
+    lat = np.array([r.get('latitude') or np.nan for r in records], dtype=float)
+    lng = np.array([r.get('longitude') or np.nan for r in records], dtype=float)
+    centroids = np.array([resolver.centroid(r.get('city'), r.get('county')) or (np.nan, np.nan)
+                          for r in records], dtype=float).reshape(n, 2)
+    bounds = np.array([county_bounds(r.get('county')) or nan4 for r in records], dtype=float).reshape(n, 4)
+
+    started = time.perf_counter()
+    missing = np.isnan(lat) | np.isnan(lng)
+    valid = ~missing
+
+    distance = haversine_km(lat, lng, centroids[:, 0], centroids[:, 1])
+    with np.errstate(invalid='ignore'):
+        far = distance > MAX_LOCALITY_KM
+        at_center = distance < CENTER_KM
+
+        south, west, north, east = (bounds[:, k] for k in range(4))
+        outside = ((lat < south - BBOX_MARGIN_DEG) | (lat > north + BBOX_MARGIN_DEG) |
+                   (lng < west - BBOX_MARGIN_DEG) | (lng > east + BBOX_MARGIN_DEG))
+
+    # Stacked points: snap to the grid and count businesses per cell
+    stack_size = np.zeros(n, dtype=np.int64)
+    if valid.any():
+        cells = (np.round(lat[valid] / GRID_DEG).astype(np.int64) * 10_000_000 +
+                 np.round(lng[valid] / GRID_DEG).astype(np.int64))
+        _, inverse, cell_counts = np.unique(cells, return_inverse=True, return_counts=True)
+        stack_size[valid] = cell_counts[inverse]
+    stacked = stack_size >= STACK_MIN
+
+    elapsed = time.perf_counter() - started
+    return AuditResult(
+        records=records,
+        distance_km=distance,
+        stack_size=stack_size,
+        missing=missing,
+        far_from_locality=far & valid,
+        at_locality_center=at_center & valid,
+        stacked=stacked,
+        outside_county=outside & valid,
+        elapsed=elapsed,
+    )
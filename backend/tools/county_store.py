@@ -0,0 +1,309 @@
+"""
+County Store - Append-only JSON-lines storage for scraped businesses.
+
+Each county is kept as two files in data/scraped/:
+- maps_<slug>.json   compacted snapshot (list of dicts, the historical format)
+- maps_<slug>.jsonl  journal of records written since the last compaction
+
+Saving a business is one small append to the journal. Records are keyed by
+place_id (falling back to the lowercased name), so a later journal line
+replaces an earlier one - that is how re-saves after enrichment work.
+compact() folds the journal into the snapshot, so readers that only know
+the old JSON list keep working; load_businesses() gives them the merged
+view even before compaction has run.
+
+A store holds an exclusive lock on maps_<slug>.lock from load until close(),
+so only one process at a time (scraper, refresh daemon, ANAF/coordinate
+jobs) writes a county: a second writer would otherwise compact its stale
+in-memory copy over the first one's records. load_businesses() only reads
+and takes no lock.
+"""
+import json
+import os
+import time
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# Fold the journal into the snapshot after this many appends
+DEFAULT_COMPACT_EVERY = 500
+# Seconds between attempts while another process holds a county's lock
+LOCK_POLL_INTERVAL = 0.2
+
+
+class CountyFileLocked(Exception):
+    """Another process has the county file open for writing."""
+
+
+def journal_path(snapshot_path: Path) -> Path:
+    """Journal file that belongs to a snapshot (maps_x.json -> maps_x.jsonl)."""
+    snapshot_path = Path(snapshot_path)
+    return snapshot_path.with_suffix('.jsonl')
+
+
+def lock_path(snapshot_path: Path) -> Path:
+    """Lock file that guards a county's snapshot and journal (maps_x.json -> maps_x.lock)."""
+    return Path(snapshot_path).with_suffix('.lock')
+
+
+def _try_lock(lock_file):
+    """Take the exclusive lock without blocking; OSError if another process has it."""
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+
+
+def _unlock(lock_file):
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def store_exists(snapshot_path: Path) -> bool:
+    """True if a county has any data on disk (snapshot or un-compacted journal)."""
+    snapshot_path = Path(snapshot_path)
+    return snapshot_path.exists() or journal_path(snapshot_path).exists()
+
+
+def list_county_files(directory: Path, pattern: str = "maps_*") -> List[Path]:
+    """
+    Snapshot paths of every county in a directory, including counties that
+    so far only have a journal (scrape interrupted before first compaction).
+    """
+    directory = Path(directory)
+    paths = {p for p in directory.glob(f"{pattern}.json")}
+    paths.update(p.with_suffix('.json') for p in directory.glob(f"{pattern}.jsonl"))
+    return sorted(paths)
+
+
+def load_businesses(snapshot_path: Path) -> List[Dict]:
+    """
+    Load a county file as the familiar list of business dicts.
+    Replays any journal entries on top of the snapshot. Read-only, so it does
+    not wait for a scraper that has the county open.
+    """
+    return CountyStore(snapshot_path, lock=False).records()
+
+
+class CountyStore:
+    """
+    Append-only store for one county's scraped businesses.
+    Keeps an in-memory name/place_id index so duplicate checks never touch disk.
+    """
+
+    def __init__(self, snapshot_path: Path, compact_every: int = DEFAULT_COMPACT_EVERY, durable: bool = True,
+                 lock: bool = True, lock_timeout: Optional[float] = None):
+        """
+        Args:
+            snapshot_path: Path of the compacted JSON file (maps_<slug>.json)
+            compact_every: Compact automatically after this many journal appends (0 = only on close)
+            durable: fsync each journal append (a small, constant-cost write)
+            lock: Hold the county's write lock until close() (False = read only)
+            lock_timeout: Seconds to wait for another process's lock (None = as long as it takes)
+
+        Raises:
+            CountyFileLocked: The lock was not free within lock_timeout
+        """
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = journal_path(self.snapshot_path)
+        self.compact_every = compact_every
+        self.durable = durable
+
+        self._records: List[Dict] = []
+        self._by_place_id: Dict[str, int] = {}
+        self._by_name: Dict[str, int] = {}
+        self._journal = None
+        self._pending = 0  # Journal lines not yet folded into the snapshot
+        self._lock_file = None
+
+        if lock:
+            self._acquire_lock(lock_timeout)
+        self._load()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _acquire_lock(self, timeout: Optional[float]):
+        path = lock_path(self.snapshot_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(path, 'a+')
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waiting = False
+        while True:
+            try:
+                _try_lock(lock_file)
+                break
+            except OSError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    lock_file.close()
+                    raise CountyFileLocked(f"{self.snapshot_path.name} is open in another process")
+                if not waiting:
+                    logger.info(f"⏳ Waiting for {self.snapshot_path.name} - open in another process")
+                    waiting = True
+                time.sleep(LOCK_POLL_INTERVAL)
+        self._lock_file = lock_file
+
+    def _load(self):
+        """Load the snapshot, then replay the journal over it."""
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                for record in json.load(f):
+                    self._put_in_memory(record)
+
+        if self.journal_path.exists():
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line_no, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn last line from a crash mid-write - everything before it is intact
+                        logger.warning(f"Skipping corrupt journal line {line_no} in {self.journal_path.name}")
+                        continue
+                    self._put_in_memory(record)
+                    self._pending += 1
+
+    @staticmethod
+    def _name_key(name: Optional[str]) -> str:
+        return (name or '').lower()
+
+    def _find(self, record: Dict) -> Optional[int]:
+        """Index of an existing record with the same place_id or name."""
+        place_id = record.get('place_id')
+        if place_id and place_id in self._by_place_id:
+            return self._by_place_id[place_id]
+        return self._by_name.get(self._name_key(record.get('name')))
+
+    def _put_in_memory(self, record: Dict) -> int:
+        idx = self._find(record)
+        if idx is None:
+            idx = len(self._records)
+            self._records.append(record)
+        else:
+            old = self._records[idx]
+            if old.get('place_id') and old.get('place_id') != record.get('place_id'):
+                self._by_place_id.pop(old['place_id'], None)
+            old_name = self._name_key(old.get('name'))
+            if old_name != self._name_key(record.get('name')) and self._by_name.get(old_name) == idx:
+                self._by_name.pop(old_name)
+            self._records[idx] = record
+
+        if record.get('place_id'):
+            self._by_place_id[record['place_id']] = idx
+        self._by_name[self._name_key(record.get('name'))] = idx
+        return idx
+
+    def contains(self, name: str = None, place_id: str = None) -> bool:
+        """Check whether a business is already stored (by place_id or name)."""
+        if place_id and place_id in self._by_place_id:
+            return True
+        return bool(name) and self._name_key(name) in self._by_name
+
+    def get(self, name: str = None, place_id: str = None) -> Optional[Dict]:
+        """Return the stored record for a business, if any."""
+        idx = self._find({'name': name, 'place_id': place_id})
+        return self._records[idx] if idx is not None else None
+
+    def records(self) -> List[Dict]:
+        """All stored businesses, in first-seen order."""
+        return list(self._records)
+
+    def add(self, record: Dict) -> bool:
+        """Append a business unless it is already stored. Returns True if added."""
+        if self.contains(record.get('name'), record.get('place_id')):
+            return False
+        self.put(record)
+        return True
+
+    def _check_writable(self):
+        if self._lock_file is None:
+            raise RuntimeError(f"{self.snapshot_path.name} is not open for writing (read-only or closed)")
+
+    def put(self, record: Dict):
+        """Insert or replace a business (a later version of the same key wins)."""
+        self._check_writable()
+        self._put_in_memory(record)
+        self._append_line(record)
+        if self.compact_every and self._pending >= self.compact_every:
+            self.compact()
+
+    def _append_line(self, record: Dict):
+        if self._journal is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            torn_tail = False
+            if self.journal_path.exists() and self.journal_path.stat().st_size > 0:
+                with open(self.journal_path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    torn_tail = f.read(1) != b'\n'
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+            if torn_tail:
+                # Never glue a new record onto a half-written line
+                self._journal.write('\n')
+        self._journal.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._journal.flush()
+        if self.durable:
+            os.fsync(self._journal.fileno())
+        self._pending += 1
+
+    def sync(self):
+        """Force journal appends made so far onto disk (for stores opened with durable=False)."""
+        if self._journal is not None:
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+
+    def compact(self):
+        """Fold the journal into the snapshot (atomic replace) and truncate the journal."""
+        self._check_writable()
+        if self._pending == 0 and self.snapshot_path.exists():
+            return
+
+        tmp_path = self.snapshot_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._records, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        # The snapshot now holds everything - start a fresh journal
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self._pending = 0
+        logger.info(f"💾 Compacted {len(self._records)} businesses into {self.snapshot_path.name}")
+
+    def close(self):
+        """Compact any pending journal entries, release the file handle and the lock."""
+        if self._lock_file is None:
+            return  # Read-only store, or already closed
+        try:
+            if self._pending:
+                self.compact()
+        finally:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            _unlock(self._lock_file)
+            self._lock_file.close()
+            self._lock_file = None
@@ -0,0 +1,164 @@
+"""
+Coverage Tracking - skips localities whose Maps viewport was already searched.
+
+Many small towns sit so close to their county capital that their search
+returns the same feed we already scraped for the capital: three searches,
+every result a duplicate or filtered. Every search therefore records its
+viewport (the @lat,lng,zoom of the results map) and result set in the job
+ledger, and before a city is scraped its viewport is compared with the
+viewports already searched in the same county this run:
+
+    covered = 1 - prod(1 - overlap_i)
+
+where overlap_i is the share of the city's viewport inside search i (searches
+whose feed hit the result cap only count half - they did not list everything).
+
+- covered >= SKIP_COVERAGE and no history of own results  -> skip the city
+- covered >= SINGLE_QUERY_COVERAGE                       -> run one query only
+- after the first query, if nearly all results were already seen in the
+  county and the viewport is mostly covered             -> skip the rest
+
+Only searches in the same county count: businesses from another county are
+filtered out of that county's results, so they were never saved.
+"""
+import math
+import re
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .job_ledger import JobLedger
+
+logger = logging.getLogger(__name__)
+
+# Browser viewport of the scraper (see GoogleMapsScraper.start)
+VIEWPORT_PX = (1920, 1080)
+# Web Mercator metres per pixel at the equator, zoom 0
+METERS_PER_PIXEL_Z0 = 156543.03392
+METERS_PER_DEGREE = 111320.0
+
+SKIP_COVERAGE = 0.9
+SINGLE_QUERY_COVERAGE = 0.6
+# Share of a first query's results already seen in the county to drop the other queries
+SEEN_RESULTS_RATIO = 0.8
+# A city whose previous runs matched at least this many businesses per run is never skipped
+MIN_OWN_YIELD = 0.5
+# Weight of a search whose feed was cut off at the result cap
+CAPPED_WEIGHT = 0.5
+
+VIEWPORT_RE = re.compile(r'@(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?),(\d+(?:\.\d+)?)z')
+
+
+@dataclass
+class Viewport:
+    """Map viewport of a Google Maps search."""
+    lat: float
+    lng: float
+    zoom: float
+
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """(south, west, north, east) in degrees for the scraper's window size."""
+        meters_per_px = METERS_PER_PIXEL_Z0 * math.cos(math.radians(self.lat)) / (2 ** self.zoom)
+        half_h = VIEWPORT_PX[1] * meters_per_px / 2 / METERS_PER_DEGREE
+        half_w = VIEWPORT_PX[0] * meters_per_px / 2 / (METERS_PER_DEGREE * math.cos(math.radians(self.lat)))
+        return self.lat - half_h, self.lng - half_w, self.lat + half_h, self.lng + half_w
+
+
+def parse_viewport(url: str) -> Optional[Viewport]:
+    """Viewport from a Maps URL (.../@45.7489,21.2087,13z/...), or None."""
+    match = VIEWPORT_RE.search(url or '')
+    if not match:
+        return None
+    return Viewport(float(match.group(1)), float(match.group(2)), float(match.group(3)))
+
+
+def overlap_fraction(target: Viewport, other: Viewport) -> float:
+    """Share of the target viewport's area that lies inside the other viewport."""
+    s1, w1, n1, e1 = target.bounds()
+    s2, w2, n2, e2 = other.bounds()
+    height = min(n1, n2) - max(s1, s2)
+    width = min(e1, e2) - max(w1, w2)
+    if height <= 0 or width <= 0:
+        return 0.0
+    return (height * width) / ((n1 - s1) * (e1 - w1))
+
+
+def covered_fraction(target: Viewport, searches: Iterable[Dict]) -> float:
+    """Share of a viewport covered by earlier searches (treating them as independent)."""
+    uncovered = 1.0
+    for search in searches:
+        overlap = overlap_fraction(target, Viewport(search['lat'], search['lng'], search['zoom']))
+        if search.get('capped'):
+            overlap *= CAPPED_WEIGHT
+        uncovered *= 1 - overlap
+    return 1 - uncovered
+
+
+class CoveragePlanner:
+    """Decides how many queries a city still needs given what its county already covered."""
+
+    def __init__(self, ledger: JobLedger, known_coordinates: Dict[str, Dict] = None):
+        """
+        Args:
+            ledger: Job ledger holding recorded searches
+            known_coordinates: {lowercase city: {'lat', 'lng', 'zoom'}} of geo-locked cities
+        """
+        self.ledger = ledger
+        self.known_coordinates = known_coordinates or {}
+
+    def locate(self, county: str, city: str) -> Optional[Viewport]:
+        """Expected viewport of a city's search: geo-lock coordinates or a past search."""
+        coords = self.known_coordinates.get(city.lower())
+        if coords:
+            return Viewport(coords['lat'], coords['lng'], coords['zoom'])
+        past = self.ledger.last_search(county, city)
+        if past:
+            return Viewport(past['lat'], past['lng'], past['zoom'])
+        return None
+
+    def _covering_searches(self, county: str, city: str) -> List[Dict]:
+        return [s for s in self.ledger.county_searches(county) if s['city'] != city]
+
+    def plan(self, county: str, city: str, queries: List[str]) -> Tuple[List[str], Optional[str]]:
+        """
+        Queries worth running for a city before any of them ran.
+
+        Returns:
+            (queries to run, reason the others are skipped or None)
+        """
+        viewport = self.locate(county, city)
+        if viewport is None or len(queries) == 0:
+            return queries, None
+
+        covered = covered_fraction(viewport, self._covering_searches(county, city))
+        history = self.ledger.city_history().get((county, city))
+        own_yield = history['matched'] if history else 0.0
+
+        if covered >= SKIP_COVERAGE and own_yield < MIN_OWN_YIELD:
+            return [], f"viewport {covered:.0%} covered by earlier {county} searches"
+        if covered >= SINGLE_QUERY_COVERAGE and len(queries) > 1:
+            return queries[:1], f"viewport {covered:.0%} covered - one query is enough"
+        return queries, None
+
+    def after_search(self, county: str, city: str, search: Dict) -> Optional[str]:
+        """
+        Reason to skip a city's remaining queries after one search, or None to continue.
+
+        Args:
+            search: The scraper's last_search ({'viewport', 'names', 'capped'})
+        """
+        viewport = search.get('viewport')
+        names = search.get('names') or []
+        if viewport is None or not names:
+            return None
+
+        covering = self._covering_searches(county, city)
+        seen = set()
+        for s in covering:
+            seen.update(s['names'])
+        seen_ratio = sum(1 for name in names if name in seen) / len(names)
+        covered = covered_fraction(viewport, covering)
+
+        if seen_ratio >= SEEN_RESULTS_RATIO and covered >= SINGLE_QUERY_COVERAGE:
+            return f"{seen_ratio:.0%} of results already seen, viewport {covered:.0%} covered"
+        return None
@@ -0,0 +1,133 @@
+"""
+DSP Cache - SQLite-backed HTTP and parse cache for the DSP scraper.
+
+The DSP authorization lists change a few times a year, but a refresh used
+to download every county page and PDF and re-parse each PDF. This cache
+remembers, per URL:
+
+- the validators the server sent (ETag / Last-Modified), so the next fetch
+  is a conditional GET that usually comes back 304 Not Modified
+- the SHA-256 of the body, and the body itself for HTML pages (a 304 has
+  none, and the page is still needed for link discovery)
+
+Parsed PDF results are stored separately, keyed by content hash and parser
+version: a 304 - or a 200 with a byte-identical PDF from a server that sends
+no validators - reuses them without touching pypdf. Bumping PARSER_VERSION
+in dsp_scraper.py invalidates every parsed result at once.
+
+One instance is shared by the scraper's worker threads; every query holds a lock.
+"""
+import json
+import time
+import sqlite3
+import threading
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "dsp_cache.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    content_type TEXT,
+    content_hash TEXT NOT NULL,
+    body BLOB,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS parsed (
+    content_hash TEXT NOT NULL,
+    parser_version INTEGER NOT NULL,
+    companies TEXT NOT NULL,
+    parsed_at REAL NOT NULL,
+    PRIMARY KEY (content_hash, parser_version)
+);
+"""
+
+
+def content_hash(content: bytes) -> str:
+    """SHA-256 hex digest of a response body."""
+    return hashlib.sha256(content).hexdigest()
+
+
+class DSPCache:
+    """Validators and bodies of fetched DSP URLs, and parsed PDFs by content hash."""
+
+    def __init__(self, db_path: Path = None):
+        """
+        Args:
+            db_path: SQLite file (default: data/dsp_cache.sqlite)
+        """
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None,
+                                    check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def get_response(self, url: str) -> Optional[Dict]:
+        """Stored validators, hash and (for pages) body of a URL, or None."""
+        rows = self._execute("SELECT * FROM responses WHERE url = ?", (url,))
+        return dict(rows[0]) if rows else None
+
+    def put_response(self, url: str, headers: Dict, digest: str, body: Optional[bytes] = None):
+        """
+        Remember a 200 response.
+
+        Args:
+            url: Requested URL
+            headers: Response headers (ETag, Last-Modified, Content-Type are kept)
+            digest: content_hash() of the body
+            body: Body to replay on a 304 (pages only; PDFs are replayed from parsed results)
+        """
+        self._execute(
+            """INSERT OR REPLACE INTO responses
+               (url, etag, last_modified, content_type, content_hash, body, fetched_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (url, headers.get('ETag'), headers.get('Last-Modified'), headers.get('Content-Type'),
+             digest, body, time.time())
+        )
+
+    def touch_response(self, url: str):
+        """Record that a 304 confirmed the stored response is still current."""
+        self._execute("UPDATE responses SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    def get_parsed(self, digest: str, parser_version: int) -> Optional[List[Dict]]:
+        """Companies parsed from a PDF with this content hash, or None if never parsed."""
+        rows = self._execute(
+            "SELECT companies FROM parsed WHERE content_hash = ? AND parser_version = ?",
+            (digest, parser_version)
+        )
+        return json.loads(rows[0]['companies']) if rows else None
+
+    def put_parsed(self, digest: str, parser_version: int, companies: List[Dict]):
+        """Store the companies parsed from a PDF."""
+        self._execute(
+            """INSERT OR REPLACE INTO parsed (content_hash, parser_version, companies, parsed_at)
+               VALUES (?, ?, ?, ?)""",
+            (digest, parser_version, json.dumps(companies, ensure_ascii=False), time.time())
+        )
+
+    def stats(self) -> Dict:
+        """Number of cached URLs and parsed PDFs."""
+        return {
+            'responses': self._execute("SELECT COUNT(*) FROM responses")[0][0],
+            'parsed_pdfs': self._execute("SELECT COUNT(*) FROM parsed")[0][0],
+        }
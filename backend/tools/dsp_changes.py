@@ -0,0 +1,184 @@
+"""
+DSP Changes - keyed diff of DSP authorization lists and an append-only change log.
+
+Each DSP run is compared with the previous snapshot of
+dsp_authorized_companies.json. Entries are keyed by county plus normalized
+company name, and the run produces one event per difference:
+
+- added     a company that was not on its county's list before
+- removed   a company that is no longer on its county's list (revoked)
+- changed   same company, different authorization number or address
+
+Only counties that returned entries in this run are compared, so a partial
+run (--counties TM) or a county site that was down does not look like every
+other authorization being revoked. Counties the scraper reports as
+incomplete (a PDF that failed to download or ran out of parsing time) are
+left out as well and keep their previous entries: a missing entry there is
+not evidence of a revocation.
+
+Events are appended to data/dsp_changes.jsonl and never rewritten. Consumers
+keep a cursor (the number of lines already processed), so reverification
+only looks at companies that could match an entry that actually changed.
+"""
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from .dsp_verification import DSPVerificationTool, normalize_company_name
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOG_PATH = Path(__file__).parent.parent / "data" / "dsp_changes.jsonl"
+
+# Fields whose change is worth an event
+TRACKED_FIELDS = ('authorization_number', 'address')
+# Entry fields copied into every event
+ENTRY_FIELDS = ('name', 'cui', 'county', 'county_code', 'authorization_number', 'address', 'source_url')
+# Looser than the verification threshold, so near-misses of a changed entry are rechecked too
+AFFECTED_THRESHOLD = 0.6
+
+
+def county_key(entry: Dict) -> str:
+    """County of an entry: its code, else its name."""
+    return (entry.get('county_code') or entry.get('county') or '').upper()
+
+
+def entry_key(entry: Dict) -> str:
+    """Identity of a DSP entry across runs: county plus normalized name."""
+    return f"{county_key(entry)}|{normalize_company_name(entry.get('name', ''))}"
+
+
+def _by_key(entries: Iterable[Dict]) -> Dict[str, Dict]:
+    """Entries keyed by entry_key; the first wins when a company is listed twice."""
+    keyed = {}
+    for entry in entries:
+        keyed.setdefault(entry_key(entry), entry)
+    return keyed
+
+
+def _scope(new: List[Dict], incomplete: Iterable[str]) -> set:
+    """Counties this run covered in full: present in `new` and not incomplete."""
+    skipped = {key.upper() for key in incomplete}
+    return {county_key(entry) for entry in new} - skipped
+
+
+def diff_snapshots(old: List[Dict], new: List[Dict], incomplete: Iterable[str] = ()) -> List[Dict]:
+    """
+    Differences between two DSP lists, limited to the counties present in `new`.
+
+    Args:
+        old: Entries of the previous snapshot
+        new: Entries found by this run
+        incomplete: county_key()s of counties this run only saw part of (not compared)
+
+    Returns:
+        Events (added / removed / changed), each carrying the entry's fields;
+        changed events also have 'changes': {field: [old, new]}
+    """
+    scope = _scope(new, incomplete)
+    old_keyed = _by_key(entry for entry in old if county_key(entry) in scope)
+    new_keyed = _by_key(entry for entry in new if county_key(entry) in scope)
+
+    events = []
+    for key, entry in new_keyed.items():
+        before = old_keyed.get(key)
+        if before is None:
+            events.append(_event('added', key, entry))
+            continue
+        changes = {field: [before.get(field), entry.get(field)]
+                   for field in TRACKED_FIELDS if (before.get(field) or None) != (entry.get(field) or None)}
+        if changes:
+            events.append(_event('changed', key, entry, changes))
+
+    for key, entry in old_keyed.items():
+        if key not in new_keyed:
+            events.append(_event('removed', key, entry))
+    return events
+
+
+def _event(kind: str, key: str, entry: Dict, changes: Dict = None) -> Dict:
+    event = {'type': kind, 'key': key}
+    event.update({field: entry.get(field) for field in ENTRY_FIELDS})
+    if changes:
+        event['changes'] = changes
+    return event
+
+
+def merge_snapshots(old: List[Dict], new: List[Dict], incomplete: Iterable[str] = ()) -> List[Dict]:
+    """Full list after a run: this run's entries plus the old entries of counties it did not fully cover."""
+    scope = _scope(new, incomplete)
+    return ([entry for entry in new if county_key(entry) in scope] +
+            [entry for entry in old if county_key(entry) not in scope])
+
+
+def append_changes(events: List[Dict], run_at: str = None, path: Path = None) -> int:
+    """
+    Append a run's events to the change log.
+
+    Returns:
+        Number of events written
+    """
+    if not events:
+        return 0
+    path = Path(path or DEFAULT_LOG_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    run_at = run_at or datetime.now().isoformat()
+    with open(path, 'a', encoding='utf-8') as f:
+        for event in events:
+            f.write(json.dumps(dict(event, run_at=run_at), ensure_ascii=False) + '\n')
+    return len(events)
+
+
+def read_changes(after_line: int = 0, path: Path = None) -> Tuple[List[Dict], int]:
+    """
+    Events logged after the first `after_line` lines.
+
+    Returns:
+        (events, cursor) - pass cursor back in to read only what comes later
+    """
+    path = Path(path or DEFAULT_LOG_PATH)
+    events = []
+    line_no = 0
+    if not path.exists():
+        return events, after_line
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            if line_no <= after_line or not line.strip():
+                continue
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping corrupt change log line {line_no} in {path.name}")
+    return events, max(line_no, after_line)
+
+
+def summarize(events: List[Dict]) -> Dict[str, int]:
+    """Event counts by type."""
+    counts = {'added': 0, 'removed': 0, 'changed': 0}
+    for event in events:
+        counts[event['type']] = counts.get(event['type'], 0) + 1
+    return counts
+
+
+def affected_companies(events: List[Dict], companies: List[Dict], threshold: float = AFFECTED_THRESHOLD) -> List[int]:
+    """
+    Companies that could match a changed DSP entry and need reverifying.
+
+    The events themselves are used as a small DSP list and every company is
+    matched against it (county-blocked, see DSPVerificationTool.verify_many).
+
+    Args:
+        events: Change log events
+        companies: Dicts with 'name' and optional 'county'
+        threshold: Similarity (0-1) at which a company counts as affected
+
+    Returns:
+        Positions in `companies`
+    """
+    if not events or not companies:
+        return []
+    matcher = DSPVerificationTool(companies=events)
+    results = matcher.verify_many(companies, threshold=threshold)
+    return [pos for pos, result in enumerate(results) if result['is_verified']]
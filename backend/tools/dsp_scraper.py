@@ -1,18 +1,48 @@
 """
 DSP Scraper - Scrapes funeral company authorization lists from all Romanian DSP websites.
+
+Fetches go through DSPCache (tools/dsp_cache.py): pages and PDFs seen before
+are requested conditionally (If-None-Match / If-Modified-Since), and a PDF
+that is unchanged - by 304 or by content hash - reuses its parsed companies
+instead of being downloaded and parsed again.
+
+Counties are scraped in parallel by a small thread pool. Politeness is per
+host: requests to one DSP site are spaced HOST_INTERVAL seconds apart, while
+different sites are fetched at the same time, so a full refresh takes about
+as long as the slowest site.
+
+PDF parsing runs in a process pool (one worker per core). Each PDF is
+extracted page by page and the lines are streamed straight into the entry
+parser, so entries that continue on the next page stay whole and the full
+text of a PDF is never held at once. A PDF that is still extracting after
+PDF_TIME_BUDGET seconds keeps the entries found so far and is not cached.
+Fetch threads hand over at most one PDF per parsing worker, so time spent
+waiting for a free worker never counts against a PDF's budget.
+
+Saved entries are also written to the company registry
+(tools/company_registry.py) as source 'dsp', so a lookup by CUI or name sees
+the DSP authorization next to the ANAF and listafirme answers.
 """
 import os
 import json
 import re
 import time
+import threading
 import requests
-from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from typing import List, Dict, Iterable, Iterator, Optional, Set, Tuple, Union
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from bs4 import BeautifulSoup
+from urllib.parse import urljoin, urlparse
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
 from pypdf import PdfReader
 import io
 
+from .dsp_cache import DSPCache, content_hash
+from .dsp_changes import append_changes, county_key, diff_snapshots, merge_snapshots, summarize
+from .company_registry import get_company_registry
+
 # Try to import tabula for PDF table extraction
 try:
     import tabula
@@ -21,6 +51,20 @@ except ImportError:
     HAS_TABULA = False
     print("Warning: tabula-py not installed. PDF table extraction may be limited.")
 
+# Bump when PDF parsing changes, so cached parse results are redone
+PARSER_VERSION = 1
+
+# Seconds between two requests to the same host
+HOST_INTERVAL = 2.0
+# Counties scraped at the same time
+DEFAULT_WORKERS = 8
+# Seconds of text extraction per PDF before the remaining pages are skipped
+PDF_TIME_BUDGET = 60.0
+
+# Link discovery and table parsing only build the elements they look at
+ANCHORS_ONLY = SoupStrainer('a', href=True)
+TABLES_ONLY = SoupStrainer('table')
+
 
 @dataclass
 class DSPCompany:
@@ -56,14 +100,48 @@ class DSPScraper:
         'transport decedat', 'camera mortuara', 'servicii funerare'
     ]
     
-    def __init__(self, sources_path: str = None):
+    def __init__(self, sources_path: str = None, use_cache: bool = True, refresh: bool = False,
+                 workers: int = DEFAULT_WORKERS, host_interval: float = HOST_INTERVAL,
+                 parse_workers: int = None, pdf_time_budget: float = PDF_TIME_BUDGET,
+                 use_registry: bool = True):
+        """
+        Args:
+            sources_path: dsp_sources.json path
+            use_cache: Use the DSP cache for conditional GETs and parsed PDFs
+            refresh: Ignore cached validators and parse results (results are still stored)
+            workers: Counties scraped in parallel
+            host_interval: Seconds between requests to the same host
+            parse_workers: PDF parsing processes (default: one per core, 0 = parse on the calling thread)
+            pdf_time_budget: Seconds of text extraction allowed per PDF
+            use_registry: Record saved entries in the company registry
+        """
         self.sources_path = sources_path or os.path.join(
             os.path.dirname(os.path.dirname(__file__)), 'data', 'dsp_sources.json'
         )
         self.sources = self._load_sources()
         self.companies: List[DSPCompany] = []
+        self.workers = max(1, workers)
+        self.host_interval = host_interval
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.workers * 2, pool_maxsize=self.workers * 2)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self._request_count = 0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.cache = DSPCache() if use_cache else None
+        self.refresh = refresh
+        self.cache_stats = {'not_modified': 0, 'downloaded': 0, 'parsed': 0, 'parse_reused': 0}
+        self.parse_workers = (os.cpu_count() or 1) if parse_workers is None else parse_workers
+        self.pdf_time_budget = pdf_time_budget
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        # One PDF per parsing worker in flight: a submitted PDF starts at once
+        self._parse_slots = threading.BoundedSemaphore(max(1, self.parse_workers))
+        self.changes: List[Dict] = []
+        # county_key()s of counties whose PDFs were not all fetched and fully parsed
+        self.incomplete_counties: Set[str] = set()
+        self.registry = get_company_registry() if use_registry else None
         
     def _load_sources(self) -> Dict:
         """Load DSP sources configuration."""
@@ -83,39 +161,125 @@ class DSPScraper:
             'Connection': 'keep-alive',
         }
     
-    def _rate_limit(self):
-        """Respect rate limits - 1 request per 2 seconds."""
-        self._request_count += 1
-        if self._request_count > 1:
-            time.sleep(2)
+    def _rate_limit(self, url: str):
+        """Respect rate limits - 1 request per host_interval seconds to each host."""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            self._request_count += 1
+            now = time.monotonic()
+            slot = max(self._next_slot.get(host, now), now)
+            self._next_slot[host] = slot + self.host_interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+    
+    def _count(self, key: str):
+        with self._lock:
+            self.cache_stats[key] += 1
+    
+    def _say(self, message: str):
+        """Print progress, tagged with the county being scraped on this thread."""
+        county_code = getattr(self._local, 'county_code', None)
+        print(f"[{county_code}] {message.lstrip()}" if county_code else message)
+    
+    def _get(self, url: str, timeout: int, cached: Optional[Dict] = None) -> requests.Response:
+        """GET a URL, conditional on the cached validators if given. A 304 is returned, not raised."""
+        self._rate_limit(url)
+        headers = self._get_headers()
+        if cached and not self.refresh:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        response = self.session.get(url, headers=headers, timeout=timeout)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
     
     def _fetch_page(self, url: str) -> Optional[str]:
-        """Fetch HTML page content."""
-        self._rate_limit()
+        """Fetch HTML page content (replayed from the cache on 304)."""
+        cached = self.cache.get_response(url) if self.cache else None
+        if cached and cached['body'] is None:
+            cached = None
         try:
-            response = self.session.get(url, headers=self._get_headers(), timeout=30)
-            response.raise_for_status()
-            return response.text
+            response = self._get(url, 30, cached)
         except Exception as e:
-            print(f"  Error fetching {url}: {e}")
+            self._say(f"  Error fetching {url}: {e}")
             return None
+        
+        if response.status_code == 304:
+            self._count('not_modified')
+            self.cache.touch_response(url)
+            return cached['body'].decode('utf-8')
+        
+        self._count('downloaded')
+        if self.cache:
+            body = response.text.encode('utf-8')
+            self.cache.put_response(url, response.headers, content_hash(body), body)
+        return response.text
     
-    def _fetch_pdf(self, url: str) -> Optional[bytes]:
-        """Fetch PDF file content."""
-        self._rate_limit()
+    def _fetch_pdf_companies(self, url: str, county: str, county_code: str) -> Optional[List[DSPCompany]]:
+        """
+        Companies listed in a PDF. The PDF is only downloaded if the server says
+        it changed, and only parsed if its content hash has not been parsed before.
+        
+        Returns:
+            Companies, or None if the URL could not be fetched or is not a PDF
+        """
+        cached = self.cache.get_response(url) if self.cache else None
+        parsed = None
+        if cached and not self.refresh:
+            parsed = self.cache.get_parsed(cached['content_hash'], PARSER_VERSION)
+        
         try:
-            response = self.session.get(url, headers=self._get_headers(), timeout=60)
-            response.raise_for_status()
-            if 'pdf' in response.headers.get('Content-Type', '').lower() or url.endswith('.pdf'):
-                return response.content
-            return None
+            # Only ask for a 304 when there are parsed results to fall back on
+            response = self._get(url, 60, cached if parsed is not None else None)
         except Exception as e:
-            print(f"  Error fetching PDF {url}: {e}")
+            self._say(f"  Error fetching PDF {url}: {e}")
+            self._mark_incomplete()
             return None
+        
+        if response.status_code == 304:
+            self._count('not_modified')
+            self.cache.touch_response(url)
+            self._say(f"    Not modified - {len(parsed)} cached companies")
+            return self._companies_from_cache(parsed, county, county_code, url)
+        
+        if not ('pdf' in response.headers.get('Content-Type', '').lower() or url.endswith('.pdf')):
+            return None
+        
+        self._count('downloaded')
+        digest = content_hash(response.content)
+        if self.cache:
+            self.cache.put_response(url, response.headers, digest)
+            parsed = None if self.refresh else self.cache.get_parsed(digest, PARSER_VERSION)
+            if parsed is not None:
+                self._count('parse_reused')
+                self._say(f"    Same content as a parsed PDF - {len(parsed)} cached companies")
+                return self._companies_from_cache(parsed, county, county_code, url)
+        
+        companies, complete = self._parse_pdf(response.content, county, county_code, url)
+        self._count('parsed')
+        if not complete:
+            self._mark_incomplete()
+        elif self.cache:
+            self.cache.put_parsed(digest, PARSER_VERSION, [asdict(c) for c in companies])
+        return companies
+    
+    def _mark_incomplete(self):
+        """Note that the county being scraped on this thread was only partly read."""
+        self._local.incomplete = True
+    
+    @staticmethod
+    def _companies_from_cache(parsed: List[Dict], county: str, county_code: str, source_url: str) -> List[DSPCompany]:
+        """Rebuild cached parse results for the county and URL they were found at this time."""
+        return [DSPCompany(**dict(c, county=county, county_code=county_code, source_url=source_url))
+                for c in parsed]
     
     def _find_funeral_pdfs(self, html: str, base_url: str) -> List[str]:
         """Find PDF links related to funeral services in HTML page."""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'html.parser', parse_only=ANCHORS_ONLY)
         pdf_links = []
         
         for link in soup.find_all('a', href=True):
@@ -131,44 +295,74 @@ class DSPScraper:
                 if href.startswith('http'):
                     pdf_links.append(href)
                 elif href.startswith('/'):
-                    from urllib.parse import urljoin
                     pdf_links.append(urljoin(base_url, href))
                 else:
-                    from urllib.parse import urljoin
                     pdf_links.append(urljoin(base_url + '/', href))
         
         return list(set(pdf_links))
     
-    def _parse_pdf(self, pdf_content: bytes, county: str, county_code: str, source_url: str) -> List[DSPCompany]:
-        """Parse PDF content to extract company records."""
-        companies = []
+    def _start_parse_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Create the PDF parsing pool (if enabled) and start its worker processes."""
+        with self._lock:
+            if self._parse_pool is None and self.parse_workers > 0:
+                self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+                # The first submit launches the workers; do it now, before any fetch
+                # threads exist, since forking a threaded process is unsafe
+                self._parse_pool.submit(os.getpid).result()
+            return self._parse_pool
+    
+    def _stop_parse_pool(self):
+        with self._lock:
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown()
+                self._parse_pool = None
+    
+    def _parse_pdf(self, pdf_content: bytes, county: str, county_code: str,
+                   source_url: str) -> Tuple[List[DSPCompany], bool]:
+        """
+        Parse PDF content to extract company records, in the parsing pool if there is one.
         
+        Returns:
+            (companies, complete) - complete is False if the PDF was cut short or failed
+        """
+        pool = self._start_parse_pool()
         try:
-            reader = PdfReader(io.BytesIO(pdf_content))
-            full_text = ""
-            
-            for page in reader.pages:
-                text = page.extract_text()
-                if text:
-                    full_text += text + "\n"
-            
-            # Parse the text
-            companies = self._extract_companies_from_text(full_text, county, county_code, source_url)
-            
+            if pool:
+                # Wait for a free worker here, so the timeout below only counts parsing;
+                # the slot is given back when the worker is done, even after a timeout
+                self._parse_slots.acquire()
+                try:
+                    future = pool.submit(parse_pdf_content, pdf_content, county, county_code,
+                                         source_url, self.pdf_time_budget)
+                except BaseException:
+                    self._parse_slots.release()
+                    raise
+                future.add_done_callback(lambda _: self._parse_slots.release())
+                # The budget is checked between pages; allow one slow page on top
+                companies, problem = future.result(timeout=self.pdf_time_budget * 2)
+            else:
+                companies, problem = parse_pdf_content(pdf_content, county, county_code,
+                                                       source_url, self.pdf_time_budget)
+        except FuturesTimeout:
+            companies, problem = [], f"PDF still parsing after {self.pdf_time_budget * 2:.0f}s - skipped"
         except Exception as e:
-            print(f"  Error parsing PDF: {e}")
+            companies, problem = [], f"Error parsing PDF: {e}"
         
-        return companies
+        if problem:
+            self._say(f"  {problem}")
+        return companies, problem is None
     
-    def _extract_companies_from_text(self, text: str, county: str, county_code: str, source_url: str) -> List[DSPCompany]:
-        """Extract company records from text."""
+    @staticmethod
+    def _extract_companies_from_text(text: Union[str, Iterable[str]], county: str, county_code: str,
+                                     source_url: str) -> List[DSPCompany]:
+        """Extract company records from text, or from a stream of lines (e.g. page by page)."""
         companies = []
         
         # Split into lines and process
-        lines = text.split('\n')
+        lines = text.split('\n') if isinstance(text, str) else text
         
         # Buffer for multi-line company entries
-        current_entry = ""
+        current_entry: List[str] = []
         
         for line in lines:
             line = line.strip()
@@ -179,23 +373,24 @@ class DSPScraper:
             if re.match(r'^\d+\.?\s+', line):
                 # Process previous entry if exists
                 if current_entry:
-                    company = self._parse_dsp_entry(current_entry, county, county_code, source_url)
+                    company = DSPScraper._parse_dsp_entry(" ".join(current_entry), county, county_code, source_url)
                     if company:
                         companies.append(company)
-                current_entry = line
+                current_entry = [line]
             elif current_entry:
                 # Continue previous entry
-                current_entry += " " + line
+                current_entry.append(line)
         
         # Process last entry
         if current_entry:
-            company = self._parse_dsp_entry(current_entry, county, county_code, source_url)
+            company = DSPScraper._parse_dsp_entry(" ".join(current_entry), county, county_code, source_url)
             if company:
                 companies.append(company)
         
         return companies
     
-    def _parse_dsp_entry(self, entry: str, county: str, county_code: str, source_url: str) -> Optional[DSPCompany]:
+    @staticmethod
+    def _parse_dsp_entry(entry: str, county: str, county_code: str, source_url: str) -> Optional[DSPCompany]:
         """Parse a single DSP table entry."""
         # Remove leading number
         entry = re.sub(r'^\d+\.?\s*', '', entry)
@@ -292,6 +487,10 @@ class DSPScraper:
     def scrape_county(self, county_code_or_source) -> List[DSPCompany]:
         """Scrape DSP data for a single county.
         
+        A PDF that could not be downloaded or was only partly parsed, or a
+        list page that could not be fetched, marks the county incomplete
+        (see scrape_all / incomplete_counties).
+        
         Args:
             county_code_or_source: Either a county code string (e.g., 'TM') 
                                    or a source dict from dsp_sources.json
@@ -305,7 +504,7 @@ class DSPScraper:
                     source = s
                     break
             if not source:
-                print(f"County code '{county_code_or_source}' not found in sources")
+                self._say(f"County code '{county_code_or_source}' not found in sources")
                 return []
         else:
             source = county_code_or_source
@@ -316,49 +515,50 @@ class DSPScraper:
         website = source.get('website', '')
         direct_pdf = source.get('direct_pdf_url', '')
         
-        print(f"\nScraping DSP {county} ({county_code})...")
+        self._say(f"\nScraping DSP {county} ({county_code})...")
         
         companies = []
         
         # Strategy 1: Try direct PDF URL if available
         if direct_pdf:
-            print(f"  Direct PDF: {direct_pdf}")
-            pdf_content = self._fetch_pdf(direct_pdf)
-            if pdf_content:
-                pdf_companies = self._parse_pdf(pdf_content, county, county_code, direct_pdf)
-                print(f"  Extracted {len(pdf_companies)} companies from direct PDF")
+            self._say(f"  Direct PDF: {direct_pdf}")
+            pdf_companies = self._fetch_pdf_companies(direct_pdf, county, county_code)
+            if pdf_companies is not None:
+                self._say(f"  Extracted {len(pdf_companies)} companies from direct PDF")
                 companies.extend(pdf_companies)
                 if companies:
                     return companies
+            # The list page below is read instead - a failed direct PDF does not count
+            self._local.incomplete = False
         
         # Strategy 2: Fetch the authorization page and find PDFs
-        print(f"  Fetching: {auth_url}")
+        self._say(f"  Fetching: {auth_url}")
         html = self._fetch_page(auth_url)
         if not html:
             html = self._fetch_page(website)
         
         if not html:
-            print(f"  Could not fetch page for {county}")
+            self._say(f"  Could not fetch page for {county}")
+            self._mark_incomplete()
             return companies
         
         # Find funeral-related PDF links
         pdf_links = self._find_funeral_pdfs(html, website)
-        print(f"  Found {len(pdf_links)} funeral-related PDF links")
+        self._say(f"  Found {len(pdf_links)} funeral-related PDF links")
         
         # Download and parse each PDF
         for pdf_url in pdf_links:
-            print(f"  Downloading: {pdf_url[:80]}...")
-            pdf_content = self._fetch_pdf(pdf_url)
+            self._say(f"  Downloading: {pdf_url[:80]}...")
+            pdf_companies = self._fetch_pdf_companies(pdf_url, county, county_code)
             
-            if pdf_content:
-                pdf_companies = self._parse_pdf(pdf_content, county, county_code, pdf_url)
-                print(f"    Extracted {len(pdf_companies)} companies")
+            if pdf_companies is not None:
+                self._say(f"    Extracted {len(pdf_companies)} companies")
                 companies.extend(pdf_companies)
         
         # Also try HTML tables
         html_companies = self._parse_html_tables(html, county, county_code, auth_url)
         if html_companies:
-            print(f"  Found {len(html_companies)} companies in HTML tables")
+            self._say(f"  Found {len(html_companies)} companies in HTML tables")
             companies.extend(html_companies)
         
         return companies
@@ -366,7 +566,7 @@ class DSPScraper:
     def _parse_html_tables(self, html: str, county: str, county_code: str, source_url: str) -> List[DSPCompany]:
         """Parse HTML tables for company data."""
         companies = []
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'html.parser', parse_only=TABLES_ONLY)
         
         for table in soup.find_all('table'):
             rows = table.find_all('tr')
@@ -400,26 +600,52 @@ class DSPScraper:
             counties: List of county codes to scrape (e.g., ['TM', 'CJ']). 
                       If None, scrapes all.
         """
-        all_companies = []
+        # Skip if specific counties requested and this isn't one
+        sources = [source for source in self.sources.get('sources', [])
+                   if not counties or source.get('county_code', '') in counties]
+        self.incomplete_counties = set()
         
-        for source in self.sources.get('sources', []):
-            county_code = source.get('county_code', '')
-            
-            # Skip if specific counties requested and this isn't one
-            if counties and county_code not in counties:
-                continue
-            
-            try:
-                companies = self.scrape_county(source)
-                all_companies.extend(companies)
-            except Exception as e:
-                print(f"  Error scraping {source.get('county', 'unknown')}: {e}")
+        # One county per worker; results are merged in sources order
+        self._start_parse_pool()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(self._scrape_source, sources))
+        finally:
+            self._stop_parse_pool()
         
+        all_companies = [company for companies in results for company in companies]
         self.companies = all_companies
         return all_companies
     
-    def save_results(self, output_path: str = None):
-        """Save scraped results to JSON file."""
+    def _scrape_source(self, source: Dict) -> List[DSPCompany]:
+        """scrape_county on a worker thread; errors only lose this county."""
+        self._local.county_code = source.get('county_code') if self.workers > 1 else None
+        self._local.incomplete = False
+        try:
+            return self.scrape_county(source)
+        except Exception as e:
+            self._say(f"  Error scraping {source.get('county', 'unknown')}: {e}")
+            self._local.incomplete = True
+            return []
+        finally:
+            if self._local.incomplete:
+                with self._lock:
+                    self.incomplete_counties.add(county_key(source))
+            self._local.county_code = None
+    
+    def save_results(self, output_path: str = None, record_changes: bool = True):
+        """
+        Save scraped results to JSON file.
+        
+        The previous snapshot is diffed against this run first and the
+        differences are appended to the DSP change log (tools/dsp_changes.py).
+        Counties this run did not cover, or only partly read
+        (incomplete_counties), keep their previous entries and log nothing.
+        
+        Args:
+            output_path: Snapshot path (default: data/dsp_authorized_companies.json)
+            record_changes: Append the diff to the change log
+        """
         if not output_path:
             output_path = os.path.join(
                 os.path.dirname(os.path.dirname(__file__)),
@@ -430,18 +656,52 @@ class DSPScraper:
         # Create directory if needed
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
+        previous = []
+        if os.path.exists(output_path):
+            with open(output_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f).get('companies', [])
+        
+        scraped_at = datetime.now().isoformat()
+        found = [asdict(c) for c in self.companies]
+        self.changes = diff_snapshots(previous, found, self.incomplete_counties)
+        companies = merge_snapshots(previous, found, self.incomplete_counties)
+        
         data = {
-            'scraped_at': datetime.now().isoformat(),
-            'total_companies': len(self.companies),
-            'companies': [asdict(c) for c in self.companies]
+            'scraped_at': scraped_at,
+            'total_companies': len(companies),
+            'companies': companies
         }
         
-        with open(output_path, 'w', encoding='utf-8') as f:
+        # Log before replacing the snapshot: a crash in between re-reports the diff next run
+        if record_changes:
+            append_changes(self.changes, run_at=scraped_at)
+        
+        tmp_path = output_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, output_path)
+        
+        if self.registry:
+            self._record_in_registry(found)
         
-        print(f"\nSaved {len(self.companies)} companies to {output_path}")
+        print(f"\nSaved {len(companies)} companies to {output_path}")
+        if self.incomplete_counties:
+            print(f"Incomplete, previous entries kept: {', '.join(sorted(self.incomplete_counties))}")
+        counts = summarize(self.changes)
+        print(f"Changes since last run: {counts['added']} added, {counts['removed']} removed, "
+              f"{counts['changed']} changed")
         return output_path
     
+    def _record_in_registry(self, found: List[Dict]):
+        """Store this run's entries, and "not found" for revoked ones, as source 'dsp'."""
+        for entry in found:
+            self.registry.put('dsp', entry, cui=entry.get('cui'), name=entry.get('name'),
+                              city=entry.get('county_code'))
+        for event in self.changes:
+            if event['type'] == 'removed':
+                self.registry.put('dsp', None, cui=event.get('cui'), name=event.get('name'),
+                                  city=event.get('county_code'))
+    
     def get_companies_by_county(self, county_code: str) -> List[DSPCompany]:
         """Get companies for a specific county."""
         return [c for c in self.companies if c.county_code == county_code]
@@ -462,6 +722,43 @@ class DSPScraper:
         return results
 
 
+def _pdf_lines(reader: PdfReader, deadline: float, progress: Dict) -> Iterator[str]:
+    """Text lines of a PDF, one page at a time, until the deadline passes."""
+    for page in reader.pages:
+        if time.monotonic() > deadline:
+            return
+        text = page.extract_text()
+        progress['pages'] += 1
+        if text:
+            yield from text.split('\n')
+
+
+def parse_pdf_content(pdf_content: bytes, county: str, county_code: str, source_url: str,
+                      time_budget: float = PDF_TIME_BUDGET) -> Tuple[List[DSPCompany], Optional[str]]:
+    """
+    Extract company records from a PDF (runs in a parsing worker process).
+    
+    Returns:
+        (companies, problem) - problem is None if every page was parsed,
+        otherwise why the result is partial
+    """
+    deadline = time.monotonic() + time_budget
+    progress = {'pages': 0}
+    try:
+        reader = PdfReader(io.BytesIO(pdf_content))
+        total_pages = len(reader.pages)
+        companies = DSPScraper._extract_companies_from_text(
+            _pdf_lines(reader, deadline, progress), county, county_code, source_url
+        )
+    except Exception as e:
+        return [], f"Error parsing PDF: {e}"
+    
+    if progress['pages'] < total_pages:
+        return companies, (f"Time budget of {time_budget:g}s ran out after "
+                           f"{progress['pages']}/{total_pages} pages - partial result")
+    return companies, None
+
+
 def main():
     """Main function to run DSP scraper."""
     import argparse
@@ -470,10 +767,17 @@ def main():
     parser.add_argument('--counties', '-c', nargs='+', help='County codes to scrape (e.g., TM CJ)')
     parser.add_argument('--output', '-o', help='Output JSON file path')
     parser.add_argument('--test', '-t', action='store_true', help='Test mode - scrape only first county')
+    parser.add_argument('--refresh', action='store_true', help='Re-download and re-parse everything (cache is still updated)')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the DSP cache')
+    parser.add_argument('--workers', '-w', type=int, default=DEFAULT_WORKERS, help='Counties scraped in parallel')
+    parser.add_argument('--parse-workers', type=int, help='PDF parsing processes (default: one per core, 0 = in-process)')
+    parser.add_argument('--pdf-budget', type=float, default=PDF_TIME_BUDGET, help='Seconds of text extraction per PDF')
     
     args = parser.parse_args()
     
-    scraper = DSPScraper()
+    started = time.monotonic()
+    scraper = DSPScraper(use_cache=not args.no_cache, refresh=args.refresh, workers=args.workers,
+                         parse_workers=args.parse_workers, pdf_time_budget=args.pdf_budget)
     
     if args.test:
         # Test mode - just scrape Timiș
@@ -491,6 +795,10 @@ def main():
     print("DSP SCRAPING COMPLETE")
     print("="*60)
     print(f"Total companies found: {len(companies)}")
+    stats = scraper.cache_stats
+    print(f"Requests: {stats['downloaded']} downloaded, {stats['not_modified']} not modified; "
+          f"PDFs parsed: {stats['parsed']}, reused by content hash: {stats['parse_reused']}")
+    print(f"Took {time.monotonic() - started:.1f}s with {scraper.workers} workers")
     
     # Group by county
     by_county = {}
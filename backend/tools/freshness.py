@@ -0,0 +1,150 @@
+"""
+Freshness - staleness/volatility priority queue for re-checking scraped businesses.
+
+Every stored business carries last_verified_at (when it was last seen on
+Google Maps), last_checked_at (when it was last re-checked, found or not)
+and volatility (a decaying score of how often re-checks find changes).
+Re-check priority is
+
+    hours since last checked * (1 + volatility)
+
+so listings that keep changing their phone, rating or hours come back sooner
+than ones that never move, and nothing is left stale forever. A listing that
+was not found keeps its last_verified_at and is retried on the same schedule.
+"""
+import heapq
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Treat never-verified businesses as this old
+UNVERIFIED_AGE_HOURS = 30 * 24
+# Volatility halves on every re-check; a change adds its field weight
+VOLATILITY_DECAY = 0.5
+CHANGE_WEIGHTS = {
+    'phone': 1.0,
+    'address': 1.0,
+    'website': 0.5,
+    'business_hours': 0.5,
+    'is_non_stop': 0.5,
+    'rating': 0.3,
+    'review_count': 0.3,
+}
+# Fields a re-check is allowed to overwrite
+REFRESH_FIELDS = list(CHANGE_WEIGHTS)
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def staleness_priority(record: Dict, now: datetime = None) -> float:
+    """Re-check priority of a stored business (higher = sooner)."""
+    now = now or datetime.now()
+    checked = [t for t in (_parse_time(record.get('last_verified_at')),
+                           _parse_time(record.get('last_checked_at'))) if t]
+    age_hours = (now - max(checked)).total_seconds() / 3600 if checked else UNVERIFIED_AGE_HOURS
+    return max(age_hours, 0.0) * (1 + (record.get('volatility') or 0.0))
+
+
+def diff_business(stored: Dict, fresh: Dict) -> Dict[str, Tuple]:
+    """
+    Fields whose fresh value differs from the stored one.
+
+    Empty fresh values are ignored - a panel that failed to show the phone
+    should not wipe a known number.
+
+    Returns:
+        {field: (old, new)}
+    """
+    changes = {}
+    for field in REFRESH_FIELDS:
+        new = fresh.get(field)
+        if new in (None, '', {}, []):
+            continue
+        old = stored.get(field)
+        if field == 'rating' and old is not None:
+            if abs(float(old) - float(new)) < 0.05:
+                continue
+        elif field == 'is_non_stop':
+            if bool(old) == bool(new):
+                continue
+        elif old == new:
+            continue
+        changes[field] = (old, new)
+    return changes
+
+
+def apply_refresh(stored: Dict, fresh: Optional[Dict], now: datetime = None) -> Tuple[Dict, Dict[str, Tuple]]:
+    """
+    Merge a re-check result into a stored record and update its freshness fields.
+
+    Args:
+        stored: Record from the county store
+        fresh: Freshly extracted business dict, or None if the listing was not found
+
+    Returns:
+        (updated record, changes)
+    """
+    now = now or datetime.now()
+    updated = dict(stored)
+    volatility = (stored.get('volatility') or 0.0) * VOLATILITY_DECAY
+
+    if fresh is None:
+        # Not found this time - count it, but don't drop anything. It was not
+        # seen on Maps, so only last_checked_at moves (for the back-off)
+        updated['refresh_misses'] = (stored.get('refresh_misses') or 0) + 1
+        updated['last_checked_at'] = now.isoformat(timespec='seconds')
+        updated['volatility'] = round(volatility, 3)
+        return updated, {}
+
+    changes = diff_business(stored, fresh)
+    for field, (_, new) in changes.items():
+        updated[field] = new
+        volatility += CHANGE_WEIGHTS[field]
+    for key in ('place_id', 'place_url'):
+        if not stored.get(key) and fresh.get(key):
+            updated[key] = fresh[key]
+
+    updated['last_verified_at'] = now.isoformat(timespec='seconds')
+    updated['last_checked_at'] = updated['last_verified_at']
+    updated['volatility'] = round(volatility, 3)
+    updated['refresh_misses'] = 0
+    if changes:
+        updated['last_changed_at'] = now.isoformat(timespec='seconds')
+    return updated, changes
+
+
+class FreshnessQueue:
+    """Max-heap of stored businesses by staleness_priority."""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, str, Dict]] = []
+        self._counter = 0  # Tie-breaker so dicts are never compared
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, source: str, record: Dict, now: datetime = None):
+        """Add a record; source identifies where it lives (e.g. its county file)."""
+        priority = staleness_priority(record, now)
+        heapq.heappush(self._heap, (-priority, self._counter, source, record))
+        self._counter += 1
+
+    def pop(self) -> Optional[Tuple[float, str, Dict]]:
+        """Most stale entry as (priority, source, record), or None when empty."""
+        if not self._heap:
+            return None
+        neg_priority, _, source, record = heapq.heappop(self._heap)
+        return -neg_priority, source, record
+
+    def peek(self, n: int = 10) -> List[Tuple[float, str, Dict]]:
+        """The n most stale entries without removing them."""
+        return [(-p, source, record) for p, _, source, record in heapq.nsmallest(n, self._heap)]
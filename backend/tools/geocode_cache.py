@@ -0,0 +1,173 @@
+"""
+Geocode Cache - SQLite-backed memory of Nominatim lookups.
+
+GeocodingTool.geocode answers from the offline OSM index when it can, then
+falls back to Nominatim at 1 request/second: structured street + number,
+structured street, business name, free-text address and finally the city
+center. Every Nominatim answer is stored here, keyed by strategy + normalized
+query, so re-running geocode_scraped.py or re-importing a county only goes
+to the network for addresses it has never seen:
+
+- positive results keep their provenance (provider, OSM id/type, display name)
+  and live POSITIVE_TTL_DAYS
+- "not found" answers are cached too, for the shorter NEGATIVE_TTL_DAYS, so a
+  hopeless query is not retried on every run but OSM edits still get picked up
+- network errors are never cached
+
+The file is shared by every process (WAL mode), so parallel scrapers and
+batch scripts all benefit from each other's lookups.
+"""
+import re
+import time
+import sqlite3
+import logging
+import unicodedata
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "geocode_cache.sqlite"
+
+POSITIVE_TTL_DAYS = 180
+NEGATIVE_TTL_DAYS = 14
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS geocodes (
+    strategy TEXT NOT NULL,
+    query_key TEXT NOT NULL,
+    query TEXT,
+    found INTEGER NOT NULL,
+    latitude REAL,
+    longitude REAL,
+    provider TEXT,
+    osm_type TEXT,
+    osm_id TEXT,
+    display_name TEXT,
+    place_class TEXT,
+    place_type TEXT,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (strategy, query_key)
+);
+CREATE INDEX IF NOT EXISTS idx_geocodes_expires ON geocodes(expires_at);
+"""
+
+
+def normalize_query(query: str) -> str:
+    """
+    Cache key of a query: no diacritics, lowercase, punctuation and repeated
+    whitespace collapsed, so "Str. Gheorghe Lazăr 5, Timișoara" and
+    "str gheorghe lazar 5,  timisoara" share one entry.
+    """
+    normalized = unicodedata.normalize('NFD', query or '')
+    normalized = ''.join(c for c in normalized if unicodedata.category(c) != 'Mn')
+    normalized = normalized.lower()
+    normalized = re.sub(r'[^\w,]+', ' ', normalized)
+    normalized = re.sub(r'\s*,\s*', ',', normalized)
+    normalized = re.sub(r',+', ',', normalized)
+    return re.sub(r'\s+', ' ', normalized).strip(' ,')
+
+
+class GeocodeCache:
+    """Positive and negative geocoding results with expiry."""
+
+    def __init__(self, db_path: Path = None, positive_ttl_days: float = POSITIVE_TTL_DAYS,
+                 negative_ttl_days: float = NEGATIVE_TTL_DAYS):
+        """
+        Args:
+            db_path: SQLite file (default: data/geocode_cache.sqlite)
+            positive_ttl_days: How long found coordinates are trusted
+            negative_ttl_days: How long a "not found" answer is trusted
+        """
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.positive_ttl = positive_ttl_days * 86400
+        self.negative_ttl = negative_ttl_days * 86400
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+        # Counters for this process
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, strategy: str, query: str) -> Optional[Dict]:
+        """
+        Cached answer for a query, or None if unknown or expired.
+
+        Returns:
+            Row dict; row['found'] is False for a cached "not found"
+        """
+        row = self.conn.execute(
+            "SELECT * FROM geocodes WHERE strategy = ? AND query_key = ? AND expires_at > ?",
+            (strategy, normalize_query(query), time.time())
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        if row['found']:
+            self.hits += 1
+        else:
+            self.negative_hits += 1
+        return dict(row, found=bool(row['found']))
+
+    def put(self, strategy: str, query: str, result: Optional[Dict], provider: str = 'nominatim'):
+        """
+        Store an answer.
+
+        Args:
+            strategy: Lookup strategy (business, address, street, city, ...)
+            query: The query as sent to the provider
+            result: Provider result (Nominatim JSON item with lat/lon), or None for "not found"
+            provider: Where the answer came from
+        """
+        now = time.time()
+        found = result is not None
+        result = result or {}
+        osm_id = result.get('osm_id')
+        self.conn.execute(
+            """INSERT OR REPLACE INTO geocodes
+               (strategy, query_key, query, found, latitude, longitude, provider, osm_type, osm_id,
+                display_name, place_class, place_type, fetched_at, expires_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (strategy, normalize_query(query), query, int(found),
+             float(result['lat']) if found else None, float(result['lon']) if found else None,
+             provider, result.get('osm_type'), str(osm_id) if osm_id is not None else None,
+             result.get('display_name'), result.get('class'), result.get('type'),
+             now, now + (self.positive_ttl if found else self.negative_ttl))
+        )
+
+    def purge_expired(self) -> int:
+        """Delete expired entries. Returns the number removed."""
+        return self.conn.execute("DELETE FROM geocodes WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def stats(self) -> Dict:
+        """Lookups answered from the cache by this process, and the cache size."""
+        counts = {r['found']: r['n'] for r in self.conn.execute(
+            "SELECT found, COUNT(*) AS n FROM geocodes WHERE expires_at > ? GROUP BY found", (time.time(),))}
+        return {
+            'hits': self.hits,
+            'negative_hits': self.negative_hits,
+            'misses': self.misses,
+            'cached_positive': counts.get(1, 0),
+            'cached_negative': counts.get(0, 0),
+        }
+
+
+# Shared instance for the process
+_cache = None
+
+
+def get_geocode_cache() -> GeocodeCache:
+    global _cache
+    if _cache is None:
+        _cache = GeocodeCache()
+    return _cache
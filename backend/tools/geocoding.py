@@ -1,12 +1,36 @@
 """
 Geocoding Tool - Convert addresses to coordinates using Nominatim (OpenStreetMap).
-Free, no API key required.
+Free, no API key required. Results are cached in data/geocode_cache.sqlite.
+
+With an offline OSM index built (build_osm_index.py, see
+tools/offline_geocoder.py) addresses are answered locally first and Nominatim
+is only asked when the index has no street-level match.
+
+Addresses are parsed into street / number / city and sent as structured
+queries; the cascade stops at the first strategy that gives a street-level
+answer, so most businesses cost a single Nominatim call. Identical queries
+within one GeocodingTool are answered from memory (request coalescing); under
+a GeocoderService the memo is shared by all threads, and a query already in
+flight on one thread is waited for by the others, so each distinct query is
+looked up once per process.
+
+Callers share one GeocoderService (get_geocoder()): every thread gets its own
+GeocodingTool, and all of them send their searches through one GeocoderPool -
+a keep-alive session and a lock-protected rate budget per backend - so the
+rate limit holds across threads and connections are reused.
 """
 import re
 import requests
 import time
-from typing import Optional, Tuple
-from config.settings import USER_AGENT
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from config.settings import USER_AGENT, GEOCODER_BACKEND, GEOCODER_ENDPOINTS
+from tools.geocode_cache import GeocodeCache, get_geocode_cache, normalize_query
+from tools.geocoding_pool import GeocoderPool, BackendSpec
+from tools.offline_geocoder import OfflineGeocoder
 
 
 def has_street_number(address: str) -> bool:
@@ -31,6 +55,70 @@ def has_street_number(address: str) -> bool:
     return False
 
 
+# Romanian street type words (an address part starting with one is a street)
+STREET_PREFIXES = [
+    'strada', 'str.', 'str ', 'calea', 'bulevardul', 'bd.', 'bd ', 'b-dul', 'bdul',
+    'aleea', 'al.', 'piata', 'piața', 'splai', 'splaiul', 'drumul', 'intrarea', 'soseaua',
+    'șoseaua', 'sos.', 'șos.', 'dn', 'dj',
+]
+
+
+@dataclass
+class ParsedAddress:
+    """Street address split for structured geocoding."""
+    street: Optional[str] = None
+    number: Optional[str] = None
+    city: Optional[str] = None
+    postcode: Optional[str] = None
+
+
+def parse_address(address: str, city: str = None) -> ParsedAddress:
+    """
+    Split a Romanian address into street, house number, city and postcode.
+    
+    Examples:
+        "Strada Gheorghe Lazăr 5, Timișoara 300081"  -> street "Strada Gheorghe Lazăr", number "5"
+        "Bd. Revoluției nr. 10 bl. A2, Arad"         -> street "Bd. Revoluției", number "10"
+        "Lângă Spitalul Județean, Timișoara"         -> no street (landmark, free-text only)
+    
+    Args:
+        address: Address as scraped
+        city: Known city (preferred over the one in the address)
+    """
+    parsed = ParsedAddress(city=city)
+    if not address:
+        return parsed
+    
+    postcode = re.search(r'\b(\d{6})\b', address)
+    if postcode:
+        parsed.postcode = postcode.group(1)
+    
+    cleaned = re.sub(r'\([^)]*\)|\[[^\]]*\]', '', address)
+    cleaned = re.sub(r'Cod\s*Postal\s*\d{6}|\b\d{6}\b', '', cleaned, flags=re.IGNORECASE)
+    cleaned = re.sub(r',?\s*Jud(?:\.|e[țt]ul?)?\s+[^,]+', '', cleaned, flags=re.IGNORECASE)
+    cleaned = re.sub(r',?\s*Rom[aâ]nia', '', cleaned, flags=re.IGNORECASE)
+    parts = [p.strip(' .') for p in cleaned.split(',') if p.strip(' .')]
+    if not parts:
+        return parsed
+    
+    if not parsed.city and len(parts) > 1:
+        parsed.city = parts[1]
+    
+    street = parts[0]
+    # Block / staircase / apartment details are not geocodable
+    street = re.split(r'\b(?:bl|bloc|sc|scara|ap|et|etaj)\b\.?', street, flags=re.IGNORECASE)[0].strip(' ,.')
+    number = re.search(r'\bnr\.?\s*(\d+[A-Za-z]?)', street, re.IGNORECASE) or re.search(r'\s(\d+[A-Za-z]?)$', street)
+    if number:
+        parsed.number = number.group(1)
+        street = (street[:number.start()] + street[number.end():]).strip(' ,.')
+    
+    is_street = any(street.lower().startswith(p) for p in STREET_PREFIXES) or parsed.number is not None
+    same_as_city = parsed.city and street.lower() == parsed.city.lower()
+    if street and is_street and not same_as_city and re.search(r'[^\W\d_]', street):
+        parsed.street = street
+    return parsed
+
+
 # Hardcoded city center coordinates for Romanian cities (guaranteed fallback)
 CITY_COORDINATES = {
     'timișoara': (45.7538355, 21.2257474),
@@ -107,13 +195,44 @@ CITY_COORDINATES = {
 class GeocodingTool:
     """
     Geocode Romanian addresses using Nominatim API.
+    Every lookup goes through the shared geocode cache (tools/geocode_cache.py).
     """
     
     BASE_URL = "https://nominatim.openstreetmap.org/search"
     
-    def __init__(self):
+    # Identical queries remembered in memory (per tool); cleared when it grows past this
+    MEMO_SIZE = 10000
+    
+    BACKENDS = ('auto', 'offline', 'nominatim')
+    
+    def __init__(self, cache: Optional[GeocodeCache] = None, use_cache: bool = True,
+                 backend: str = None, transport: Callable[[Dict, Dict], List[Dict]] = None,
+                 coalescer: Optional['LookupCoalescer'] = None):
+        """
+        Args:
+            cache: Geocode cache to use (default: the shared data/geocode_cache.sqlite)
+            use_cache: False to always ask Nominatim (results are still not stored)
+            backend: "auto" (offline index if built, Nominatim fallback), "offline" (no network)
+                     or "nominatim" (default: GEOCODER_BACKEND setting)
+            transport: Sends Nominatim searches instead of the built-in 1 req/s client,
+                       e.g. GeocoderPool.search (takes params and headers, returns results)
+            coalescer: Memo shared with other tools (GeocoderService) instead of this tool's own
+        """
+        self.transport = transport
+        self.backend = backend or GEOCODER_BACKEND
+        if self.backend not in self.BACKENDS:
+            raise ValueError(f"Unknown geocoder backend '{self.backend}' (choose from {', '.join(self.BACKENDS)})")
+        if self.backend == 'offline' and not OfflineGeocoder.available():
+            raise ValueError("Offline geocoder index not built - run build_osm_index.py first")
+        self.offline = OfflineGeocoder() if self.backend != 'nominatim' and OfflineGeocoder.available() else None
         self.last_request_time = 0
         self.min_delay = 1.0  # Nominatim requires 1 request per second max
+        self.session = None if transport else requests.Session()
+        self.cache = (cache or get_geocode_cache()) if use_cache else None
+        self._memo: Dict[Tuple[str, str], Optional[Tuple[float, float]]] = {}
+        self.coalescer = coalescer
+        self.stats = {'geocodes': 0, 'offline': 0, 'lookups': 0, 'coalesced': 0, 'cached': 0, 'network': 0}
+        self.last_level: Optional[str] = None  # Strategy that answered the last geocode()
     
     def _rate_limit(self):
         """Ensure we don't exceed rate limits."""
@@ -122,6 +241,77 @@ class GeocodingTool:
             time.sleep(self.min_delay - elapsed)
         self.last_request_time = time.time()
     
+    def _lookup(self, strategy: str, query: str, address_details: bool = True,
+                structured: Dict[str, str] = None) -> Optional[Tuple[float, float]]:
+        """
+        One Nominatim search, answered from memory or the cache when the query was seen before.
+        
+        Args:
+            strategy: Cache namespace (structured, address, business, city)
+            query: Free-form Nominatim query (the cache key for structured searches)
+            address_details: Ask Nominatim for the address breakdown
+            structured: Structured search parameters (street, city, county) used instead of q
+            
+        Returns:
+            (latitude, longitude), or None if Nominatim found nothing
+            
+        Raises:
+            requests.RequestException: Network/HTTP errors (never cached)
+        """
+        self.stats['lookups'] += 1
+        memo_key = (strategy, normalize_query(query))
+        fetch = partial(self._fetch, strategy, query, address_details, structured)
+        if self.coalescer is not None:
+            coords, coalesced = self.coalescer.get(memo_key, fetch)
+            if coalesced:
+                self.stats['coalesced'] += 1
+            return coords
+        
+        if memo_key in self._memo:
+            self.stats['coalesced'] += 1
+            return self._memo[memo_key]
+        if len(self._memo) >= self.MEMO_SIZE:
+            self._memo.clear()
+        coords = fetch()
+        self._memo[memo_key] = coords
+        return coords
+    
+    def _fetch(self, strategy: str, query: str, address_details: bool,
+               structured: Optional[Dict[str, str]]) -> Optional[Tuple[float, float]]:
+        """A search missing from the memo: the cache, else Nominatim (see _lookup)."""
+        if self.cache:
+            cached = self.cache.get(strategy, query)
+            if cached is not None:
+                self.stats['cached'] += 1
+                return (cached['latitude'], cached['longitude']) if cached['found'] else None
+        
+        self.stats['network'] += 1
+        params = dict(structured) if structured else {'q': query}
+        params.update({
+            'format': 'json',
+            'limit': 1,
+            'countrycodes': 'ro'
+        })
+        if address_details:
+            params['addressdetails'] = 1
+        
+        headers = {
+            'User-Agent': USER_AGENT
+        }
+        
+        if self.transport:
+            results = self.transport(params, headers)
+        else:
+            self._rate_limit()
+            response = self.session.get(self.BASE_URL, params=params, headers=headers, timeout=10)
+            response.raise_for_status()
+            results = response.json()
+        result = results[0] if results else None
+        if self.cache:
+            self.cache.put(strategy, query, result)
+        
+        return (float(result['lat']), float(result['lon'])) if result else None
+    
     def _clean_address(self, address: str) -> str:
         """
         Clean address by removing postal codes, county info, and other noise
@@ -160,6 +350,13 @@ class GeocodingTool:
         """
         Geocode an address to lat/lng coordinates.
         
+        Cascade (stops at the first hit):
+        1. Structured street + number + city
+        2. Structured street + city, if a number was tried (street-level)
+        3. Company name + city - only when the address has no street to search
+        4. Free-text address - only when the address could not be parsed into a street
+        5. City center (local table first, no network for known cities)
+        
         Args:
             address: Street address
             city: City name (optional, improves accuracy)
@@ -169,207 +366,124 @@ class GeocodingTool:
         Returns:
             Tuple of (latitude, longitude) or None if not found
         """
-        # Strategy 1: Try company name + city (businesses often indexed by name)
-        if company_name and city:
+        self.stats['geocodes'] += 1
+        self.last_level = None
+        parsed = parse_address(address, city)
+        city = city or parsed.city
+        
+        # Offline index first - street-level answers need no network at all
+        if self.offline and city:
+            coords = self.offline.geocode_parts(parsed.street, parsed.number, city, county)
+            if coords and (self.offline.last_level != 'city' or self.backend == 'offline'):
+                self.stats['offline'] += 1
+                self.last_level = self.offline.last_level
+                return coords
+        if self.backend == 'offline':
+            return None
+        
+        # Strategies 1-2: structured street search
+        if parsed.street and city:
+            coords = self._geocode_structured(parsed.street, parsed.number, city, county)
+            if coords:
+                self.last_level = 'address' if parsed.number else 'street'
+                return coords
+            if parsed.number:
+                coords = self._geocode_structured(parsed.street, None, city, county)
+                if coords:
+                    self.last_level = 'street'
+                    return coords
+        
+        # Strategy 3: company name + city (businesses are sometimes indexed by name)
+        if company_name and city and not parsed.street:
             result = self._geocode_business(company_name, city)
             if result:
+                self.last_level = 'business'
                 return result
         
-        # Strategy 2: Try full address
-        if address and address.strip():
-            self._rate_limit()
-            
-            # Clean the address - remove postal codes, "Jud", "Cod Postal", etc.
+        # Strategy 4: free-text address - landmarks and formats the parser does not know
+        if address and address.strip() and not parsed.street:
             cleaned_address = self._clean_address(address)
             
-            # Build full address query
             parts = [cleaned_address]
-            if city:
+            if city and city.lower() not in cleaned_address.lower():
                 parts.append(city)
             parts.append("Romania")
-            
             query = ", ".join(parts)
             
             try:
-                params = {
-                    'q': query,
-                    'format': 'json',
-                    'limit': 1,
-                    'countrycodes': 'ro',
-                    'addressdetails': 1
-                }
-                
-                headers = {
-                    'User-Agent': USER_AGENT
-                }
-                
-                response = requests.get(self.BASE_URL, params=params, headers=headers, timeout=10)
-                response.raise_for_status()
-                
-                results = response.json()
-                
-                if results and len(results) > 0:
-                    lat = float(results[0]['lat'])
-                    lon = float(results[0]['lon'])
-                    print(f"  Geocoded address '{query}' -> ({lat}, {lon})")
-                    return (lat, lon)
-                else:
-                    # Try to extract and geocode just the street name
-                    street_result = self._geocode_street(address, city)
-                    if street_result:
-                        return street_result
-                    print(f"  Address not found, trying city fallback...")
-                    
+                coords = self._lookup('address', query)
+                if coords:
+                    print(f"  Geocoded address '{query}' -> ({coords[0]}, {coords[1]})")
+                    self.last_level = 'address' if has_street_number(cleaned_address) else 'street'
+                    return coords
+                print(f"  Address not found, trying city fallback...")
             except Exception as e:
                 print(f"  Geocoding error: {e}")
         
-        # Strategy 3: Fall back to city coordinates (guaranteed for major cities)
+        # Strategy 5: Fall back to city coordinates
         if city:
-            return self._geocode_city(city, county)
+            coords = self._geocode_city(city, county)
+            if coords:
+                self.last_level = 'city'
+            return coords
         
         return None
     
-    def _geocode_street(self, address: str, city: str) -> Optional[Tuple[float, float]]:
-        """
-        Try to extract and geocode just the street name from an address.
-        Useful when full address with extra info (like landmarks) fails.
-        """
-        import re
-        
-        # Clean the address - remove parenthetical info, landmarks, etc.
-        # "Calea Lugojului, Timisoara (fostul restaurant Trafic)" -> "Calea Lugojului"
-        cleaned = re.sub(r'\([^)]*\)', '', address)  # Remove (...)
-        cleaned = re.sub(r'\[[^\]]*\]', '', cleaned)  # Remove [...]
-        cleaned = cleaned.split(',')[0].strip()  # Take first part before comma
-        
-        # Common Romanian street prefixes
-        street_prefixes = [
-            'strada', 'str.', 'str ', 'calea', 'bulevardul', 'bd.', 'bd ', 'b-dul',
-            'aleea', 'piata', 'piața', 'splai', 'splaiul', 'drumul', 'intrarea'
-        ]
-        
-        # Check if it looks like a street name
-        has_street_prefix = any(cleaned.lower().startswith(p) for p in street_prefixes)
-        
-        if not has_street_prefix and not cleaned:
-            return None
-        
-        # If no city provided, can't do street search
-        if not city:
-            return None
-        
-        self._rate_limit()
-        
-        # Try geocoding the street in the city
-        query = f"{cleaned}, {city}, Romania"
+    def _geocode_structured(self, street: str, number: Optional[str], city: str,
+                            county: str = None) -> Optional[Tuple[float, float]]:
+        """Nominatim structured search for a street (with house number if given) in a city."""
+        street_param = f"{number} {street}" if number else street
+        structured = {'street': street_param, 'city': city, 'country': 'Romania'}
+        if county:
+            structured['county'] = county
+        query = ", ".join(p for p in (street_param, city, county) if p)
         
         try:
-            params = {
-                'q': query,
-                'format': 'json',
-                'limit': 1,
-                'countrycodes': 'ro',
-                'addressdetails': 1
-            }
-            
-            headers = {
-                'User-Agent': USER_AGENT
-            }
-            
-            response = requests.get(self.BASE_URL, params=params, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            results = response.json()
-            
-            if results and len(results) > 0:
-                lat = float(results[0]['lat'])
-                lon = float(results[0]['lon'])
-                print(f"  Geocoded street '{cleaned}' in {city} -> ({lat}, {lon})")
-                return (lat, lon)
-            
-            return None
-            
+            coords = self._lookup('structured', query, structured=structured)
+            if coords:
+                level = "address" if number else "street"
+                print(f"  Geocoded {level} '{street_param}' in {city} -> ({coords[0]}, {coords[1]})")
+            return coords
         except Exception as e:
-            print(f"  Street geocoding error: {e}")
+            print(f"  Structured geocoding error: {e}")
             return None
     
     def _geocode_business(self, company_name: str, city: str) -> Optional[Tuple[float, float]]:
         """Try to find a business by name in Nominatim."""
-        self._rate_limit()
-        
         # Search for business name in city
         query = f"{company_name}, {city}, Romania"
         
         try:
-            params = {
-                'q': query,
-                'format': 'json',
-                'limit': 1,
-                'countrycodes': 'ro'
-            }
-            
-            headers = {
-                'User-Agent': USER_AGENT
-            }
-            
-            response = requests.get(self.BASE_URL, params=params, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            results = response.json()
-            
-            if results and len(results) > 0:
-                lat = float(results[0]['lat'])
-                lon = float(results[0]['lon'])
-                print(f"  Found business '{company_name}' -> ({lat}, {lon})")
-                return (lat, lon)
-                
-            return None
+            coords = self._lookup('business', query, address_details=False)
+            if coords:
+                print(f"  Found business '{company_name}' -> ({coords[0]}, {coords[1]})")
+            return coords
             
         except Exception as e:
             print(f"  Business search error: {e}")
             return None
     
     def _geocode_city(self, city: str, county: str = None) -> Optional[Tuple[float, float]]:
-        """Fallback to geocode just the city. Returns None to avoid city center coordinates."""
-        # DISABLED: City center fallback causes too many businesses at wrong location
-        # Better to return None and flag the address as needing manual review
-        # city_lower = city.lower().strip()
-        # if city_lower in CITY_COORDINATES:
-        #     coords = CITY_COORDINATES[city_lower]
-        #     print(f"  Using cached coordinates for '{city}' -> ({coords[0]}, {coords[1]})")
-        #     return coords
-        print(f"  SKIPPING city center fallback for '{city}' - address needs manual review")
-        
-        # Try Nominatim API
-        self._rate_limit()
+        """Last resort: the city center (local table for known cities, else Nominatim)."""
+        print(f"  Falling back to city center for '{city}' - address needs manual review")
+        
+        coords = CITY_COORDINATES.get(city.lower().strip())
+        if coords:
+            return coords
+        if self.offline:
+            coords = self.offline.geocode_parts(None, None, city, county)
+            if coords:
+                return coords
         
         # Just use city name without county prefix - works better with Nominatim
         query = f"{city}, Romania"
         
         try:
-            params = {
-                'q': query,
-                'format': 'json',
-                'limit': 1,
-                'countrycodes': 'ro'
-            }
-            
-            headers = {
-                'User-Agent': USER_AGENT
-            }
-            
-            response = requests.get(self.BASE_URL, params=params, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            results = response.json()
+            coords = self._lookup('city', query, address_details=False)
+            if coords:
+                print(f"  Geocoded city '{city}' -> ({coords[0]}, {coords[1]})")
+                return coords
             
-            if results and len(results) > 0:
-                lat = float(results[0]['lat'])
-                lon = float(results[0]['lon'])
-                print(f"  Geocoded city '{city}' -> ({lat}, {lon})")
-                return (lat, lon)
-            
-            # API returned no results - try without diacritics in hardcoded
             print(f"  City '{city}' not found in Nominatim or cache")
             return None
             
@@ -378,13 +492,179 @@ class GeocodingTool:
             return None
 
 
-# Singleton instance
+    def reverse(self, lat: float, lng: float) -> Optional[Dict]:
+        """
+        Locality of a point from the offline index.
+        
+        Returns:
+            {'name', 'place_type', 'county', 'lat', 'lng'}, or None without an index
+        """
+        if not self.offline:
+            return None
+        return self.offline.reverse(lat, lng)
+
+
+class LookupCoalescer:
+    """
+    Memo of searches shared by the GeocodingTools of one GeocoderService.
+    
+    The first thread to ask for a query runs it; threads asking for the same
+    query meanwhile wait for that answer instead of sending their own. Answers
+    are kept (up to GeocodingTool.MEMO_SIZE), failures are not.
+    """
+    
+    def __init__(self, size: int = GeocodingTool.MEMO_SIZE):
+        self.size = size
+        self._lock = threading.Lock()
+        self._futures: Dict[Tuple[str, str], Future] = {}
+    
+    def get(self, key: Tuple[str, str], fetch: Callable[[], Optional[Tuple[float, float]]]
+            ) -> Tuple[Optional[Tuple[float, float]], bool]:
+        """
+        Answer for a query, running fetch() only if no other thread has or is getting it.
+        
+        Returns:
+            (coords or None, True if the answer came from another thread's fetch)
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                if len(self._futures) >= self.size:
+                    self._futures = {k: f for k, f in self._futures.items() if not f.done()}
+                future = Future()
+                self._futures[key] = future
+        if not owner:
+            return future.result(), True
+        
+        try:
+            coords = fetch()
+        except BaseException as e:
+            with self._lock:
+                self._futures.pop(key, None)
+            future.set_exception(e)
+            raise
+        future.set_result(coords)
+        return coords, False
+
+
+class GeocoderService:
+    """
+    Geocoder shared by every thread of the process.
+    
+    GeocodingTool keeps per-call state (last_level, SQLite connections), so
+    each thread gets its own tool. Their Nominatim searches all go through one
+    GeocoderPool, whose backends hand out request slots under a lock - the
+    rate limit holds however many threads geocode - and one LookupCoalescer,
+    so identical queries from different threads are sent once.
+    """
+    
+    def __init__(self, endpoints: List[str] = None, workers: int = None, use_cache: bool = True,
+                 backend: str = None):
+        """
+        Args:
+            endpoints: Nominatim backends as "URL@RATE" (default: GEOCODER_ENDPOINTS, else public Nominatim)
+            workers: Threads for geocode_many (default: 2 per request/second of budget)
+            use_cache: False to always ask Nominatim
+            backend: "auto", "offline" or "nominatim" (default: GEOCODER_BACKEND setting)
+        """
+        endpoints = GEOCODER_ENDPOINTS if endpoints is None else endpoints
+        self.pool = GeocoderPool([BackendSpec.parse(e) for e in endpoints])
+        self.workers = workers or max(1, min(32, int(round(self.pool.total_rate * 2))))
+        self.use_cache = use_cache
+        self.backend = backend or GEOCODER_BACKEND
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._tools: List[GeocodingTool] = []
+        self.coalescer = LookupCoalescer()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Fail early on a bad backend setting, on the creating thread
+        self.offline = self.tool().offline is not None
+    
+    def tool(self) -> GeocodingTool:
+        """The calling thread's GeocodingTool."""
+        tool = getattr(self._local, 'tool', None)
+        if tool is None:
+            # SQLite connections can't cross threads: one cache connection per tool
+            tool = GeocodingTool(cache=GeocodeCache() if self.use_cache else None, use_cache=self.use_cache,
+                                 backend=self.backend, transport=self.pool.search, coalescer=self.coalescer)
+            self._local.tool = tool
+            with self._lock:
+                self._tools.append(tool)
+        return tool
+    
+    @property
+    def last_level(self) -> Optional[str]:
+        """Strategy that answered this thread's last geocode()."""
+        return self.tool().last_level
+    
+    def geocode(self, address: str, city: str = None, county: str = None,
+                company_name: str = None) -> Optional[Tuple[float, float]]:
+        """Geocode on the calling thread (see GeocodingTool.geocode)."""
+        return self.tool().geocode(address, city, county, company_name)
+    
+    def _geocode_item(self, item: Dict) -> Tuple[Optional[Tuple[float, float]], Optional[str]]:
+        tool = self.tool()
+        coords = tool.geocode(item.get('address'), item.get('city'), item.get('county'), item.get('company_name'))
+        return coords, tool.last_level
+    
+    def geocode_many(self, items: Iterable[Dict]) -> List[Future]:
+        """
+        Geocode many addresses on the worker threads.
+        
+        Args:
+            items: Dicts with address and optionally city, county, company_name
+            
+        Returns:
+            One future per item, in input order, resolving to (coords or None, match level or None)
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='geocoder')
+        return [self._executor.submit(self._geocode_item, item) for item in items]
+    
+    def reverse(self, lat: float, lng: float) -> Optional[Dict]:
+        """Locality of a point from the offline index (see GeocodingTool.reverse)."""
+        return self.tool().reverse(lat, lng)
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        """GeocodingTool counters summed over all threads."""
+        with self._lock:
+            tools = list(self._tools)
+        return {key: sum(t.stats[key] for t in tools) for key in tools[0].stats}
+    
+    def cache_stats(self) -> Optional[Dict[str, int]]:
+        """Cache answers given to this process, or None without a cache."""
+        if not self.use_cache:
+            return None
+        with self._lock:
+            caches = [t.cache for t in self._tools]
+        return {key: sum(getattr(c, key) for c in caches) for key in ('hits', 'negative_hits', 'misses')}
+    
+    def close(self, cancel_pending: bool = False):
+        """
+        Stop the worker threads.
+        
+        Args:
+            cancel_pending: Drop queued geocode_many() work instead of finishing it
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=cancel_pending)
+                self._executor = None
+
+
+# Shared instance for the process
 _geocoder = None
+_geocoder_lock = threading.Lock()
 
-def get_geocoder() -> GeocodingTool:
+def get_geocoder() -> GeocoderService:
     global _geocoder
     if _geocoder is None:
-        _geocoder = GeocodingTool()
+        with _geocoder_lock:
+            if _geocoder is None:
+                _geocoder = GeocoderService()
     return _geocoder
 
 
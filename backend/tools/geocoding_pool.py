@@ -0,0 +1,165 @@
+"""
+Geocoding Pool - spreads batch geocoding over several Nominatim-compatible endpoints.
+
+The public Nominatim endpoint allows 1 request/second. Self-hosted mirrors
+(or a local stand-in server) allow much more, and several of them can be
+used at once. Each endpoint is a GeocoderBackend with:
+
+- its own rate budget: requests are given time slots 1/rate apart, so a
+  backend is never asked faster than it allows, however many threads use it
+- a health score (moving average of successes); failing backends get
+  fewer requests and are benched for a cooldown below MIN_HEALTH
+
+GeocoderPool.search() sends each request to the backend that can take it
+soonest (weighted by health) and retries on another backend when one fails.
+It is safe to call from many threads; requests share one keep-alive session,
+so connections (and TLS handshakes) are reused. The worker threads live in
+GeocoderService (tools/geocoding.py).
+"""
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_NOMINATIM = "https://nominatim.openstreetmap.org/search"
+
+# Health score: moving average of request outcomes (1 = all succeed)
+HEALTH_SMOOTHING = 0.2
+MIN_HEALTH = 0.25
+BENCH_SECONDS = 30.0
+MAX_ATTEMPTS = 3
+# Keep-alive connections kept open per backend host
+CONNECTIONS_PER_HOST = 32
+
+
+@dataclass
+class BackendSpec:
+    """Endpoint and request budget of one geocoding backend."""
+    url: str
+    rate: float = 1.0  # Requests per second
+
+    @classmethod
+    def parse(cls, text: str) -> 'BackendSpec':
+        """Parse "URL" or "URL@RATE" (e.g. http://localhost:8080/search@20)."""
+        url, sep, rate = text.strip().rpartition('@')
+        if sep:
+            try:
+                return cls(url=url, rate=float(rate))
+            except ValueError:
+                pass
+        return cls(url=text.strip())
+
+
+class GeocoderBackend:
+    """One Nominatim-compatible endpoint with a rate budget and a health score."""
+
+    def __init__(self, spec: BackendSpec, timeout: float = 10.0):
+        self.url = spec.url
+        self.rate = spec.rate
+        self.timeout = timeout
+        self.health = 1.0
+        self.benched_until = 0.0
+        self.requests = 0
+        self.errors = 0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def next_slot(self) -> float:
+        """Earliest time a new request may start."""
+        return max(self._next_slot, self.benched_until, time.monotonic())
+
+    def reserve(self) -> float:
+        """Claim the next request slot. Returns the monotonic time to start at."""
+        with self._lock:
+            slot = self.next_slot()
+            self._next_slot = slot + 1.0 / self.rate
+            return slot
+
+    def record(self, ok: bool):
+        with self._lock:
+            self.requests += 1
+            self.health = (1 - HEALTH_SMOOTHING) * self.health + HEALTH_SMOOTHING * (1.0 if ok else 0.0)
+            if not ok:
+                self.errors += 1
+                if self.health < MIN_HEALTH:
+                    self.benched_until = time.monotonic() + BENCH_SECONDS
+                    logger.warning(f"🩺 Geocoder {self.url} unhealthy ({self.health:.2f}) - benched {BENCH_SECONDS:.0f}s")
+                    # Come back half-trusted after the bench
+                    self.health = 0.5
+
+    def stats(self) -> Dict:
+        return {
+            'rate': self.rate,
+            'health': round(self.health, 2),
+            'requests': self.requests,
+            'errors': self.errors,
+        }
+
+
+class GeocoderPool:
+    """Routes Nominatim searches over several backends."""
+
+    def __init__(self, specs: Sequence[BackendSpec] = None):
+        """
+        Args:
+            specs: Backends to use (default: the public Nominatim endpoint at 1 req/s)
+        """
+        self.backends = [GeocoderBackend(spec) for spec in (specs or [BackendSpec(PUBLIC_NOMINATIM, 1.0)])]
+        self._choose_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.backends), pool_maxsize=CONNECTIONS_PER_HOST)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @property
+    def total_rate(self) -> float:
+        return sum(b.rate for b in self.backends)
+
+    def _choose(self, exclude: set) -> Tuple[GeocoderBackend, float]:
+        """Backend whose next free slot, weighted by health, comes first."""
+        with self._choose_lock:
+            candidates = [b for b in self.backends if b not in exclude] or self.backends
+            now = time.monotonic()
+            backend = min(candidates, key=lambda b: (b.next_slot() - now + 1.0 / b.rate) / max(b.health, 0.05))
+            return backend, backend.reserve()
+
+    def search(self, params: Dict, headers: Dict = None) -> List[Dict]:
+        """
+        Run one Nominatim search on the best available backend.
+
+        Returns:
+            Nominatim result list
+
+        Raises:
+            requests.RequestException: Every attempted backend failed
+        """
+        tried = set()
+        last_error = None
+        for _ in range(min(MAX_ATTEMPTS, len(self.backends) + 1)):
+            backend, slot = self._choose(tried)
+            delay = slot - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                response = self.session.get(backend.url, params=params, headers=headers, timeout=backend.timeout)
+                if response.status_code == 429 or response.status_code >= 500:
+                    raise requests.HTTPError(f"{response.status_code} from {backend.url}", response=response)
+                response.raise_for_status()
+                results = response.json()
+                backend.record(True)
+                return results
+            except (requests.RequestException, ValueError) as e:
+                backend.record(False)
+                tried.add(backend)
+                last_error = e
+                logger.debug(f"Geocoder {backend.url} failed: {e}")
+        raise last_error if isinstance(last_error, requests.RequestException) else requests.RequestException(str(last_error))
+
+    def stats(self) -> Dict[str, Dict]:
+        return {b.url: b.stats() for b in self.backends}
@@ -0,0 +1,527 @@
+"""
+Job Ledger - SQLite-backed job table for Romania-wide scrapes.
+
+One row per (county, city, query) search job, holding its status, attempt
+count, lease and yield. Replaces the old scrape_progress.json blob:
+- status/resume decisions are indexed lookups instead of list scans
+- in-flight (leased) and failed-with-retries jobs are representable
+- several processes (or machines sharing the file) can claim cities atomically
+
+Job lifecycle: pending -> leased -> done
+                                 -> failed (re-claimable until max_attempts)
+A lease that expires (worker died) makes the job claimable again.
+
+Cities are claimed highest priority first (see tools/city_scheduler.py), then
+in file order. Per-query yield of every finished job is also accumulated in
+city_history, which survives reset() so later runs can be scheduled by it.
+The viewport and result names of every search are kept in `searches` for
+coverage planning (see tools/coverage.py); jobs skipped because their area
+was already covered are marked done with a skip_reason.
+"""
+import json
+import os
+import time
+import socket
+import sqlite3
+import logging
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "scrape_jobs.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    county TEXT NOT NULL,
+    city TEXT NOT NULL,
+    query TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    started_at REAL,
+    finished_at REAL,
+    duration_s REAL,
+    found INTEGER NOT NULL DEFAULT 0,
+    details INTEGER NOT NULL DEFAULT 0,
+    saved INTEGER NOT NULL DEFAULT 0,
+    filtered INTEGER NOT NULL DEFAULT 0,
+    duplicates INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    skip_reason TEXT,
+    updated_at REAL,
+    PRIMARY KEY (county, city, query)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, lease_expires_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_county ON jobs(county, status);
+CREATE INDEX IF NOT EXISTS idx_jobs_seq ON jobs(seq);
+CREATE TABLE IF NOT EXISTS city_history (
+    county TEXT NOT NULL,
+    city TEXT NOT NULL,
+    query TEXT NOT NULL,
+    runs INTEGER NOT NULL DEFAULT 0,
+    matched INTEGER NOT NULL DEFAULT 0,
+    duration_s REAL NOT NULL DEFAULT 0,
+    updated_at REAL,
+    PRIMARY KEY (county, city, query)
+);
+CREATE TABLE IF NOT EXISTS searches (
+    county TEXT NOT NULL,
+    city TEXT NOT NULL,
+    query TEXT NOT NULL,
+    lat REAL NOT NULL,
+    lng REAL NOT NULL,
+    zoom REAL NOT NULL,
+    results INTEGER NOT NULL DEFAULT 0,
+    capped INTEGER NOT NULL DEFAULT 0,
+    names TEXT,
+    searched_at REAL,
+    PRIMARY KEY (county, city, query)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# A job row is claimable when pending, failed with retries left, or its lease expired
+CLAIMABLE = """
+    (status = 'pending'
+     OR (status = 'failed' AND attempts < :max_attempts)
+     OR (status = 'leased' AND lease_expires_at < :now))
+"""
+
+
+def default_owner() -> str:
+    """Lease owner id: host + pid, unique per worker process."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobLedger:
+    """
+    Tracks scrape jobs in SQLite. Safe to use from several processes at once:
+    each process opens its own connection and claims go through BEGIN IMMEDIATE.
+    """
+
+    def __init__(self, db_path: Path = None, lease_seconds: float = 3600, max_attempts: int = 3):
+        """
+        Args:
+            db_path: SQLite file (default: data/scrape_jobs.sqlite)
+            lease_seconds: How long a claimed city stays reserved without a renewal
+            max_attempts: Give up on a job after this many failed attempts
+        """
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Autocommit mode; multi-statement changes use explicit transactions
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def close(self):
+        self.conn.close()
+
+    def _migrate(self):
+        """Add columns introduced after a ledger file was created."""
+        columns = {r['name'] for r in self.conn.execute("PRAGMA table_info(jobs)")}
+        if 'priority' not in columns:
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN priority REAL NOT NULL DEFAULT 0")
+        if 'details' not in columns:
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN details INTEGER NOT NULL DEFAULT 0")
+        if 'skip_reason' not in columns:
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN skip_reason TEXT")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs(finished_at)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_priority ON jobs(priority DESC, seq)")
+
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+
+    def ensure_jobs(self, county: str, cities: List[str], queries: List[str]):
+        """Create pending rows for every (city, query) of a county that is not tracked yet."""
+        now = time.time()
+        with self._transaction():
+            next_seq = self.conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM jobs").fetchone()[0]
+            rows = []
+            for city in cities:
+                for query in queries:
+                    rows.append((county, city, query, next_seq, now))
+                    next_seq += 1
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO jobs (county, city, query, seq, updated_at) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def reset(self, counties: List[str] = None):
+        """Start over: every job (optionally only some counties) back to pending with zeroed stats."""
+        sql = """UPDATE jobs SET status = 'pending', attempts = 0, lease_owner = NULL,
+                 lease_expires_at = NULL, started_at = NULL, finished_at = NULL, duration_s = NULL,
+                 found = 0, details = 0, saved = 0, filtered = 0, duplicates = 0, last_error = NULL,
+                 skip_reason = NULL, updated_at = ?"""
+        params = [time.time()]
+        if counties:
+            sql += f" WHERE county IN ({','.join('?' * len(counties))})"
+            params.extend(counties)
+        self.conn.execute(sql, params)
+
+        # Imported legacy totals belong to the run being thrown away
+        legacy_stats = json.loads(self.get_meta('legacy_stats') or '{}')
+        if legacy_stats:
+            kept = {c: n for c, n in legacy_stats.items() if counties and c not in counties}
+            self.set_meta('legacy_stats', json.dumps(kept, ensure_ascii=False))
+        self.set_meta('started_at', datetime.now().isoformat())
+
+    def import_legacy_progress(self, progress_file: Path, queries: List[str]) -> bool:
+        """
+        One-time migration from scrape_progress.json: cities listed there are marked done.
+        Returns True if anything was imported.
+        """
+        progress_file = Path(progress_file)
+        if not progress_file.exists() or self.get_meta('legacy_imported'):
+            return False
+
+        with open(progress_file, 'r', encoding='utf-8') as f:
+            progress = json.load(f)
+
+        now = time.time()
+        for county, cities in progress.get('completed_cities', {}).items():
+            self.ensure_jobs(county, cities, queries)
+            self.conn.executemany(
+                "UPDATE jobs SET status = 'done', finished_at = ?, updated_at = ? WHERE county = ? AND city = ?",
+                [(now, now, county, city) for city in cities]
+            )
+        # Per-county totals have no per-city breakdown - keep them for --status
+        self.set_meta('legacy_stats', json.dumps(progress.get('stats', {}), ensure_ascii=False))
+        if progress.get('started_at'):
+            self.set_meta('started_at', progress['started_at'])
+        self.set_meta('legacy_imported', datetime.now().isoformat())
+        logger.info(f"📥 Imported legacy progress from {progress_file.name}")
+        return True
+
+    # ------------------------------------------------------------------
+    # Claiming and recording jobs
+    # ------------------------------------------------------------------
+
+    def claim_city(self, owner: str = None, counties: List[str] = None) -> Optional[Tuple[str, str, List[str]]]:
+        """
+        Atomically lease all claimable query jobs of the next city.
+
+        Args:
+            owner: Lease owner id (default: host:pid)
+            counties: Only claim cities from these counties
+
+        Returns:
+            (county, city, [queries to run]) or None if nothing is claimable
+        """
+        owner = owner or default_owner()
+        now = time.time()
+        params = {'max_attempts': self.max_attempts, 'now': now}
+
+        county_filter = ""
+        if counties:
+            placeholders = ','.join(f":c{i}" for i in range(len(counties)))
+            county_filter = f" AND county IN ({placeholders})"
+            params.update({f"c{i}": c for i, c in enumerate(counties)})
+
+        with self._transaction():
+            row = self.conn.execute(
+                f"SELECT county, city FROM jobs WHERE {CLAIMABLE}{county_filter} "
+                f"ORDER BY priority DESC, seq LIMIT 1",
+                params
+            ).fetchone()
+            if row is None:
+                return None
+
+            county, city = row['county'], row['city']
+            rows = self.conn.execute(
+                f"SELECT query FROM jobs WHERE county = :county AND city = :city AND {CLAIMABLE} ORDER BY seq",
+                {**params, 'county': county, 'city': city}
+            ).fetchall()
+            queries = [r['query'] for r in rows]
+
+            self.conn.executemany(
+                """UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?,
+                   lease_expires_at = ?, started_at = ?, last_error = NULL, updated_at = ?
+                   WHERE county = ? AND city = ? AND query = ?""",
+                [(owner, now + self.lease_seconds, now, now, county, city, q) for q in queries]
+            )
+        return county, city, queries
+
+    def renew_lease(self, county: str, city: str, owner: str = None):
+        """Extend the lease on a city that is still being worked on."""
+        now = time.time()
+        self.conn.execute(
+            """UPDATE jobs SET lease_expires_at = ?, updated_at = ?
+               WHERE county = ? AND city = ? AND status = 'leased' AND lease_owner = ?""",
+            (now + self.lease_seconds, now, county, city, owner or default_owner())
+        )
+
+    def complete_query(self, county: str, city: str, query: str, found: int = 0, filtered: int = 0,
+                       saved: int = 0, duplicates: int = 0, duration: float = None, details: int = None):
+        """
+        Mark a query job done and record its yield. saved/duplicates are added to existing counts.
+        details is the number of business panels opened (defaults to found).
+        """
+        now = time.time()
+        with self._transaction():
+            self.conn.execute(
+                """UPDATE jobs SET status = 'done', lease_owner = NULL, lease_expires_at = NULL,
+                   finished_at = ?, duration_s = ?, found = ?, details = ?, filtered = ?,
+                   saved = saved + ?, duplicates = duplicates + ?, updated_at = ?
+                   WHERE county = ? AND city = ? AND query = ?""",
+                (now, duration, found, found if details is None else details, filtered,
+                 saved, duplicates, now, county, city, query)
+            )
+            # Businesses in the right place, whether or not they were new this run
+            self.conn.execute(
+                """INSERT INTO city_history (county, city, query, runs, matched, duration_s, updated_at)
+                   VALUES (?, ?, ?, 1, ?, ?, ?)
+                   ON CONFLICT (county, city, query) DO UPDATE SET
+                       runs = runs + 1, matched = matched + excluded.matched,
+                       duration_s = duration_s + excluded.duration_s, updated_at = excluded.updated_at""",
+                (county, city, query, max(found - filtered, 0), duration or 0, now)
+            )
+
+    def skip_query(self, county: str, city: str, query: str, reason: str):
+        """Mark a query job done without searching (its area is already covered)."""
+        now = time.time()
+        self.conn.execute(
+            """UPDATE jobs SET status = 'done', lease_owner = NULL, lease_expires_at = NULL,
+               finished_at = ?, duration_s = 0, skip_reason = ?, updated_at = ?
+               WHERE county = ? AND city = ? AND query = ?""",
+            (now, reason, now, county, city, query)
+        )
+
+    def record_search(self, county: str, city: str, query: str, lat: float, lng: float, zoom: float,
+                      names: List[str], capped: bool = False):
+        """Remember the viewport and result names of a search (kept across resets)."""
+        self.conn.execute(
+            """INSERT OR REPLACE INTO searches
+               (county, city, query, lat, lng, zoom, results, capped, names, searched_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (county, city, query, lat, lng, zoom, len(names), int(capped),
+             json.dumps(names, ensure_ascii=False), time.time())
+        )
+
+    def record_saves(self, county: str, city: str, query: str, saved: int = 0, duplicates: int = 0):
+        """Add saved/duplicate counts to a job (used by the single writer in multi-worker mode)."""
+        self.conn.execute(
+            "UPDATE jobs SET saved = saved + ?, duplicates = duplicates + ?, updated_at = ? "
+            "WHERE county = ? AND city = ? AND query = ?",
+            (saved, duplicates, time.time(), county, city, query)
+        )
+
+    def fail_query(self, county: str, city: str, query: str, error: str):
+        """Mark a query job failed; it is retried until max_attempts."""
+        now = time.time()
+        self.conn.execute(
+            """UPDATE jobs SET status = 'failed', lease_owner = NULL, lease_expires_at = NULL,
+               finished_at = ?, last_error = ?, updated_at = ?
+               WHERE county = ? AND city = ? AND query = ?""",
+            (now, str(error)[:500], now, county, city, query)
+        )
+
+    def release_city(self, county: str, city: str, owner: str = None):
+        """Give back an unfinished lease (graceful stop) without counting it as an attempt."""
+        self.conn.execute(
+            """UPDATE jobs SET status = 'pending', attempts = MAX(attempts - 1, 0), lease_owner = NULL,
+               lease_expires_at = NULL, updated_at = ?
+               WHERE county = ? AND city = ? AND status = 'leased' AND lease_owner = ?""",
+            (time.time(), county, city, owner or default_owner())
+        )
+
+    def set_priorities(self, priorities: Dict[Tuple[str, str], float]):
+        """Set the claim priority of cities ({(county, city): priority}, higher first)."""
+        now = time.time()
+        with self._transaction():
+            self.conn.executemany(
+                "UPDATE jobs SET priority = ?, updated_at = ? WHERE county = ? AND city = ?",
+                [(priority, now, county, city) for (county, city), priority in priorities.items()]
+            )
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def city_history(self) -> Dict[Tuple[str, str], Dict]:
+        """
+        Yield of previous runs per city: {(county, city): {'runs', 'matched', 'duration_s'}},
+        where runs/matched/duration are averaged over queries to one "city run".
+        """
+        history = {}
+        for r in self.conn.execute(
+            """SELECT county, city, MIN(runs) AS runs,
+                      SUM(matched * 1.0 / runs) AS matched, SUM(duration_s / runs) AS duration_s
+               FROM city_history WHERE runs > 0 GROUP BY county, city"""
+        ):
+            history[(r['county'], r['city'])] = {
+                'runs': r['runs'],
+                'matched': r['matched'],
+                'duration_s': r['duration_s'],
+            }
+        return history
+
+    def county_searches(self, county: str) -> List[Dict]:
+        """Searches of the county whose job finished in the current run (not skipped)."""
+        rows = self.conn.execute(
+            """SELECT s.* FROM searches s
+               JOIN jobs j ON j.county = s.county AND j.city = s.city AND j.query = s.query
+               WHERE s.county = ? AND j.status = 'done' AND j.skip_reason IS NULL""",
+            (county,)
+        )
+        return [dict(r, names=json.loads(r['names'] or '[]'), capped=bool(r['capped'])) for r in rows]
+
+    def last_search(self, county: str, city: str) -> Optional[Dict]:
+        """Most recent recorded search of a city, from any run."""
+        row = self.conn.execute(
+            "SELECT lat, lng, zoom FROM searches WHERE county = ? AND city = ? ORDER BY searched_at DESC LIMIT 1",
+            (county, city)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def skipped_jobs(self) -> int:
+        """Query jobs skipped as already covered."""
+        return self.conn.execute("SELECT COUNT(*) FROM jobs WHERE skip_reason IS NOT NULL").fetchone()[0]
+
+    def city_done(self, county: str, city: str) -> bool:
+        """True when no query job of the city is left to run."""
+        return self._unfinished_count("county = ? AND city = ?", (county, city)) == 0
+
+    def has_county(self, county: str) -> bool:
+        """True if the ledger has jobs for a county."""
+        return self.conn.execute("SELECT 1 FROM jobs WHERE county = ? LIMIT 1", (county,)).fetchone() is not None
+
+    def county_done(self, county: str) -> bool:
+        """True when the county is tracked and all its jobs are finished (done or out of retries)."""
+        return self.has_county(county) and self._unfinished_count("county = ?", (county,)) == 0
+
+    def _unfinished_count(self, where: str, params: tuple) -> int:
+        return self.conn.execute(
+            f"""SELECT COUNT(*) FROM jobs WHERE {where}
+                AND NOT (status = 'done' OR (status = 'failed' AND attempts >= ?))""",
+            (*params, self.max_attempts)
+        ).fetchone()[0]
+
+    def completed_cities(self, county: str) -> List[str]:
+        """Cities of a county whose jobs are all finished."""
+        rows = self.conn.execute(
+            """SELECT city FROM jobs WHERE county = ? GROUP BY city
+               HAVING SUM(CASE WHEN status = 'done' OR (status = 'failed' AND attempts >= ?)
+                          THEN 0 ELSE 1 END) = 0
+               ORDER BY MIN(seq)""",
+            (county, self.max_attempts)
+        ).fetchall()
+        return [r['city'] for r in rows]
+
+    def county_saved(self, county: str) -> int:
+        """Businesses saved for a county across its jobs."""
+        return self.conn.execute("SELECT COALESCE(SUM(saved), 0) FROM jobs WHERE county = ?", (county,)).fetchone()[0]
+
+    def finished_jobs(self, since: float) -> List[Dict]:
+        """Jobs completed at or after a timestamp (for rolling metrics)."""
+        return [dict(r) for r in self.conn.execute(
+            """SELECT county, city, query, started_at, finished_at, duration_s,
+                      found, details, saved, filtered, duplicates
+               FROM jobs WHERE status = 'done' AND finished_at >= ? ORDER BY finished_at""",
+            (since,)
+        )]
+
+    def county_breakdown(self) -> List[Dict]:
+        """Per-county city progress and yield counters, in ledger order."""
+        return [dict(r) for r in self.conn.execute(
+            """SELECT county, COUNT(*) AS cities, SUM(done) AS cities_done, SUM(found) AS found,
+                      SUM(saved) AS saved, SUM(filtered) AS filtered, SUM(duplicates) AS duplicates
+               FROM (SELECT county, city, MIN(seq) AS seq, SUM(found) AS found, SUM(saved) AS saved,
+                            SUM(filtered) AS filtered, SUM(duplicates) AS duplicates,
+                            MIN(CASE WHEN status = 'done' OR (status = 'failed' AND attempts >= ?)
+                                THEN 1 ELSE 0 END) AS done
+                     FROM jobs GROUP BY county, city)
+               GROUP BY county ORDER BY MIN(seq)""",
+            (self.max_attempts,)
+        )]
+
+    def summary(self) -> Dict:
+        """Aggregate status for --status and the workflow."""
+        by_status = {r['status']: r['n'] for r in self.conn.execute(
+            "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")}
+
+        counties = []
+        for r in self.conn.execute(
+            """SELECT county, COUNT(DISTINCT city) AS cities, SUM(saved) AS saved,
+                      SUM(CASE WHEN status = 'done' OR (status = 'failed' AND attempts >= :max) THEN 0 ELSE 1 END) AS open_jobs
+               FROM jobs GROUP BY county ORDER BY MIN(seq)""",
+            {'max': self.max_attempts}
+        ):
+            counties.append({
+                'county': r['county'],
+                'cities': r['cities'],
+                'saved': r['saved'] or 0,
+                'done': r['open_jobs'] == 0,
+            })
+
+        in_flight = [dict(r) for r in self.conn.execute(
+            """SELECT county, city, lease_owner, MIN(lease_expires_at) AS lease_expires_at
+               FROM jobs WHERE status = 'leased' AND lease_expires_at >= ?
+               GROUP BY county, city, lease_owner""",
+            (time.time(),)
+        )]
+
+        failed = [dict(r) for r in self.conn.execute(
+            "SELECT county, city, query, attempts, last_error FROM jobs WHERE status = 'failed' ORDER BY seq"
+        )]
+
+        last_update = self.conn.execute("SELECT MAX(updated_at) FROM jobs").fetchone()[0]
+        legacy_stats = json.loads(self.get_meta('legacy_stats') or '{}')
+        for c in counties:
+            c['saved'] += legacy_stats.get(c['county'], 0)
+
+        return {
+            'started_at': self.get_meta('started_at'),
+            'last_updated': datetime.fromtimestamp(last_update).isoformat() if last_update else None,
+            'jobs_by_status': by_status,
+            'total_businesses': sum(c['saved'] for c in counties),
+            'counties': counties,
+            'completed_counties': [c['county'] for c in counties if c['done']],
+            'in_flight': in_flight,
+            'failed': failed,
+        }
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+
+    def set_meta(self, key: str, value: str):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _transaction(self):
+        return _Transaction(self.conn)
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK, so claims take the write lock up front."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
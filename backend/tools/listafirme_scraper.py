@@ -2,6 +2,8 @@
 CUI Lookup Tool - Find company CUI and official name using Firecrawl + listafirme.ro
 
 Uses Firecrawl to scrape listafirme.ro search results and get company details.
+Lookups by name (+ city) and by CUI are kept in the local company registry
+(tools/company_registry.py), so a known company costs no Firecrawl call.
 """
 import re
 import time
@@ -10,8 +12,10 @@ from typing import Optional, List, Tuple
 # Import Firecrawl tool
 try:
     from tools.firecrawl_extractor import FirecrawlExtractorTool
+    from tools.company_registry import get_company_registry
 except ImportError:
     from firecrawl_extractor import FirecrawlExtractorTool
+    from company_registry import get_company_registry
 
 
 class CUILookupTool:
@@ -19,9 +23,14 @@ class CUILookupTool:
     
     BASE_URL = "https://www.listafirme.ro"
     
-    def __init__(self):
+    def __init__(self, use_registry: bool = True):
+        """
+        Args:
+            use_registry: Answer from / store into the local company registry
+        """
         self.firecrawl = FirecrawlExtractorTool()
         self._last_request_time = 0
+        self.registry = get_company_registry() if use_registry else None
     
     def _rate_limit(self, min_delay: float = 1.5):
         """Polite delay between requests."""
@@ -39,8 +48,12 @@ class CUILookupTool:
             city: Optional city to narrow results
             
         Returns:
-            List of matching companies with CUI
+            List of matching companies with CUI (empty if the search failed)
         """
+        return self._search(name, city) or []
+    
+    def _search(self, name: str, city: Optional[str] = None) -> Optional[List[dict]]:
+        """search_company, but None when the search itself failed (nothing to remember)."""
         self._rate_limit()
         
         # Build search URL - search listafirme.ro directly
@@ -53,7 +66,7 @@ class CUILookupTool:
         
         if not result or not result.get('success'):
             print(f"Search failed: {result}")
-            return []
+            return None
         
         # Parse results from markdown
         return self._parse_search_results(result.get('markdown', ''))
@@ -107,6 +120,11 @@ class CUILookupTool:
         Returns:
             Company details dict or None
         """
+        if self.registry:
+            cached = self.registry.get('listafirme', cui=cui)
+            if cached:
+                return cached['payload']
+        
         self._rate_limit()
         
         # Search by CUI
@@ -127,6 +145,8 @@ class CUILookupTool:
             company_url = f"{self.BASE_URL}/{url_match.group(1)}/"
             return self.get_company_details(company_url, cui)
         
+        if self.registry:
+            self.registry.put('listafirme', None, cui=cui)
         return None
     
     def get_company_details(self, url: str, cui: str = None) -> Optional[dict]:
@@ -140,6 +160,11 @@ class CUILookupTool:
         Returns:
             Company details dict
         """
+        if self.registry and cui:
+            cached = self.registry.get('listafirme', cui=cui)
+            if cached and cached['found']:
+                return cached['payload']
+        
         self._rate_limit()
         
         print(f"Fetching company details from: {url}")
@@ -207,6 +232,8 @@ class CUILookupTool:
         if caen_desc_match:
             company['caen_description'] = caen_desc_match.group(1).strip()
         
+        if self.registry and company['cui']:
+            self.registry.put('listafirme', company, cui=company['cui'], name=company['name'])
         return company
     
     def lookup_company(self, name: str, city: Optional[str] = None) -> Optional[dict]:
@@ -220,12 +247,30 @@ class CUILookupTool:
         Returns:
             Dict with cui, official_name, city, county, caen, etc.
         """
+        if self.registry:
+            cached = self.registry.get('listafirme', name=name, city=city)
+            if cached:
+                return cached['payload']
+        
+        result, complete = self._lookup_company(name, city)
+        # Failed searches and summaries without details are not answers worth keeping
+        if self.registry and complete:
+            self.registry.put('listafirme', result, name=name, city=city)
+        return result
+    
+    def _lookup_company(self, name: str, city: Optional[str] = None) -> Tuple[Optional[dict], bool]:
+        """
+        Returns:
+            (result, complete) - complete is False if a request failed on the way
+        """
         # First search for the company
-        results = self.search_company(name, city)
+        results = self._search(name, city)
+        if results is None:
+            return None, False
         
         if not results:
             print(f"No results found for: {name}")
-            return None
+            return None, True
         
         # Find best match
         search_name = self._normalize(name)
@@ -249,7 +294,7 @@ class CUILookupTool:
         details = self.get_company_details(best_match['url'], best_match['cui'])
         
         if details:
-            return {
+            return ({
                 'cui': details['cui'],
                 'official_name': details['name'],
                 'city': details['city'],
@@ -259,14 +304,15 @@ class CUILookupTool:
                 'caen_description': details['caen_description'],
                 'source_url': best_match['url'],
                 'match_score': best_score
-            }
+            }, True)
         
-        return {
+        # Details page failed - search summary only
+        return ({
             'cui': best_match['cui'],
             'official_name': best_match['name'],
             'source_url': best_match['url'],
             'match_score': best_score
-        }
+        }, False)
     
     def _normalize(self, name: str) -> str:
         """Normalize company name for comparison."""
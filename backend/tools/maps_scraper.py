@@ -7,19 +7,30 @@ import re
 import time
 import logging
 from pathlib import Path
+from datetime import datetime
 from typing import List, Dict, Optional
 from dataclasses import dataclass, asdict
 from urllib.parse import urlparse, quote
 
 from playwright.sync_api import sync_playwright, Page, Browser, TimeoutError as PlaywrightTimeout
 
+from tools.pacing import AdaptivePacer, ThrottledError, SEARCH_COST, DETAIL_COST, THROTTLE_MARKERS
+from tools.coverage import Viewport, parse_viewport
+
 # Import geocoding for coordinate fallback
 try:
-    from tools.geocoding import GeocodingTool
+    from tools.geocoding import get_geocoder
     GEOCODING_AVAILABLE = True
 except ImportError:
     GEOCODING_AVAILABLE = False
 
+# Reverse geocoding: city/county from boundary polygons when a business has a pin
+try:
+    from tools.reverse_geocoder import get_reverse_geocoder
+    REVERSE_GEOCODING_AVAILABLE = True
+except ImportError:
+    REVERSE_GEOCODING_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # City coordinates for geo-locked Google Maps searches
@@ -250,6 +261,7 @@ class MapsBusinessData:
     latitude: Optional[float] = None
     longitude: Optional[float] = None
     place_id: Optional[str] = None
+    place_url: Optional[str] = None  # Direct link to the place panel (used by refresh_place)
     # Coordinate quality: 'exact' (street number), 'approximate' (street only), 'none' (failed)
     coord_quality: Optional[str] = None
     # Website-extracted data
@@ -257,6 +269,12 @@ class MapsBusinessData:
     fiscal_code: Optional[str] = None
     description: Optional[str] = None
     services: List[str] = None
+    # Freshness tracking (see tools/freshness.py and refresh_daemon.py)
+    last_verified_at: Optional[str] = None  # ISO time the listing was last seen on Maps
+    last_changed_at: Optional[str] = None   # ISO time a re-check last found a change
+    last_checked_at: Optional[str] = None   # ISO time of the last re-check, found or not
+    volatility: float = 0.0                 # Decaying score of how often re-checks find changes
+    refresh_misses: int = 0                 # Consecutive re-checks that could not find the listing
     
     def __post_init__(self):
         if self.services is None:
@@ -269,7 +287,11 @@ class GoogleMapsScraper:
     Extracts comprehensive info from business panels and optionally their websites.
     """
     
-    def __init__(self, headless: bool = True, slow_mo: int = 100, geocode: bool = True):
+    # Search attempts when Google shows its "unusual traffic" page
+    THROTTLE_RETRIES = 3
+    
+    def __init__(self, headless: bool = True, slow_mo: int = 100, geocode: bool = True,
+                 pacer: AdaptivePacer = None):
         """
         Initialize the scraper.
         
@@ -278,10 +300,14 @@ class GoogleMapsScraper:
             slow_mo: Slow down actions by this many ms (helps avoid detection)
             geocode: If True, geocode addresses during extraction (slow but accurate).
                      If False, skip geocoding for speed - run batch geocoding later.
+            pacer: Shared request pacer (default: a new AdaptivePacer for this browser)
         """
         self.headless = headless
         self.slow_mo = slow_mo
         self.geocode = geocode
+        self.pacer = pacer or AdaptivePacer()
+        self._consent_accepted = False  # A second consent prompt in one session is a warning sign
+        self.last_search: Optional[Dict] = None  # Viewport and result names of the last search (coverage tracking)
         self.browser: Optional[Browser] = None
         self.page: Optional[Page] = None
         self.playwright = None
@@ -374,6 +400,9 @@ class GoogleMapsScraper:
                     if button.is_visible(timeout=2000):
                         button.click()
                         logger.info("Accepted cookie consent")
+                        if self._consent_accepted:
+                            self.pacer.record_consent_reprompt()
+                        self._consent_accepted = True
                         time.sleep(1)
                         return True
                 except:
@@ -383,6 +412,39 @@ class GoogleMapsScraper:
             logger.debug(f"No consent popup or error: {e}")
             return False
     
+    def _is_throttled(self) -> bool:
+        """True if Google answered with its rate-limit / captcha page instead of Maps."""
+        try:
+            if '/sorry/' in self.page.url:
+                return True
+            body = (self.page.locator('body').inner_text(timeout=2000) or '')[:3000].lower()
+            return any(marker in body for marker in THROTTLE_MARKERS)
+        except Exception:
+            return False
+    
+    def _paced_goto(self, url: str, cost: float = SEARCH_COST, timeout: int = 30000):
+        """
+        Navigate once the pacer allows it, feeding load time and throttle pages back to it.
+        Retries with backoff while Google shows "unusual traffic".
+        
+        Raises:
+            ThrottledError: Still throttled after THROTTLE_RETRIES attempts
+        """
+        for attempt in range(self.THROTTLE_RETRIES):
+            self.pacer.acquire(cost)
+            started = time.time()
+            self.page.goto(url, wait_until='domcontentloaded', timeout=timeout)
+            latency = time.time() - started
+            
+            # Handle consent popup
+            self._handle_consent()
+            
+            if not self._is_throttled():
+                self.pacer.record_response(latency)
+                return
+            self.pacer.record_throttle("unusual traffic page")
+        raise ThrottledError(f"Google keeps showing unusual traffic page for {url}")
+    
     def search(self, query: str, location: str, skip_names: set = None, max_results: int = None) -> List[MapsBusinessData]:
         """
         Search Google Maps and extract all business data.
@@ -417,16 +479,14 @@ class GoogleMapsScraper:
             url = f"https://www.google.com/maps/search/{search_term.replace(' ', '+')}"
             logger.warning(f"City '{city_name}' not in coordinates database, using text search: {search_term}")
         
-        self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
-        
-        # Handle consent popup
-        self._handle_consent()
+        self._paced_goto(url)
         
         # Wait for results to load (give Maps time to render)
         time.sleep(2.0)  # Reduced from 4s
         
         # Check if Google Maps opened a single business directly (no list)
         single_business = self._check_for_single_result()
+        scroll_limit = None
         if single_business:
             logger.info("Google Maps showed single business directly")
             businesses = [single_business]
@@ -442,6 +502,17 @@ class GoogleMapsScraper:
         
         logger.info(f"Found {len(businesses)} businesses")
         
+        # Remember where Maps searched and what it listed, so overlapping towns can be skipped.
+        # Text searches get their viewport from Maps; geo-locked ones keep ours.
+        viewport = parse_viewport(self.page.url)
+        if viewport is None and coords:
+            viewport = Viewport(coords['lat'], coords['lng'], coords['zoom'])
+        self.last_search = {
+            'viewport': viewport,
+            'names': [normalize_name(b.get('name', '')) for b in businesses],
+            'capped': scroll_limit is not None and len(businesses) >= scroll_limit,
+        }
+        
         # Major Romanian city names and neighborhoods for early filtering
         # If searching in one city but business name/card mentions another, likely wrong location
         MAJOR_CITIES = [
@@ -548,10 +619,10 @@ class GoogleMapsScraper:
             
             logger.info(f"Extracting details for [{i+1}/{len(businesses)}]: {name}")
             try:
+                self.pacer.acquire(DETAIL_COST)
                 detailed = self._extract_business_details(basic_info)
                 if detailed:
                     detailed_businesses.append(detailed)
-                time.sleep(0.3)  # Reduced from 1s - fast mode
             except Exception as e:
                 logger.error(f"Error extracting details: {e}")
                 continue
@@ -716,6 +787,7 @@ class GoogleMapsScraper:
             if card and not is_single_result:
                 # Click and wait for the correct panel to load
                 # Try up to 2 times if the panel doesn't show the right business
+                click_started = time.time()
                 for attempt in range(2):
                     card.click()
                     time.sleep(0.5)  # Initial wait for click to register
@@ -756,202 +828,351 @@ class GoogleMapsScraper:
                             pass
                         time.sleep(0.3)
                 
-                # If still not loaded after retries, wait longer and hope for the best
-                if not panel_loaded:
+                # Panel load time is the pacer's health signal for detail extraction
+                if panel_loaded:
+                    self.pacer.record_response(time.time() - click_started)
+                elif self._is_throttled():
+                    self.pacer.record_throttle("unusual traffic in panel")
+                    return None
+                else:
+                    # Counts as a slow response
+                    self.pacer.record_response(time.time() - click_started)
+                    # If still not loaded after retries, wait longer and hope for the best
                     time.sleep(2.0)
             
-            # Wait for details panel to load
-            self.page.wait_for_selector('[role="main"]', timeout=5000)
+            return self._extract_panel(basic_info)
             
-            # Wait for address element to be populated (confirms full panel load)
+        except Exception as e:
+            logger.error(f"Error extracting business details: {e}")
+            return MapsBusinessData(name=basic_info.get('name', 'Unknown'))
+    
+    def _extract_panel(self, basic_info: Dict) -> MapsBusinessData:
+        """
+        Extract all details from the business panel that is currently open.
+        
+        Args:
+            basic_info: Card data (name, rating, category) to start from
+        """
+        # Wait for details panel to load
+        self.page.wait_for_selector('[role="main"]', timeout=5000)
+        
+        # Wait for address element to be populated (confirms full panel load)
+        try:
+            for _ in range(10):  # Max 2 seconds
+                addr_elem = self.page.locator('[data-item-id="address"] .Io6YTe').first
+                if addr_elem.count() > 0 and addr_elem.text_content():
+                    break
+                time.sleep(0.2)
+        except:
+            pass
+        
+        data = MapsBusinessData(
+            name=basic_info.get('name', 'Unknown'),
+            rating=basic_info.get('rating'),
+            category=basic_info.get('category'),
+            last_verified_at=datetime.now().isoformat(timespec='seconds')
+        )
+        
+        # Extract place_id from URL first (this is reliable)
+        try:
+            url = self.page.url
+            place_id_match = re.search(r'!1s(0x[0-9a-fA-F]+:[0-9a-fA-Fx]+)', url)
+            if place_id_match:
+                data.place_id = place_id_match.group(1)
+            else:
+                place_match = re.search(r'/data=.*?!1s([^!]+)', url)
+                if place_match:
+                    data.place_id = place_match.group(1)
+            if '/maps/place/' in url:
+                data.place_url = url.split('?')[0]
+        except:
+            pass
+        
+        # Extract address FIRST - we need this for geocoding
+        try:
+            address_button = self.page.locator('[data-item-id="address"] .Io6YTe').first
+            if address_button.count() > 0:
+                full_address = address_button.text_content()
+                data.address = full_address
+                
+                # Parse city/county from address
+                self._parse_address(data, full_address)
+        except:
+            pass
+        
+        # Extract coordinates: the place's own pin from the URL data (!3d<lat>!4d<lng>) is exact;
+        # otherwise geocode the address (skipped if self.geocode=False - batch geocode later)
+        coord_method = None
+        pinned = False
+        
+        try:
+            pin_match = re.search(r'!3d(-?\d+\.\d+)!4d(-?\d+\.\d+)', self.page.url)
+            if pin_match:
+                data.latitude = float(pin_match.group(1))
+                data.longitude = float(pin_match.group(2))
+                data.coord_quality = "exact"
+                coord_method = "place pin"
+                pinned = True
+        except:
+            pass
+        
+        if not coord_method and self.geocode and data.address and GEOCODING_AVAILABLE:
             try:
-                for _ in range(10):  # Max 2 seconds
-                    addr_elem = self.page.locator('[data-item-id="address"] .Io6YTe').first
-                    if addr_elem.count() > 0 and addr_elem.text_content():
-                        break
-                    time.sleep(0.2)
-            except:
-                pass
-            
-            data = MapsBusinessData(
-                name=basic_info.get('name', 'Unknown'),
-                rating=basic_info.get('rating'),
-                category=basic_info.get('category')
-            )
-            
-            # Extract place_id from URL first (this is reliable)
+                from tools.geocoding import has_street_number
+                # Shared geocoder service: one rate budget across threads, pooled connections
+                geocoder = get_geocoder()
+                coords = geocoder.geocode(
+                    address=data.address,
+                    city=data.city,
+                    county=data.county,
+                    company_name=data.name
+                )
+                if coords:
+                    data.latitude, data.longitude = coords
+                    coord_method = "geocoding"
+                    # Track coordinate quality based on address completeness and match level
+                    pinned = geocoder.last_level != 'city'
+                    if has_street_number(data.address) and geocoder.last_level in ('address', 'business'):
+                        data.coord_quality = "exact"
+                    else:
+                        data.coord_quality = "approximate"
+                        logger.warning(f"Address without street number: {data.address}")
+            except Exception as e:
+                logger.debug(f"Geocoding failed: {e}")
+        
+        # Fallback: URL coordinates (less reliable - may be viewport center)
+        if not coord_method:
             try:
                 url = self.page.url
-                place_id_match = re.search(r'!1s(0x[0-9a-fA-F]+:[0-9a-fA-Fx]+)', url)
-                if place_id_match:
-                    data.place_id = place_id_match.group(1)
-                else:
-                    place_match = re.search(r'/data=.*?!1s([^!]+)', url)
-                    if place_match:
-                        data.place_id = place_match.group(1)
+                coord_match = re.search(r'@(-?\d+\.\d+),(-?\d+\.\d+)', url)
+                if coord_match:
+                    data.latitude = float(coord_match.group(1))
+                    data.longitude = float(coord_match.group(2))
+                    coord_method = "url_pattern (fallback)"
+                    data.coord_quality = "approximate"  # URL coords are viewport, not exact
             except:
                 pass
-            
-            # Extract address FIRST - we need this for geocoding
+        
+        # City/county from geometry beat the address-text guesses of _parse_address
+        if pinned and REVERSE_GEOCODING_AVAILABLE:
+            reverse = get_reverse_geocoder()
+            located = reverse.locate(data.latitude, data.longitude) if reverse else None
+            if located:
+                data.city = located['city'] or data.city
+                data.county = located['county'] or data.county
+        
+        # Log which method worked
+        if coord_method:
+            logger.debug(f"Coordinates via {coord_method}: ({data.latitude}, {data.longitude})")
+        else:
+            logger.warning(f"No coordinates found for: {data.name}")
+            data.coord_quality = "none"
+        
+        # Extract phone
+        try:
+            phone_button = self.page.locator('[data-item-id^="phone:"] .Io6YTe').first
+            if phone_button.count() > 0:
+                data.phone = phone_button.text_content()
+        except:
+            pass
+        
+        # Extract website
+        try:
+            website_button = self.page.locator('[data-item-id="authority"] .Io6YTe').first
+            if website_button.count() > 0:
+                data.website = website_button.text_content()
+                # Clean up website URL
+                if data.website and not data.website.startswith('http'):
+                    data.website = 'https://' + data.website
+        except:
+            pass
+        
+        # Extract business hours
+        try:
+            hours_button = self.page.locator('[data-item-id="oh"] .Io6YTe').first
+            if hours_button.count() > 0:
+                hours_text = hours_button.text_content()
+                if hours_text:
+                    hours_lower = hours_text.lower()
+                    # Check for non-stop indicators in Romanian and English
+                    non_stop_indicators = [
+                        'non-stop', 'nonstop', 'non stop',
+                        '24 de ore', '24 ore', '24h', '24/7',
+                        'deschis 24', 'open 24',
+                        'deschis non', 'open non'
+                    ]
+                    if any(indicator in hours_lower for indicator in non_stop_indicators):
+                        data.is_non_stop = True
+                    data.business_hours = {'text': hours_text}
+        except:
+            pass
+        
+        # Also check for non-stop in other page elements (sometimes shown differently)
+        if not data.is_non_stop:
             try:
-                address_button = self.page.locator('[data-item-id="address"] .Io6YTe').first
-                if address_button.count() > 0:
-                    full_address = address_button.text_content()
-                    data.address = full_address
-                    
-                    # Parse city/county from address
-                    self._parse_address(data, full_address)
+                page_text = self.page.locator('.fontBodyMedium').all_text_contents()
+                page_text_combined = ' '.join(page_text).lower()
+                non_stop_indicators = ['non-stop', 'nonstop', '24 de ore', '24/7', 'deschis 24']
+                if any(indicator in page_text_combined for indicator in non_stop_indicators):
+                    data.is_non_stop = True
             except:
                 pass
+        
+        # Extract review count - try multiple selectors
+        try:
+            # Try the review count from the header area (shows as "X recenzii" or "X reviews")
+            review_selectors = [
+                '[jsaction*="review"] span[aria-label*="recenzii"]',
+                '[jsaction*="review"] span[aria-label*="reviews"]',
+                'button[jsaction*="review"] span',
+                '.F7nice span[aria-label]',
+                'span[aria-label*="recenzii"]',
+                'span[aria-label*="reviews"]',
+            ]
             
-            # Extract coordinates via GEOCODING the address (most reliable method)
-            # Skip if self.geocode=False for speed - can batch geocode later
-            coord_method = None
-            
-            if self.geocode and data.address and GEOCODING_AVAILABLE:
-                try:
-                    from tools.geocoding import has_street_number
-                    geocoder = GeocodingTool()
-                    coords = geocoder.geocode(
-                        address=data.address,
-                        city=data.city,
-                        county=data.county,
-                        company_name=data.name
-                    )
-                    if coords:
-                        data.latitude, data.longitude = coords
-                        coord_method = "geocoding"
-                        # Track coordinate quality based on address completeness
-                        if has_street_number(data.address):
-                            data.coord_quality = "exact"
-                        else:
-                            data.coord_quality = "approximate"
-                            logger.warning(f"Address without street number: {data.address}")
-                except Exception as e:
-                    logger.debug(f"Geocoding failed: {e}")
-            
-            # Fallback: URL coordinates (less reliable - may be viewport center)
-            if not coord_method:
+            for selector in review_selectors:
                 try:
-                    url = self.page.url
-                    coord_match = re.search(r'@(-?\d+\.\d+),(-?\d+\.\d+)', url)
-                    if coord_match:
-                        data.latitude = float(coord_match.group(1))
-                        data.longitude = float(coord_match.group(2))
-                        coord_method = "url_pattern (fallback)"
-                        data.coord_quality = "approximate"  # URL coords are viewport, not exact
+                    reviews_elem = self.page.locator(selector).first
+                    if reviews_elem.count() > 0:
+                        # Try aria-label first
+                        review_text = reviews_elem.get_attribute('aria-label')
+                        if not review_text:
+                            review_text = reviews_elem.text_content()
+                        if review_text:
+                            # Extract number from text like "123 de recenzii" or "(123)"
+                            match = re.search(r'(\d[\d.,]*)', review_text.replace('.', '').replace(',', ''))
+                            if match:
+                                data.review_count = int(match.group(1))
+                                break
                 except:
-                    pass
-            
-            # Log which method worked
-            if coord_method:
-                logger.debug(f"Coordinates via {coord_method}: ({data.latitude}, {data.longitude})")
-            else:
-                logger.warning(f"No coordinates found for: {data.name}")
-                data.coord_quality = "none"
-            
-            # Extract phone
-            try:
-                phone_button = self.page.locator('[data-item-id^="phone:"] .Io6YTe').first
-                if phone_button.count() > 0:
-                    data.phone = phone_button.text_content()
-            except:
-                pass
-            
-            # Extract website
-            try:
-                website_button = self.page.locator('[data-item-id="authority"] .Io6YTe').first
-                if website_button.count() > 0:
-                    data.website = website_button.text_content()
-                    # Clean up website URL
-                    if data.website and not data.website.startswith('http'):
-                        data.website = 'https://' + data.website
-            except:
-                pass
-            
-            # Extract business hours
-            try:
-                hours_button = self.page.locator('[data-item-id="oh"] .Io6YTe').first
-                if hours_button.count() > 0:
-                    hours_text = hours_button.text_content()
-                    if hours_text:
-                        hours_lower = hours_text.lower()
-                        # Check for non-stop indicators in Romanian and English
-                        non_stop_indicators = [
-                            'non-stop', 'nonstop', 'non stop',
-                            '24 de ore', '24 ore', '24h', '24/7',
-                            'deschis 24', 'open 24',
-                            'deschis non', 'open non'
-                        ]
-                        if any(indicator in hours_lower for indicator in non_stop_indicators):
-                            data.is_non_stop = True
-                        data.business_hours = {'text': hours_text}
-            except:
-                pass
+                    continue
             
-            # Also check for non-stop in other page elements (sometimes shown differently)
-            if not data.is_non_stop:
+            # Also try to get review count from the text near rating
+            if not data.review_count:
                 try:
-                    page_text = self.page.locator('.fontBodyMedium').all_text_contents()
-                    page_text_combined = ' '.join(page_text).lower()
-                    non_stop_indicators = ['non-stop', 'nonstop', '24 de ore', '24/7', 'deschis 24']
-                    if any(indicator in page_text_combined for indicator in non_stop_indicators):
-                        data.is_non_stop = True
+                    # Look for pattern like "4.5 (123)" near rating
+                    rating_area = self.page.locator('.F7nice').first
+                    if rating_area.count() > 0:
+                        text = rating_area.text_content()
+                        match = re.search(r'\((\d+)\)', text)
+                        if match:
+                            data.review_count = int(match.group(1))
                 except:
                     pass
+        except:
+            pass
+        
+        return data
+    
+    @classmethod
+    def place_url_for(cls, place_ref) -> Optional[str]:
+        """
+        URL that opens a place panel directly.
+        
+        Args:
+            place_ref: Stored record dict (place_url / place_id), a Maps place URL or a place id
+        """
+        if isinstance(place_ref, dict):
+            return place_ref.get('place_url') or cls.place_url_for(place_ref.get('place_id'))
+        if not place_ref:
+            return None
+        if place_ref.startswith('http'):
+            return place_ref
+        if re.match(r'^0x[0-9a-fA-F]+:0x[0-9a-fA-F]+$', place_ref):
+            # Feature id as found in Maps URLs
+            return f"https://www.google.com/maps/place/data=!4m2!3m1!1s{place_ref}"
+        # Places API style id (ChIJ...)
+        return f"https://www.google.com/maps/place/?q=place_id:{place_ref}"
+    
+    def _panel_rating(self) -> Optional[float]:
+        """Rating shown in the header of the open place panel."""
+        try:
+            rating_elem = self.page.locator('.F7nice span[aria-hidden="true"]').first
+            if rating_elem.count() > 0:
+                text = (rating_elem.text_content() or '').strip().replace(',', '.')
+                return float(text) if text else None
+        except:
+            pass
+        return None
+    
+    def _panel_category(self) -> Optional[str]:
+        """Category shown under the name in the open place panel."""
+        try:
+            category_elem = self.page.locator('button[jsaction*="category"]').first
+            if category_elem.count() > 0:
+                return (category_elem.text_content() or '').strip() or None
+        except:
+            pass
+        return None
+    
+    def refresh_place(self, place_ref) -> Optional[MapsBusinessData]:
+        """
+        Re-extract one business by navigating straight to its place panel.
+        One paced navigation instead of search + feed scroll + card click.
+        
+        Args:
+            place_ref: Stored record dict (place_url / place_id), a Maps place URL or a place id
             
-            # Extract review count - try multiple selectors
-            try:
-                # Try the review count from the header area (shows as "X recenzii" or "X reviews")
-                review_selectors = [
-                    '[jsaction*="review"] span[aria-label*="recenzii"]',
-                    '[jsaction*="review"] span[aria-label*="reviews"]',
-                    'button[jsaction*="review"] span',
-                    '.F7nice span[aria-label]',
-                    'span[aria-label*="recenzii"]',
-                    'span[aria-label*="reviews"]',
-                ]
-                
-                for selector in review_selectors:
-                    try:
-                        reviews_elem = self.page.locator(selector).first
-                        if reviews_elem.count() > 0:
-                            # Try aria-label first
-                            review_text = reviews_elem.get_attribute('aria-label')
-                            if not review_text:
-                                review_text = reviews_elem.text_content()
-                            if review_text:
-                                # Extract number from text like "123 de recenzii" or "(123)"
-                                match = re.search(r'(\d[\d.,]*)', review_text.replace('.', '').replace(',', ''))
-                                if match:
-                                    data.review_count = int(match.group(1))
-                                    break
-                    except:
-                        continue
-                
-                # Also try to get review count from the text near rating
-                if not data.review_count:
-                    try:
-                        # Look for pattern like "4.5 (123)" near rating
-                        rating_area = self.page.locator('.F7nice').first
-                        if rating_area.count() > 0:
-                            text = rating_area.text_content()
-                            match = re.search(r'\((\d+)\)', text)
-                            if match:
-                                data.review_count = int(match.group(1))
-                    except:
-                        pass
-            except:
-                pass
-            
-            return data
+        Returns:
+            Fresh MapsBusinessData, or None if the place panel did not open (listing removed)
             
-        except Exception as e:
-            logger.error(f"Error extracting business details: {e}")
-            return MapsBusinessData(name=basic_info.get('name', 'Unknown'))
+        Raises:
+            ValueError: place_ref has neither a URL nor a place id
+            ThrottledError: Google kept showing its unusual traffic page
+        """
+        url = self.place_url_for(place_ref)
+        if not url:
+            raise ValueError(f"No place URL or place id in {place_ref!r}")
+        
+        self._paced_goto(url, cost=DETAIL_COST)
+        
+        try:
+            title = self.page.locator('h1.DUwDvf').first
+            title.wait_for(state='visible', timeout=8000)
+            name = (title.text_content() or '').strip()
+        except PlaywrightTimeout:
+            logger.info(f"No place panel at {url}")
+            return None
+        if not name:
+            return None
+        
+        data = self._extract_panel({
+            'name': name,
+            'rating': self._panel_rating(),
+            'category': self._panel_category(),
+        })
+        if not data.place_id and isinstance(place_ref, dict):
+            data.place_id = place_ref.get('place_id')
+        return data
+    
+    def refresh_places(self, place_refs: List) -> List[tuple]:
+        """
+        Refresh many places in a row, paced by self.pacer.
+        
+        Returns:
+            List of (place_ref, MapsBusinessData or None) in input order.
+            Stops early (remaining refs omitted) if Google keeps throttling.
+        """
+        results = []
+        for i, place_ref in enumerate(place_refs):
+            label = place_ref.get('name') if isinstance(place_ref, dict) else place_ref
+            logger.info(f"Refreshing [{i+1}/{len(place_refs)}]: {label}")
+            try:
+                results.append((place_ref, self.refresh_place(place_ref)))
+            except ThrottledError as e:
+                logger.error(f"Stopping bulk refresh: {e}")
+                break
+            except Exception as e:
+                logger.error(f"Error refreshing {label}: {e}")
+                results.append((place_ref, None))
+        return results
     
     def _parse_address(self, data: MapsBusinessData, full_address: str):
-        """Parse Romanian address to extract city and county."""
+        """
+        Parse Romanian address to extract city and county.
+        Only a first guess: when the business has a pin and boundary polygons
+        are indexed, the reverse geocoder overrides it.
+        """
         # Romanian address format: "Street, Number, City, County PostalCode" or "Street, City PostalCode"
         
         address_lower = full_address.lower()
@@ -0,0 +1,453 @@
+"""
+Offline Geocoder - Romanian geocoding from a local OpenStreetMap extract.
+
+Nominatim's public endpoint allows 1 request/second, which caps batch
+geocoding at ~3,600 businesses/hour and needs network access. This module
+imports a Romania extract (e.g. romania-latest.osm.pbf from Geofabrik) into
+a local SQLite file once:
+
+- places     city/town/village/suburb nodes, with an R-tree for nearest-place
+             (reverse) lookups
+- streets    named highways, keyed by (locality, normalized street name)
+- addresses  addr:housenumber objects, keyed by (locality, street, number)
+- boundaries county and locality polygons (administrative boundaries), used by
+             tools/reverse_geocoder.py to answer point-in-polygon queries
+
+Street names are normalized (no diacritics, lowercase, street type word
+dropped) so "Str. Gheorghe Lazăr" and "Strada Gheorghe Lazar" match. Objects
+without addr:city get the locality of the nearest place. Lookups are indexed
+point queries plus an in-memory memo.
+
+Building the index needs pyosmium (pip install osmium); querying does not.
+Build with: python build_osm_index.py romania-latest.osm.pbf
+"""
+import re
+import json
+import math
+import sqlite3
+import logging
+import unicodedata
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# pyosmium is only needed to build the index
+try:
+    import osmium
+    OSMIUM_AVAILABLE = True
+except ImportError:
+    OSMIUM_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "osm_romania.sqlite"
+
+# OSM place types imported as localities (town-level first for nearest-place assignment)
+PLACE_TYPES = ['city', 'town', 'village', 'suburb', 'hamlet']
+LOCALITY_TYPES = ['city', 'town', 'village', 'hamlet']
+# Street type words dropped from street keys
+STREET_TYPE_WORDS = {
+    'strada', 'str', 'calea', 'bulevardul', 'bd', 'b-dul', 'bdul', 'aleea', 'al',
+    'piata', 'splaiul', 'splai', 'drumul', 'intrarea', 'soseaua', 'sos', 'fundatura',
+    'prelungirea', 'pasajul', 'ulita',
+}
+# OSM admin_level of Romanian counties (județe, plus București) and localities
+COUNTY_ADMIN_LEVEL = 4
+LOCALITY_ADMIN_LEVELS = (6, 7, 8)
+# București sectors are admin areas but not localities
+NOT_A_LOCALITY_RE = re.compile(r'^sector(ul)?\s*\d', re.IGNORECASE)
+# Boundary vertices closer than this (degrees, ~30 m) to the previous kept one are dropped
+SIMPLIFY_DEG = 0.0003
+# How far (degrees, ~15 km) to look for the nearest locality / place
+NEAREST_SEARCH_DEG = 0.15
+MEMO_SIZE = 50000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS places (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    place_type TEXT NOT NULL,
+    county TEXT,
+    lat REAL NOT NULL,
+    lng REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_places_key ON places(name_key);
+CREATE TABLE IF NOT EXISTS streets (
+    locality_key TEXT,
+    street_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    lat REAL NOT NULL,
+    lng REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_streets_key ON streets(locality_key, street_key);
+CREATE TABLE IF NOT EXISTS addresses (
+    locality_key TEXT,
+    street_key TEXT NOT NULL,
+    number TEXT NOT NULL,
+    lat REAL NOT NULL,
+    lng REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_addresses_key ON addresses(locality_key, street_key, number);
+CREATE TABLE IF NOT EXISTS boundaries (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    admin_level INTEGER,
+    min_lat REAL NOT NULL,
+    min_lng REAL NOT NULL,
+    max_lat REAL NOT NULL,
+    max_lng REAL NOT NULL,
+    rings TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _strip_diacritics(text: str) -> str:
+    normalized = unicodedata.normalize('NFD', text or '')
+    return ''.join(c for c in normalized if unicodedata.category(c) != 'Mn')
+
+
+def locality_key(name: str) -> str:
+    """Locality lookup key: "Târgu Mureș" -> "targu mures"."""
+    key = _strip_diacritics(name).lower()
+    key = re.sub(r'^(municipiul|orasul|oras|comuna|satul|sat)\s+', '', key)
+    return re.sub(r'[^a-z0-9]+', ' ', key).strip()
+
+
+def boundary_name(name: str) -> str:
+    """Display name of an admin area: "Județul Timiș" -> "Timiș", "Municipiul București" -> "București"."""
+    return re.sub(r'^(jude[țţt]ul|municipiul|ora[șşs]ul|comuna)\s+', '', (name or '').strip(), flags=re.IGNORECASE)
+
+
+def simplify_ring(ring: List[Tuple[float, float]], tolerance: float = SIMPLIFY_DEG) -> List[Tuple[float, float]]:
+    """Drop vertices within tolerance of the previously kept one (keeps the ring closed)."""
+    if len(ring) <= 4:
+        return list(ring)
+    kept = [ring[0]]
+    for lat, lng in ring[1:-1]:
+        if abs(lat - kept[-1][0]) > tolerance or abs(lng - kept[-1][1]) > tolerance:
+            kept.append((lat, lng))
+    kept.append(ring[-1])
+    return kept if len(kept) >= 4 else list(ring)
+
+
+def street_key(name: str) -> str:
+    """Street lookup key: "Str. Gheorghe Lazăr" -> "gheorghe lazar"."""
+    words = re.sub(r'[^a-z0-9\-]+', ' ', _strip_diacritics(name).lower()).split()
+    while words and words[0].strip('-') in STREET_TYPE_WORDS:
+        words = words[1:]
+    return ' '.join(words)
+
+
+def number_key(number: str) -> str:
+    """House number key: "12 A" -> "12a"."""
+    return re.sub(r'\s+', '', (number or '').lower())
+
+
+def _distance_sq(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Squared equirectangular distance - enough to rank nearby candidates."""
+    dx = (lng2 - lng1) * math.cos(math.radians((lat1 + lat2) / 2))
+    dy = lat2 - lat1
+    return dx * dx + dy * dy
+
+
+class OfflineGeocoder:
+    """Geocoding and reverse geocoding against the local OSM index."""
+
+    def __init__(self, db_path: Path = None):
+        """
+        Args:
+            db_path: Index file built by build_osm_index.py (default: data/osm_romania.sqlite)
+        """
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS places_rtree USING rtree(id, min_lat, max_lat, min_lng, max_lng)")
+        self._memo: Dict[tuple, Optional[Tuple[float, float, str]]] = {}
+        self.last_level: Optional[str] = None
+
+    @classmethod
+    def available(cls, db_path: Path = None) -> bool:
+        """True if an index has been built."""
+        path = Path(db_path or DEFAULT_DB_PATH)
+        if not path.exists():
+            return False
+        try:
+            conn = sqlite3.connect(str(path))
+            row = conn.execute("SELECT value FROM meta WHERE key = 'built_at'").fetchone()
+            conn.close()
+            return row is not None
+        except sqlite3.Error:
+            return False
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def clear(self):
+        for table in ('places', 'places_rtree', 'streets', 'addresses', 'boundaries', 'meta'):
+            self.conn.execute(f"DELETE FROM {table}")
+        self._memo.clear()
+
+    def add_place(self, name: str, place_type: str, lat: float, lng: float, county: str = None):
+        cursor = self.conn.execute(
+            "INSERT INTO places (name, name_key, place_type, county, lat, lng) VALUES (?, ?, ?, ?, ?, ?)",
+            (name, locality_key(name), place_type, county, lat, lng)
+        )
+        self.conn.execute("INSERT INTO places_rtree VALUES (?, ?, ?, ?, ?)", (cursor.lastrowid, lat, lat, lng, lng))
+
+    def add_street(self, name: str, lat: float, lng: float, locality: str = None):
+        key = street_key(name)
+        if key:
+            self.conn.execute(
+                "INSERT INTO streets (locality_key, street_key, name, lat, lng) VALUES (?, ?, ?, ?, ?)",
+                (locality_key(locality) if locality else None, key, name, lat, lng)
+            )
+
+    def add_address(self, street: str, number: str, lat: float, lng: float, locality: str = None):
+        key = street_key(street)
+        if key and number:
+            self.conn.execute(
+                "INSERT INTO addresses (locality_key, street_key, number, lat, lng) VALUES (?, ?, ?, ?, ?)",
+                (locality_key(locality) if locality else None, key, number_key(number), lat, lng)
+            )
+
+    def add_boundary(self, name: str, kind: str, rings: List[List[Tuple[float, float]]],
+                     admin_level: int = None):
+        """
+        Store an administrative area.
+
+        Args:
+            name: Area name (prefixes like "Județul" are dropped)
+            kind: 'county' or 'locality'
+            rings: Outer and inner rings as [(lat, lng), ...]; holes follow the even-odd rule
+            admin_level: OSM admin_level, if known
+        """
+        rings = [simplify_ring(ring) for ring in rings if len(ring) >= 4]
+        if not rings:
+            return
+        lats = [lat for ring in rings for lat, _ in ring]
+        lngs = [lng for ring in rings for _, lng in ring]
+        self.conn.execute(
+            "INSERT INTO boundaries (name, kind, admin_level, min_lat, min_lng, max_lat, max_lng, rings) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (boundary_name(name), kind, admin_level, min(lats), min(lngs), max(lats), max(lngs),
+             json.dumps([[[round(lat, 6), round(lng, 6)] for lat, lng in ring] for ring in rings]))
+        )
+
+    def finalize(self, source: str = None):
+        """Give streets/addresses without a city the nearest locality, then mark the index built."""
+        for table in ('streets', 'addresses'):
+            rows = self.conn.execute(f"SELECT rowid, lat, lng FROM {table} WHERE locality_key IS NULL").fetchall()
+            updates = []
+            for row in rows:
+                place = self.nearest_place(row['lat'], row['lng'], LOCALITY_TYPES)
+                if place:
+                    updates.append((place['name_key'], row['rowid']))
+            self.conn.executemany(f"UPDATE {table} SET locality_key = ? WHERE rowid = ?", updates)
+            logger.info(f"📍 Assigned nearest locality to {len(updates)}/{len(rows)} {table}")
+
+        counts = {t: self.conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+                  for t in ('places', 'streets', 'addresses', 'boundaries')}
+        self.conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", [
+            ('built_at', datetime.now().isoformat(timespec='seconds')),
+            ('source', source or ''),
+        ])
+        self.conn.commit()
+        self.conn.execute("ANALYZE")
+        logger.info(f"✅ Offline geocoder index: {counts['places']} places, {counts['streets']} street segments, "
+                    f"{counts['addresses']} addresses, {counts['boundaries']} admin boundaries")
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def nearest_place(self, lat: float, lng: float, place_types: List[str] = None) -> Optional[Dict]:
+        """Closest place (optionally of the given types) within NEAREST_SEARCH_DEG."""
+        radius = NEAREST_SEARCH_DEG / 8
+        while radius <= NEAREST_SEARCH_DEG:
+            rows = self.conn.execute(
+                """SELECT p.* FROM places_rtree r JOIN places p ON p.id = r.id
+                   WHERE r.min_lat >= ? AND r.max_lat <= ? AND r.min_lng >= ? AND r.max_lng <= ?""",
+                (lat - radius, lat + radius, lng - radius * 1.5, lng + radius * 1.5)
+            ).fetchall()
+            if place_types:
+                rows = [r for r in rows if r['place_type'] in place_types]
+            if rows:
+                return dict(min(rows, key=lambda r: _distance_sq(lat, lng, r['lat'], r['lng'])))
+            radius *= 2
+        return None
+
+    def reverse(self, lat: float, lng: float) -> Optional[Dict]:
+        """
+        Locality of a point.
+
+        Returns:
+            {'name', 'place_type', 'county', 'lat', 'lng'} of the nearest locality, or None
+        """
+        return self.nearest_place(lat, lng, LOCALITY_TYPES)
+
+    def _place(self, city: str, county: str = None) -> Optional[sqlite3.Row]:
+        rows = self.conn.execute(
+            "SELECT * FROM places WHERE name_key = ? ORDER BY CASE place_type "
+            "WHEN 'city' THEN 0 WHEN 'town' THEN 1 WHEN 'village' THEN 2 ELSE 3 END",
+            (locality_key(city),)
+        ).fetchall()
+        if county:
+            in_county = [r for r in rows if r['county'] and locality_key(r['county']) == locality_key(county)]
+            rows = in_county or rows
+        return rows[0] if rows else None
+
+    def _lookup(self, street: Optional[str], number: Optional[str], city: str,
+                county: str = None) -> Optional[Tuple[float, float, str]]:
+        loc = locality_key(city)
+        if street:
+            skey = street_key(street)
+            if number:
+                row = self.conn.execute(
+                    "SELECT lat, lng FROM addresses WHERE locality_key = ? AND street_key = ? AND number = ? LIMIT 1",
+                    (loc, skey, number_key(number))
+                ).fetchone()
+                if row:
+                    return row['lat'], row['lng'], 'address'
+            # Street level: average of the street's segments in the locality
+            row = self.conn.execute(
+                "SELECT AVG(lat) AS lat, AVG(lng) AS lng, COUNT(*) AS n FROM streets "
+                "WHERE locality_key = ? AND street_key = ?",
+                (loc, skey)
+            ).fetchone()
+            if row and row['n']:
+                return row['lat'], row['lng'], 'street'
+        place = self._place(city, county)
+        if place:
+            return place['lat'], place['lng'], 'city'
+        return None
+
+    def geocode_parts(self, street: Optional[str], number: Optional[str], city: str,
+                      county: str = None) -> Optional[Tuple[float, float]]:
+        """
+        Geocode an already parsed address. Sets last_level to address/street/city.
+
+        Returns:
+            (latitude, longitude), or None if even the city is unknown
+        """
+        self.last_level = None
+        if not city:
+            return None
+        key = (street_key(street) if street else None, number_key(number) if number else None,
+               locality_key(city), locality_key(county) if county else None)
+        if key not in self._memo:
+            if len(self._memo) >= MEMO_SIZE:
+                self._memo.clear()
+            self._memo[key] = self._lookup(street, number, city, county)
+        result = self._memo[key]
+        if result is None:
+            return None
+        lat, lng, self.last_level = result
+        return lat, lng
+
+
+class OsmImportHandler(osmium.SimpleHandler if OSMIUM_AVAILABLE else object):
+    """pyosmium handler that feeds places, streets and addresses into an OfflineGeocoder."""
+
+    def __init__(self, store: OfflineGeocoder):
+        super().__init__()
+        self.store = store
+        self.counts = {'places': 0, 'streets': 0, 'addresses': 0, 'boundaries': 0}
+
+    def _progress(self, kind: str):
+        self.counts[kind] += 1
+        if sum(self.counts.values()) % 100000 == 0:
+            logger.info(f"   ... {self.counts}")
+
+    def node(self, n):
+        tags = n.tags
+        if not n.location.valid():
+            return
+        lat, lng = n.location.lat, n.location.lon
+        if tags.get('place') in PLACE_TYPES and tags.get('name'):
+            self.store.add_place(tags['name'], tags['place'], lat, lng, tags.get('is_in:county'))
+            self._progress('places')
+        if tags.get('addr:housenumber') and tags.get('addr:street'):
+            self.store.add_address(tags['addr:street'], tags['addr:housenumber'], lat, lng,
+                                   tags.get('addr:city') or tags.get('addr:place'))
+            self._progress('addresses')
+
+    def way(self, w):
+        tags = w.tags
+        is_street = tags.get('highway') and tags.get('name')
+        is_address = tags.get('addr:housenumber') and tags.get('addr:street')
+        if not (is_street or is_address):
+            return
+        points = [(node.location.lat, node.location.lon) for node in w.nodes if node.location.valid()]
+        if not points:
+            return
+        lat = sum(p[0] for p in points) / len(points)
+        lng = sum(p[1] for p in points) / len(points)
+        if is_street:
+            self.store.add_street(tags['name'], lat, lng, tags.get('addr:city'))
+            self._progress('streets')
+        if is_address:
+            self.store.add_address(tags['addr:street'], tags['addr:housenumber'], lat, lng,
+                                   tags.get('addr:city') or tags.get('addr:place'))
+            self._progress('addresses')
+
+
+    def area(self, a):
+        tags = a.tags
+        if tags.get('boundary') != 'administrative' or not tags.get('name'):
+            return
+        try:
+            level = int(tags.get('admin_level', ''))
+        except ValueError:
+            return
+        if level == COUNTY_ADMIN_LEVEL:
+            kind = 'county'
+        elif level in LOCALITY_ADMIN_LEVELS and not NOT_A_LOCALITY_RE.match(tags['name']):
+            kind = 'locality'
+        else:
+            return
+        rings = []
+        for outer in a.outer_rings():
+            rings.append([(n.lat, n.lon) for n in outer])
+            for inner in a.inner_rings(outer):
+                rings.append([(n.lat, n.lon) for n in inner])
+        self.store.add_boundary(tags['name'], kind, rings, admin_level=level)
+        self._progress('boundaries')
+
+
+def build_index(pbf_path: Path, db_path: Path = None) -> OfflineGeocoder:
+    """
+    Import an OSM extract into the offline geocoder index (replaces any existing index).
+
+    Args:
+        pbf_path: OSM extract (.osm.pbf)
+        db_path: Index file (default: data/osm_romania.sqlite)
+
+    Raises:
+        ImportError: pyosmium is not installed
+    """
+    if not OSMIUM_AVAILABLE:
+        raise ImportError("Building the offline geocoder needs pyosmium: pip install osmium")
+
+    store = OfflineGeocoder(db_path)
+    store.clear()
+    handler = OsmImportHandler(store)
+    logger.info(f"📥 Importing {pbf_path} ...")
+    # locations=True keeps node coordinates so way centroids can be computed;
+    # the area() callback makes pyosmium assemble boundary polygons (a second pass)
+    handler.apply_file(str(pbf_path), locations=True)
+    store.conn.commit()
+    logger.info(f"   Imported {handler.counts}")
+    store.finalize(source=Path(pbf_path).name)
+    return store
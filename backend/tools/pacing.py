@@ -0,0 +1,161 @@
+"""
+Adaptive Pacer - token-bucket request pacing for the Google Maps scraper.
+
+Replaces the fixed sleeps between cities, searches and detail panels with a
+single token bucket whose refill rate follows how Google is responding:
+
+- healthy responses (fast page / panel loads) raise the rate additively
+- slow responses lower it a little
+- consent re-prompts lower it more (Google resetting the session)
+- "unusual traffic" / captcha pages halve it and pause all requests with an
+  exponential backoff (30s, 60s, 120s ... capped)
+
+Costs are in tokens: a search navigation costs more than opening one
+business panel. One pacer belongs to one browser; multi-process runs get one
+per worker, so the rate is per browser session.
+"""
+import time
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Token costs of the actions we pace
+SEARCH_COST = 3.0
+DETAIL_COST = 1.0
+
+# Text shown on Google's rate-limit / captcha interstitial (English and Romanian)
+THROTTLE_MARKERS = [
+    'unusual traffic',
+    'trafic neobișnuit',
+    'trafic neobisnuit',
+    'not a robot',
+    'nu sunteți un robot',
+]
+
+
+class ThrottledError(Exception):
+    """Google kept showing its "unusual traffic" page after backing off."""
+    pass
+
+
+class AdaptivePacer:
+    """
+    Token bucket with an AIMD (additive increase, multiplicative decrease) rate.
+    acquire() blocks until enough tokens are available.
+    """
+
+    def __init__(self, rate: float = 1.0, min_rate: float = 0.1, max_rate: float = 3.0,
+                 burst: float = 3.0, increase: float = 0.05, decrease: float = 0.5,
+                 latency_target: float = 3.0, backoff_base: float = 30.0, backoff_max: float = 900.0):
+        """
+        Args:
+            rate: Starting refill rate in tokens per second
+            min_rate: Never go slower than this
+            max_rate: Never go faster than this
+            burst: Bucket size - tokens that can be spent back to back
+            increase: Rate added after each healthy response
+            decrease: Rate multiplier on a throttle page
+            latency_target: Responses slower than this (seconds) count as a slowdown
+            backoff_base: First pause after a throttle page (seconds), doubled per repeat
+            backoff_max: Longest pause
+        """
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._tokens = burst
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._strikes = 0  # Consecutive throttles without enough healthy responses in between
+        self._healthy_streak = 0
+
+        # Counters for logs and metrics
+        self.waited_s = 0.0
+        self.throttles = 0
+        self.consent_reprompts = 0
+        self.slow_responses = 0
+        self.responses = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _set_rate(self, rate: float):
+        self.rate = max(self.min_rate, min(self.max_rate, rate))
+
+    def acquire(self, cost: float = 1.0) -> float:
+        """
+        Block until `cost` tokens are available (and any backoff pause is over).
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            time.sleep(pause)
+            waited += pause
+
+        self._refill()
+        if self._tokens < cost:
+            delay = (cost - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+            self._refill()
+        self._tokens -= cost
+
+        self.waited_s += waited
+        return waited
+
+    def record_response(self, latency: Optional[float] = None):
+        """A normal page or panel load. Speeds up unless it was slow."""
+        self.responses += 1
+        if latency is not None and latency > self.latency_target:
+            self.slow_responses += 1
+            self._healthy_streak = 0
+            self._set_rate(self.rate * 0.9)
+            return
+
+        self._healthy_streak += 1
+        self._set_rate(self.rate + self.increase)
+        if self._healthy_streak >= 20:
+            # Long healthy run - the next throttle starts from the base backoff again
+            self._strikes = 0
+
+    def record_consent_reprompt(self):
+        """Google asked for cookie consent again mid-session - a soft warning."""
+        self.consent_reprompts += 1
+        self._healthy_streak = 0
+        self._set_rate(self.rate * 0.75)
+        logger.warning(f"🍪 Consent re-prompted - slowing to {self.rate:.2f} req/s")
+
+    def record_throttle(self, reason: str = "unusual traffic"):
+        """Throttle page seen: cut the rate and pause everything with exponential backoff."""
+        self.throttles += 1
+        self._strikes += 1
+        self._healthy_streak = 0
+        self._set_rate(self.rate * self.decrease)
+        self._tokens = 0.0
+
+        pause = min(self.backoff_base * (2 ** (self._strikes - 1)), self.backoff_max)
+        self._paused_until = time.monotonic() + pause
+        logger.warning(f"🚦 Throttled ({reason}) - backing off {pause:.0f}s, rate now {self.rate:.2f} req/s")
+
+    def stats(self) -> Dict:
+        """Current rate and counters."""
+        return {
+            'rate': round(self.rate, 3),
+            'responses': self.responses,
+            'slow_responses': self.slow_responses,
+            'consent_reprompts': self.consent_reprompts,
+            'throttles': self.throttles,
+            'waited_s': round(self.waited_s, 1),
+        }
@@ -0,0 +1,297 @@
+"""
+Reverse Geocoder - county and locality of a point from administrative boundaries.
+
+City and county used to be guessed from address text (postal codes, county
+name lists, city-name scans). When a business has a pin, geometry is the
+better source: the boundary polygons stored in the offline OSM index
+(build_osm_index.py, or --boundaries for a GeoJSON file) are loaded into
+memory once and answer point-in-polygon queries directly.
+
+- a uniform grid (CELL_DEG) maps each cell to the polygons whose bounding
+  box touches it, so a point is only tested against a handful of polygons;
+  cells no edge passes through are classified once at load, so points in
+  them (most points, for counties) need no test at all
+- the test is an even-odd ray cast over all edges at once (NumPy), which also
+  handles holes
+- locate_many() buckets a whole batch of points into grid cells and tests
+  each polygon against all of its candidate points in one vectorized step
+- where localities nest (a village inside its commune), the smallest
+  polygon wins
+
+A single lookup takes microseconds; a nationwide batch takes a fraction of a
+second.
+"""
+import json
+import math
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .offline_geocoder import DEFAULT_DB_PATH
+
+logger = logging.getLogger(__name__)
+
+CELL_DEG = 0.1
+# Points per vectorized block (points x edges booleans are built per block)
+BLOCK_SIZE = 256
+MEMO_SIZE = 50000
+
+
+class _Area:
+    """One boundary polygon, as flat edge arrays."""
+
+    __slots__ = ('name', 'kind', 'bbox', 'area', 'x1', 'y1', 'x2', 'y2')
+
+    def __init__(self, name: str, kind: str, bbox: Tuple[float, float, float, float], rings: List[List[List[float]]]):
+        self.name = name
+        self.kind = kind
+        self.bbox = bbox  # (min_lat, min_lng, max_lat, max_lng)
+        starts, ends = [], []
+        area = 0.0
+        for ring in rings:
+            points = np.asarray(ring, dtype=float)
+            starts.append(points)
+            ends.append(np.roll(points, -1, axis=0))
+            # Shoelace area (degrees², only used to rank nested polygons)
+            area += 0.5 * (points[:, 1] * np.roll(points[:, 0], -1) - np.roll(points[:, 1], -1) * points[:, 0]).sum()
+        start, end = np.concatenate(starts), np.concatenate(ends)
+        self.y1, self.x1 = start[:, 0], start[:, 1]
+        self.y2, self.x2 = end[:, 0], end[:, 1]
+        self.area = abs(area)
+
+    def crosses_box(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> bool:
+        """True if any edge's bounding box overlaps the box (conservative)."""
+        return bool(np.any(
+            (np.minimum(self.y1, self.y2) <= max_lat) & (np.maximum(self.y1, self.y2) >= min_lat) &
+            (np.minimum(self.x1, self.x2) <= max_lng) & (np.maximum(self.x1, self.x2) >= min_lng)
+        ))
+
+    def contains(self, lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+        """Even-odd point-in-polygon test for arrays of points."""
+        inside = np.zeros(len(lat), dtype=bool)
+        for start in range(0, len(lat), BLOCK_SIZE):
+            y = lat[start:start + BLOCK_SIZE, None]
+            x = lng[start:start + BLOCK_SIZE, None]
+            crosses = (self.y1 > y) != (self.y2 > y)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                x_cross = self.x1 + (y - self.y1) * (self.x2 - self.x1) / (self.y2 - self.y1)
+            inside[start:start + BLOCK_SIZE] = np.count_nonzero(crosses & (x < x_cross), axis=1) % 2 == 1
+        return inside
+
+
+def _cell(lat: float, lng: float) -> Tuple[int, int]:
+    return math.floor(lat / CELL_DEG), math.floor(lng / CELL_DEG)
+
+
+class ReverseGeocoder:
+    """Point-in-polygon county/locality lookups against the boundary polygons."""
+
+    KINDS = ('county', 'locality')
+
+    def __init__(self, db_path: Path = None):
+        """
+        Args:
+            db_path: Offline index holding the boundaries table (default: data/osm_romania.sqlite)
+        """
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        conn = sqlite3.connect(str(self.db_path))
+        rows = conn.execute(
+            "SELECT name, kind, min_lat, min_lng, max_lat, max_lng, rings FROM boundaries"
+        ).fetchall()
+        conn.close()
+
+        self.areas: Dict[str, List[_Area]] = {kind: [] for kind in self.KINDS}
+        for name, kind, min_lat, min_lng, max_lat, max_lng, rings in rows:
+            if kind in self.areas:
+                self.areas[kind].append(_Area(name, kind, (min_lat, min_lng, max_lat, max_lng), json.loads(rings)))
+        # Smallest first, so the most specific locality wins
+        for areas in self.areas.values():
+            areas.sort(key=lambda a: a.area)
+
+        # Grid cell -> (area index, whole cell inside?) for every area that may cover part of the cell
+        self.grid: Dict[str, Dict[Tuple[int, int], List[Tuple[int, bool]]]] = {
+            kind: defaultdict(list) for kind in self.KINDS
+        }
+        for kind, areas in self.areas.items():
+            for index, area in enumerate(areas):
+                for cell in self._cells(area.bbox):
+                    box = (cell[0] * CELL_DEG, cell[1] * CELL_DEG, (cell[0] + 1) * CELL_DEG, (cell[1] + 1) * CELL_DEG)
+                    if area.crosses_box(*box):
+                        self.grid[kind][cell].append((index, False))
+                    elif area.contains(np.array([box[0] + CELL_DEG / 2]), np.array([box[1] + CELL_DEG / 2]))[0]:
+                        self.grid[kind][cell].append((index, True))
+            for entries in self.grid[kind].values():
+                entries.sort()
+        self._memo: Dict[Tuple[float, float], Optional[Dict]] = {}
+        logger.info(f"🗺️ Reverse geocoder: {len(self.areas['county'])} counties, "
+                    f"{len(self.areas['locality'])} localities")
+
+    @classmethod
+    def available(cls, db_path: Path = None) -> bool:
+        """True if the index has boundary polygons."""
+        path = Path(db_path or DEFAULT_DB_PATH)
+        if not path.exists():
+            return False
+        try:
+            conn = sqlite3.connect(str(path))
+            row = conn.execute("SELECT 1 FROM boundaries LIMIT 1").fetchone()
+            conn.close()
+            return row is not None
+        except sqlite3.Error:
+            return False
+
+    @staticmethod
+    def _cells(bbox: Tuple[float, float, float, float]):
+        min_lat, min_lng, max_lat, max_lng = bbox
+        (r0, c0), (r1, c1) = _cell(min_lat, min_lng), _cell(max_lat, max_lng)
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
+                yield r, c
+
+    def _find(self, kind: str, lat: float, lng: float) -> Optional[str]:
+        point_lat, point_lng = np.array([lat]), np.array([lng])
+        areas = self.areas[kind]
+        for index, whole_cell in self.grid[kind].get(_cell(lat, lng), ()):
+            area = areas[index]
+            if whole_cell:
+                return area.name
+            min_lat, min_lng, max_lat, max_lng = area.bbox
+            if min_lat <= lat <= max_lat and min_lng <= lng <= max_lng and area.contains(point_lat, point_lng)[0]:
+                return area.name
+        return None
+
+    def locate(self, lat: float, lng: float) -> Optional[Dict[str, Optional[str]]]:
+        """
+        County and locality containing a point.
+
+        Returns:
+            {'city', 'county'} (either may be None), or None if the point is in no known area
+        """
+        key = (round(lat, 5), round(lng, 5))
+        if key not in self._memo:
+            if len(self._memo) >= MEMO_SIZE:
+                self._memo.clear()
+            county = self._find('county', lat, lng)
+            city = self._find('locality', lat, lng)
+            self._memo[key] = _result(city, county)
+        return self._memo[key]
+
+    def locate_many(self, lats: Sequence[float], lngs: Sequence[float]) -> List[Optional[Dict[str, Optional[str]]]]:
+        """
+        County and locality of many points at once (see locate).
+
+        Args:
+            lats, lngs: Coordinates; None/NaN entries yield None
+        """
+        lat = np.array([np.nan if v is None else v for v in lats], dtype=float)
+        lng = np.array([np.nan if v is None else v for v in lngs], dtype=float)
+        valid = ~(np.isnan(lat) | np.isnan(lng))
+
+        # Bucket the points by grid cell
+        buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        rows = np.floor(lat[valid] / CELL_DEG).astype(np.int64)
+        cols = np.floor(lng[valid] / CELL_DEG).astype(np.int64)
+        for index, r, c in zip(np.flatnonzero(valid), rows, cols):
+            buckets[(int(r), int(c))].append(index)
+
+        found = {}
+        for kind in self.KINDS:
+            match = np.full(len(lat), -1, dtype=np.int64)
+            candidates_by_area: Dict[int, List[int]] = defaultdict(list)
+            inside_by_area: Dict[int, List[int]] = defaultdict(list)
+            for cell, points in buckets.items():
+                for area_index, whole_cell in self.grid[kind].get(cell, ()):
+                    (inside_by_area if whole_cell else candidates_by_area)[area_index].extend(points)
+            # Smallest areas first - a point keeps the first (most specific) match
+            for area_index in sorted(set(candidates_by_area) | set(inside_by_area)):
+                inside = np.array(inside_by_area.get(area_index, []), dtype=np.int64)
+                match[inside[match[inside] < 0]] = area_index
+                points = np.array(candidates_by_area.get(area_index, []), dtype=np.int64)
+                points = points[match[points] < 0]
+                if len(points) == 0:
+                    continue
+                area = self.areas[kind][area_index]
+                min_lat, min_lng, max_lat, max_lng = area.bbox
+                in_box = ((lat[points] >= min_lat) & (lat[points] <= max_lat) &
+                          (lng[points] >= min_lng) & (lng[points] <= max_lng))
+                points = points[in_box]
+                if len(points):
+                    match[points[area.contains(lat[points], lng[points])]] = area_index
+            found[kind] = match
+
+        results = []
+        for i in range(len(lat)):
+            county = self.areas['county'][found['county'][i]].name if found['county'][i] >= 0 else None
+            city = self.areas['locality'][found['locality'][i]].name if found['locality'][i] >= 0 else None
+            results.append(_result(city, county))
+        return results
+
+
+def _result(city: Optional[str], county: Optional[str]) -> Optional[Dict[str, Optional[str]]]:
+    if county is None and city is None:
+        return None
+    # București has sectors, not localities, inside the municipality
+    if city is None and county == 'București':
+        city = county
+    return {'city': city, 'county': county}
+
+
+def import_geojson(path: Path, kind: str, name_property: str = 'name', db_path: Path = None) -> int:
+    """
+    Load boundary polygons from a GeoJSON FeatureCollection (e.g. an export of
+    the official UAT boundaries) into the offline index.
+
+    Args:
+        path: GeoJSON file with Polygon/MultiPolygon features
+        kind: 'county' or 'locality'
+        name_property: Feature property holding the area name
+        db_path: Offline index (default: data/osm_romania.sqlite)
+
+    Returns:
+        Number of areas imported
+    """
+    from .offline_geocoder import OfflineGeocoder
+
+    if kind not in ReverseGeocoder.KINDS:
+        raise ValueError(f"Unknown boundary kind '{kind}' (choose from {', '.join(ReverseGeocoder.KINDS)})")
+    with open(path, 'r', encoding='utf-8') as f:
+        features = json.load(f).get('features', [])
+
+    store = OfflineGeocoder(db_path)
+    imported = 0
+    for feature in features:
+        geometry = feature.get('geometry') or {}
+        name = (feature.get('properties') or {}).get(name_property)
+        if not name or geometry.get('type') not in ('Polygon', 'MultiPolygon'):
+            continue
+        polygons = [geometry['coordinates']] if geometry['type'] == 'Polygon' else geometry['coordinates']
+        # GeoJSON positions are [lng, lat]
+        rings = [[(lat, lng) for lng, lat, *_ in ring] for polygon in polygons for ring in polygon]
+        store.add_boundary(name, kind, rings)
+        imported += 1
+    store.conn.commit()
+    store.close()
+    logger.info(f"✅ Imported {imported} {kind} boundaries from {Path(path).name}")
+    return imported
+
+
+# Shared instance for the process (None when no boundaries are indexed)
+_reverse_geocoder = None
+_reverse_checked = False
+_reverse_lock = threading.Lock()
+
+
+def get_reverse_geocoder() -> Optional[ReverseGeocoder]:
+    global _reverse_geocoder, _reverse_checked
+    if not _reverse_checked:
+        with _reverse_lock:
+            if not _reverse_checked:
+                if ReverseGeocoder.available():
+                    _reverse_geocoder = ReverseGeocoder()
+                _reverse_checked = True
+    return _reverse_geocoder
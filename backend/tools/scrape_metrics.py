@@ -0,0 +1,213 @@
+"""
+Scrape Metrics - rolling throughput, ETA and per-county yield for national scrapes.
+
+Computed from the job ledger (every finished query job has its duration and
+yield) and written by the orchestrator as it goes:
+- data/scrape_metrics.json  rendered by `scrape_romania.py --status`
+- data/scrape_metrics.prom  Prometheus textfile-collector format
+
+Both files are replaced atomically, so readers never see a half-written file.
+"""
+import os
+import json
+import time
+import logging
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .job_ledger import JobLedger
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+METRICS_FILE = DATA_DIR / "scrape_metrics.json"
+PROMETHEUS_FILE = DATA_DIR / "scrape_metrics.prom"
+
+# Rolling rates look at jobs finished in this window
+DEFAULT_WINDOW_SECONDS = 1800
+
+
+def _ratio(part: float, whole: float) -> Optional[float]:
+    return round(part / whole, 3) if whole else None
+
+
+def compute_metrics(ledger: JobLedger, window_s: float = DEFAULT_WINDOW_SECONDS,
+                    workers: int = 1, pacing: Dict = None) -> Dict:
+    """
+    Build the metrics snapshot.
+
+    Args:
+        ledger: Job ledger of the run
+        window_s: Rolling window for rates, in seconds
+        workers: Browsers currently scraping (for the ETA fallback)
+        pacing: Optional pacer stats ({worker: AdaptivePacer.stats()})
+
+    Returns:
+        Metrics dict (see METRICS_FILE)
+    """
+    now = time.time()
+    jobs = ledger.finished_jobs(now - window_s)
+    summary = ledger.summary()
+    counties = ledger.county_breakdown()
+
+    # Rates over the wall-clock span actually covered by the window
+    if jobs:
+        span_start = max(now - window_s, min(j['started_at'] or j['finished_at'] for j in jobs))
+        minutes = max((now - span_start) / 60, 1 / 60)
+    else:
+        minutes = 0
+
+    cities = {}  # (county, city) -> summed query durations, for cities finished in the window
+    for job in jobs:
+        key = (job['county'], job['city'])
+        cities[key] = cities.get(key, 0) + (job['duration_s'] or 0)
+    finished_cities = [k for k in cities if ledger.city_done(*k)]
+
+    saved = sum(j['saved'] for j in jobs)
+    details = sum(j['details'] for j in jobs)
+    found = sum(j['found'] for j in jobs)
+    filtered = sum(j['filtered'] for j in jobs)
+    duplicates = sum(j['duplicates'] for j in jobs)
+    seconds_per_city = (sum(cities[k] for k in finished_cities) / len(finished_cities)
+                        if finished_cities else None)
+
+    rolling = {
+        'jobs': len(jobs),
+        'businesses_per_min': round(saved / minutes, 2) if minutes else None,
+        'cities_per_min': round(len(finished_cities) / minutes, 3) if minutes else None,
+        'details_per_min': round(details / minutes, 2) if minutes else None,
+        'seconds_per_city': round(seconds_per_city, 1) if seconds_per_city else None,
+        'filtered_ratio': _ratio(filtered, found),
+        'duplicate_ratio': _ratio(duplicates, found - filtered),
+    }
+
+    # ETA for what is left: measured city throughput, else per-city time spread over workers
+    # Summary totals include counts imported from the legacy progress file
+    saved_by_county = {c['county']: c['saved'] for c in summary['counties']}
+    cities_total = sum(c['cities'] for c in counties)
+    cities_done = sum(c['cities_done'] or 0 for c in counties)
+    remaining = cities_total - cities_done
+    eta_s = None
+    if remaining and rolling['cities_per_min']:
+        eta_s = remaining / rolling['cities_per_min'] * 60
+    elif remaining and seconds_per_city:
+        eta_s = remaining * seconds_per_city / max(workers, 1)
+
+    return {
+        'generated_at': datetime.fromtimestamp(now).isoformat(),
+        'started_at': summary['started_at'],
+        'window_s': window_s,
+        'workers': workers,
+        'totals': {
+            'businesses_saved': summary['total_businesses'],
+            'cities_total': cities_total,
+            'cities_done': cities_done,
+            'counties_done': len(summary['completed_counties']),
+            'jobs_by_status': summary['jobs_by_status'],
+            'in_flight': len(summary['in_flight']),
+            'failed_jobs': len(summary['failed']),
+        },
+        'rolling': rolling,
+        'eta': {
+            'remaining_cities': remaining,
+            'eta_s': round(eta_s) if eta_s is not None else None,
+            'eta_at': datetime.fromtimestamp(now + eta_s).isoformat() if eta_s is not None else None,
+        },
+        'pacing': pacing or {},
+        'counties': [
+            {
+                'county': c['county'],
+                'cities': c['cities'],
+                'cities_done': c['cities_done'] or 0,
+                'saved': saved_by_county.get(c['county'], c['saved'] or 0),
+                'filtered_ratio': _ratio(c['filtered'] or 0, c['found'] or 0),
+                'duplicate_ratio': _ratio(c['duplicates'] or 0, (c['found'] or 0) - (c['filtered'] or 0)),
+                'businesses_per_city': round((c['saved'] or 0) / c['cities_done'], 2) if c['cities_done'] else None,
+            }
+            for c in counties
+        ],
+    }
+
+
+def _atomic_write(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def to_prometheus(metrics: Dict) -> str:
+    """Render metrics in the Prometheus text exposition format."""
+    lines = []
+
+    def gauge(name: str, help_text: str, samples: List):
+        samples = [(labels, value) for labels, value in samples if value is not None]
+        if not samples:
+            return
+        lines.append(f"# HELP romania_scrape_{name} {help_text}")
+        lines.append(f"# TYPE romania_scrape_{name} gauge")
+        for labels, value in samples:
+            label_text = ",".join(f'{k}="{_label(str(v))}"' for k, v in labels.items())
+            lines.append(f"romania_scrape_{name}{{{label_text}}} {value}" if label_text
+                         else f"romania_scrape_{name} {value}")
+
+    totals, rolling, eta = metrics['totals'], metrics['rolling'], metrics['eta']
+    gauge('businesses_saved', 'Businesses saved in the current run', [({}, totals['businesses_saved'])])
+    gauge('cities_total', 'Cities in the job set', [({}, totals['cities_total'])])
+    gauge('cities_done', 'Cities finished', [({}, totals['cities_done'])])
+    gauge('counties_done', 'Counties finished', [({}, totals['counties_done'])])
+    gauge('jobs', 'Query jobs by status',
+          [({'status': status}, n) for status, n in totals['jobs_by_status'].items()])
+    gauge('businesses_per_minute', 'Businesses saved per minute (rolling)', [({}, rolling['businesses_per_min'])])
+    gauge('details_per_minute', 'Detail panels extracted per minute (rolling)', [({}, rolling['details_per_min'])])
+    gauge('seconds_per_city', 'Average scrape time per city (rolling)', [({}, rolling['seconds_per_city'])])
+    gauge('filtered_ratio', 'Share of results filtered as wrong location (rolling)', [({}, rolling['filtered_ratio'])])
+    gauge('duplicate_ratio', 'Share of in-area results already stored (rolling)', [({}, rolling['duplicate_ratio'])])
+    gauge('eta_seconds', 'Estimated seconds until all remaining cities are done', [({}, eta['eta_s'])])
+    gauge('county_businesses_saved', 'Businesses saved per county',
+          [({'county': c['county']}, c['saved']) for c in metrics['counties']])
+    gauge('county_cities_done', 'Cities finished per county',
+          [({'county': c['county']}, c['cities_done']) for c in metrics['counties']])
+    gauge('pacer_rate', 'Current request rate of each browser (tokens/s)',
+          [({'worker': str(w)}, p.get('rate')) for w, p in metrics['pacing'].items()])
+    gauge('pacer_throttles', 'Throttle pages seen by each browser',
+          [({'worker': str(w)}, p.get('throttles')) for w, p in metrics['pacing'].items()])
+    gauge('metrics_generated_timestamp', 'Unix time of this snapshot', [({}, round(time.time()))])
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(ledger: JobLedger, workers: int = 1, pacing: Dict = None,
+                  json_path: Path = None, prom_path: Optional[Path] = PROMETHEUS_FILE) -> Dict:
+    """Compute metrics and write the JSON file (and the Prometheus textfile unless prom_path is None)."""
+    metrics = compute_metrics(ledger, workers=workers, pacing=pacing)
+    _atomic_write(Path(json_path or METRICS_FILE), json.dumps(metrics, ensure_ascii=False, indent=2))
+    if prom_path:
+        _atomic_write(Path(prom_path), to_prometheus(metrics))
+    return metrics
+
+
+def load_metrics(json_path: Path = None) -> Optional[Dict]:
+    """Read the last written metrics snapshot, if any."""
+    json_path = Path(json_path or METRICS_FILE)
+    if not json_path.exists():
+        return None
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """Human readable duration, e.g. 3h 12m."""
+    if seconds is None:
+        return 'N/A'
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes = rest // 60
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    return f"{minutes}m {seconds % 60:02d}s"
@@ -246,3 +246,64 @@ class SupabaseTool:
         except Exception as e:
             print(f"Error fetching statistics: {e}")
             return {}
+    
+    def fetch_all(self, table: str, columns: str = '*', page_size: int = 1000,
+                  order: str = 'id') -> List[Dict]:
+        """
+        Get every row of a table, paging past the API's row limit.
+        Pages are ordered by a unique column; without it PostgREST may return
+        rows in a different order per request and skip or repeat some.
+        """
+        rows = []
+        offset = 0
+        while True:
+            page = self.client.table(table).select(columns).order(order).range(
+                offset, offset + page_size - 1
+            ).execute().data
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+            offset += page_size
+    
+    def set_verified_flags(self, flags: Dict[str, bool], batch_size: int = 200) -> int:
+        """
+        Write is_verified for many companies with one update per batch of ids.
+        
+        Args:
+            flags: company_id -> is_verified
+            batch_size: Ids per request (keeps the filter URL short)
+            
+        Returns:
+            Number of companies updated
+        """
+        updated = 0
+        for value in (True, False):
+            ids = [company_id for company_id, flag in flags.items() if flag is value]
+            for start in range(0, len(ids), batch_size):
+                batch = ids[start:start + batch_size]
+                try:
+                    self.client.table('companies').update({'is_verified': value}).in_('id', batch).execute()
+                    updated += len(batch)
+                except Exception as e:
+                    print(f"[ERROR] Error updating is_verified for {len(batch)} companies: {e}")
+        return updated
+    
+    def update_companies_batch(self, rows: List[Dict], batch_size: int = 500) -> int:
+        """
+        Update many companies with per-company values in a few requests.
+        
+        Each row needs id plus the NOT NULL columns (name, slug): rows are sent
+        as an upsert on id, which only ever hits existing companies here.
+        
+        Returns:
+            Number of companies updated
+        """
+        updated = 0
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            try:
+                self.client.table('companies').upsert(batch, on_conflict='id').execute()
+                updated += len(batch)
+            except Exception as e:
+                print(f"[ERROR] Error updating {len(batch)} companies: {e}")
+        return updated
@@ -1,56 +1,116 @@
-"""Update is_verified flag for existing companies in DB"""
+"""Update is_verified flag for existing companies in DB
+
+Reverifies the whole database in one pass: every company is scored against
+the DSP list at once (DSPVerificationTool.verify_many) and only changed
+flags are written back, in batched updates.
+
+With --changes only companies that could match a DSP entry added, removed
+or changed since the last incremental run are reverified (see
+tools/dsp_changes.py). The position in the change log is kept in
+data/dsp_changes_cursor.json.
+
+Usage:
+    python update_verification.py            # Reverify and write changes
+    python update_verification.py --changes  # Only companies affected by new DSP changes
+    python update_verification.py --dry-run  # Only report what would change
+    python update_verification.py --verbose  # Also list unchanged companies
+"""
+import sys
+import json
+import time
+from pathlib import Path
+
 from tools.supabase_tool import SupabaseTool
 from tools.dsp_verification import DSPVerificationTool
+from tools.dsp_changes import read_changes, summarize, affected_companies
+
+CURSOR_PATH = Path(__file__).parent / "data" / "dsp_changes_cursor.json"
 
-def update_verification_status():
+def load_cursor() -> int:
+    if CURSOR_PATH.exists():
+        with open(CURSOR_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f).get('line', 0)
+    return 0
+
+def save_cursor(line: int):
+    with open(CURSOR_PATH, 'w', encoding='utf-8') as f:
+        json.dump({'line': line}, f)
+
+def update_verification_status(dry_run: bool = False, verbose: bool = False, incremental: bool = False):
+    started = time.perf_counter()
+    
+    if incremental:
+        events, cursor = read_changes(load_cursor())
+        if not events:
+            print("No DSP changes since the last incremental run")
+            return
+        counts = summarize(events)
+        print(f"DSP changes to apply: {counts['added']} added, {counts['removed']} removed, "
+              f"{counts['changed']} changed")
+    
     db = SupabaseTool()
     verifier = DSPVerificationTool()
     
     # Get all companies with their locations
-    companies = db.client.table('companies').select('id,name').execute()
-    locations = db.client.table('locations').select('company_id,county').execute()
+    companies = db.fetch_all('companies', 'id,name,is_verified')
+    locations = db.fetch_all('locations', 'company_id,county')
     
     # Create location lookup
     county_by_company = {}
-    for loc in locations.data:
+    for loc in locations:
         county_by_company[loc['company_id']] = loc.get('county')
     
-    updated = 0
-    verified = 0
+    if incremental:
+        affected = affected_companies(events, [
+            {'name': company['name'], 'county': county_by_company.get(company['id'])}
+            for company in companies
+        ])
+        companies = [companies[pos] for pos in affected]
     
-    print("Updating verification status for all companies...\n")
+    print(f"Reverifying {len(companies)} companies against {len(verifier.authorized_companies)} DSP entries...\n")
     
-    for company in companies.data:
-        company_id = company['id']
-        name = company['name']
-        county = county_by_company.get(company_id)
-        
-        # Verify against DSP
-        result = verifier.verify_company(name, county=county)
+    results = verifier.verify_many([
+        {'name': company['name'], 'county': county_by_company.get(company['id'])}
+        for company in companies
+    ])
+    
+    changes = {}
+    verified = 0
+    for company, result in zip(companies, results):
         is_verified = result.get('is_verified', False)
-        
-        # Update database
-        db.client.table('companies').update({
-            'is_verified': is_verified
-        }).eq('id', company_id).execute()
+        verified += is_verified
+        changed = bool(company.get('is_verified')) != is_verified
+        if changed:
+            changes[company['id']] = is_verified
+        if not (changed or verbose):
+            continue
         
         status = "VERIFIED" if is_verified else "not verified"
-        score = result.get('match_score', 0)
-        print(f"{name}")
-        print(f"  County: {county or 'N/A'}")
-        print(f"  -> {status} (score: {score}%)")
-        
+        print(f"{company['name']}")
+        print(f"  County: {county_by_company.get(company['id']) or 'N/A'}")
+        print(f"  -> {status} (score: {result.get('match_score', 0)}%){' [changed]' if changed else ''}")
         if is_verified:
             print(f"     Matched: {result.get('official_name', 'N/A')}")
-            verified += 1
+        if result.get('runner_up'):
+            print(f"     Runner-up: {result['runner_up']} ({result['runner_up_score']}%)")
         print()
-        
-        updated += 1
+    
+    updated = 0
+    if changes and not dry_run:
+        updated = db.set_verified_flags(changes)
+    if incremental and not dry_run:
+        if updated == len(changes):
+            save_cursor(cursor)
+        else:
+            # Keep the cursor so the next --changes run retries these events
+            print(f"Warning: {len(changes) - updated} updates failed - change log cursor not advanced")
     
     print(f"\n{'='*50}")
-    print(f"Updated {updated} companies")
+    print(f"Checked {len(companies)} companies in {time.perf_counter() - started:.1f}s")
     print(f"Verified: {verified}")
-    print(f"Not verified: {updated - verified}")
+    print(f"Not verified: {len(companies) - verified}")
+    print(f"Changed: {len(changes)}" + (" (dry run, nothing written)" if dry_run else f", updated {updated}"))
 
 if __name__ == '__main__':
-    update_verification_status()
+    update_verification_status(dry_run='--dry-run' in sys.argv, verbose='--verbose' in sys.argv,
+                               incremental='--changes' in sys.argv)
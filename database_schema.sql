@@ -25,6 +25,11 @@ CREATE TABLE IF NOT EXISTS companies (
   is_non_stop BOOLEAN DEFAULT FALSE,
   founded_year INTEGER,
   metadata JSONB DEFAULT '{}',
+  -- ANAF registration data for fiscal_code (backend/revalidate_anaf.py)
+  legal_name TEXT,
+  registration_status TEXT, -- e.g. 'INREGISTRAT din data 03.04.1992'
+  is_active BOOLEAN,        -- NULL = never checked
+  anaf_checked_at TIMESTAMPTZ,
   created_at TIMESTAMPTZ DEFAULT NOW(),
   updated_at TIMESTAMPTZ DEFAULT NOW()
 );
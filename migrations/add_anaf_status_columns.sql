@@ -0,0 +1,11 @@
+-- Migration: Add ANAF registration status to companies
+-- Run this in Supabase SQL Editor
+-- Filled by backend/revalidate_anaf.py (bulk ANAF re-validation)
+
+-- Official name and registration status as reported by ANAF for fiscal_code
+ALTER TABLE companies ADD COLUMN IF NOT EXISTS legal_name TEXT;
+ALTER TABLE companies ADD COLUMN IF NOT EXISTS registration_status TEXT; -- e.g. 'INREGISTRAT din data 03.04.1992'
+ALTER TABLE companies ADD COLUMN IF NOT EXISTS is_active BOOLEAN;         -- NULL = never checked
+ALTER TABLE companies ADD COLUMN IF NOT EXISTS anaf_checked_at TIMESTAMPTZ;
+
+-- Informational for now: listings do not filter on is_active